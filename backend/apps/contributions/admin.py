@@ -1,11 +1,16 @@
 from django.contrib import admin
+
+from apps.core.admin_tools import AutocompleteFilter, ClosedPeriodAdminMixin, LargeTableAdminMixin
+
 from .models import Contribution
 
 
 @admin.register(Contribution)
-class ContributionAdmin(admin.ModelAdmin):
+class ContributionAdmin(ClosedPeriodAdminMixin, LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("rider", "cooperative", "date", "amount", "status")
-    list_filter = ("cooperative", "status", "date")
-    search_fields = ("rider__email", "rider__phone_number", "cooperative__name")
-    date_hierarchy = "date"
+    list_filter = (("cooperative", AutocompleteFilter), ("rider", AutocompleteFilter), "status", "date")
+    list_select_related = ("rider", "cooperative")
+    search_fields = ("rider__phone_number", "rider__email", "rider__first_name", "rider__last_name", "cooperative__name")
+    search_user_path = "rider"
+    autocomplete_fields = ("rider", "cooperative")
     ordering = ("-date", "-created_at")
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contributions", "0002_unique_contribution_per_day"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contribution",
+            index=models.Index(fields=["-date", "-created_at"], name="contrib_date_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="contribution",
+            index=models.Index(fields=["cooperative", "-date"], name="contrib_coop_date_idx"),
+        ),
+    ]
@@ -1,8 +1,11 @@
 from decimal import Decimal
 
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from apps.cooperatives.models import CLOSED_PERIOD_MESSAGE
+
 
 class Contribution(models.Model):
     class Status(models.TextChoices):
@@ -42,6 +45,16 @@ class Contribution(models.Model):
                 name="unique_contribution_per_rider_coop_day",
             )
         ]
+        indexes = [
+            # Default ordering and per-cooperative date ranges (admin changelist, reports).
+            models.Index(fields=["-date", "-created_at"], name="contrib_date_created_idx"),
+            models.Index(fields=["cooperative", "-date"], name="contrib_coop_date_idx"),
+        ]
+
+    def clean(self):
+        super().clean()
+        if self.cooperative_id and self.cooperative.is_period_closed(self.date):
+            raise ValidationError({"date": CLOSED_PERIOD_MESSAGE})
 
     def __str__(self):
         return f"{self.rider} @ {self.cooperative} on {self.date}: {self.amount} ({self.status})"
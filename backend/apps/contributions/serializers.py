@@ -1,7 +1,11 @@
+from functools import cache
+
+from django.conf import settings
 from django.db import IntegrityError
+from django.utils import timezone
 from rest_framework import serializers
 
-from apps.cooperatives.models import CooperativeMembership
+from apps.cooperatives.models import CLOSED_PERIOD_MESSAGE, CooperativeMembership
 
 from .models import Contribution
 
@@ -34,6 +38,8 @@ class ContributionCreateSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         request = self.context.get("request")
         cooperative = attrs["cooperative"]
+        if cooperative.is_period_closed(attrs["date"]):
+            raise serializers.ValidationError({"date": CLOSED_PERIOD_MESSAGE})
         day = attrs["date"]
         if Contribution.objects.filter(
             rider=request.user,
@@ -83,3 +89,62 @@ class ContributionSerializer(serializers.ModelSerializer):
 
     def get_cooperative(self, obj):
         return {"id": obj.cooperative_id, "name": obj.cooperative.name}
+
+
+CONTRIBUTION_ROW_FIELDS = (
+    "id",
+    "rider_id",
+    "rider__email",
+    "rider__phone_number",
+    "cooperative_id",
+    "cooperative__name",
+    "date",
+    "amount",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+
+def _iso_datetime(value, tz):
+    """``serializers.DateTimeField`` ISO output, with the target timezone resolved by the caller."""
+    if value is None:
+        return None
+    if tz is not None and timezone.is_aware(value):
+        value = value.astimezone(tz)
+    text = value.isoformat()
+    if text.endswith("+00:00"):
+        text = text[:-6] + "Z"
+    return text
+
+
+@cache
+def _contribution_field_formatters():
+    fields = ContributionSerializer().fields
+    return fields["date"].to_representation, fields["amount"].to_representation
+
+
+def contribution_rows(queryset):
+    """Read-only fast path: same JSON as ``ContributionSerializer(many=True)``, built from ``.values()`` rows.
+
+    DRF looks up the active timezone once per datetime value; here it is resolved once per call.
+    """
+    date_repr, amount_repr = _contribution_field_formatters()
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+    return [
+        {
+            "id": row["id"],
+            "rider": {
+                "id": row["rider_id"],
+                "email": row["rider__email"] or "",
+                "phone_number": row["rider__phone_number"] or "",
+            },
+            "cooperative": {"id": row["cooperative_id"], "name": row["cooperative__name"]},
+            "date": date_repr(row["date"]),
+            "amount": amount_repr(row["amount"]),
+            "status": row["status"],
+            "created_at": _iso_datetime(row["created_at"], tz),
+            "updated_at": _iso_datetime(row["updated_at"], tz),
+        }
+        for row in queryset.values(*CONTRIBUTION_ROW_FIELDS)
+    ]
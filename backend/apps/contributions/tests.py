@@ -1,10 +1,14 @@
 from datetime import date
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 from apps.cooperatives.models import Cooperative, CooperativeMembership
 from apps.contributions.models import Contribution
+from apps.contributions.serializers import ContributionSerializer, contribution_rows
 from apps.users.models import User
 
 class ContributionTests(TestCase):
@@ -138,3 +142,66 @@ class ContributionTests(TestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         m.refresh_from_db()
         self.assertTrue(m.is_verified)
+
+    def test_values_fast_path_matches_serializer_bytes(self):
+        Contribution.objects.create(rider=self.rider, cooperative=self.coop, date=date(2026, 2, 26), amount='99.5')
+        Contribution.objects.create(rider=self.admin_user, cooperative=self.coop, date=date(2026, 2, 27), amount=5000, status=Contribution.Status.VERIFIED)
+        qs = Contribution.objects.select_related('rider', 'cooperative')
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(contribution_rows(qs)), renderer.render(ContributionSerializer(qs, many=True).data))
+
+    def test_list_matches_serializer_output(self):
+        Contribution.objects.create(rider=self.rider, cooperative=self.coop, date=date(2026, 2, 26), amount=5000)
+        self._auth_rider()
+        resp = self.client.get('/api/contributions/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        expected = ContributionSerializer(Contribution.objects.filter(rider=self.rider), many=True).data
+        self.assertEqual(resp.content, JSONRenderer().render(expected))
+
+
+class ContributionAdminChangelistTests(TestCase):
+
+    def setUp(self):
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.other_coop = Cooperative.objects.create(name='Other Coop')
+        self.superuser = User.objects.create_superuser(username='root', email='root@test.com', phone_number='0788000001', password='x')
+        self.client.force_login(self.superuser)
+
+    def _seed(self, n, start_day=1):
+        for i in range(n):
+            rider = User.objects.create_user(username=f'07880100{start_day + i:02d}', phone_number=f'07880100{start_day + i:02d}', password=None, role=User.Role.RIDER)
+            Contribution.objects.create(rider=rider, cooperative=self.coop if i % 2 else self.other_coop, date=date(2026, 3, start_day + i), amount=100)
+
+    def _changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), resp
+
+    def test_changelist_query_count_independent_of_rows(self):
+        self._seed(3)
+        few, _ = self._changelist_queries('/admin/contributions/contribution/')
+        self._seed(6, start_day=10)
+        many, resp = self._changelist_queries('/admin/contributions/contribution/')
+        self.assertEqual(few, many)
+        self.assertContains(resp, 'data-filter-url')
+
+    def test_autocomplete_filter_and_indexed_search(self):
+        self._seed(4)
+        resp = self.client.get(f'/admin/contributions/contribution/?cooperative__id__exact={self.coop.id}')
+        self.assertEqual(resp.context['cl'].result_count, 2)
+        self.assertContains(resp, 'Test Coop')
+        resp = self.client.get('/admin/contributions/contribution/?q=078-801-0002')
+        self.assertEqual([c.rider.phone_number for c in resp.context['cl'].result_list], ['0788010002'])
+        resp = self.client.get('/admin/contributions/contribution/?q=Oth')
+        self.assertEqual(resp.context['cl'].result_count, 2)
+
+    def test_search_partial_phone_email_and_name(self):
+        self._seed(3)
+        rider = User.objects.get(phone_number='0788010002')
+        User.objects.filter(pk=rider.pk).update(email='Alice.M@test.com', first_name='Alice')
+        resp = self.client.get('/admin/contributions/contribution/?q=078801000')
+        self.assertEqual(resp.context['cl'].result_count, 3)
+        for term in ('alice.m@test.com', 'ALICE.M@', 'Alice'):
+            resp = self.client.get('/admin/contributions/contribution/', {'q': term})
+            self.assertEqual([c.rider_id for c in resp.context['cl'].result_list], [rider.pk], term)
@@ -3,14 +3,17 @@ from rest_framework.decorators import action
 from rest_framework.mixins import CreateModelMixin
 from rest_framework.response import Response
 
+from apps.cooperatives.models import CLOSED_PERIOD_MESSAGE
 from apps.core.permissions import IsCooperativeAdmin, IsRider, cooperative_admin_has_operational_data
+from apps.core.replica import ReplicaReadMixin
 
 from .models import Contribution
-from .serializers import ContributionCreateSerializer, ContributionSerializer
+from .serializers import ContributionCreateSerializer, ContributionSerializer, contribution_rows
 
 
-class ContributionViewSet(CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+class ContributionViewSet(ReplicaReadMixin, CreateModelMixin, viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    replica_actions = ("list", "recent")
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -44,9 +47,16 @@ class ContributionViewSet(CreateModelMixin, viewsets.ReadOnlyModelViewSet):
 
         return qs.select_related("rider", "cooperative")
 
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        return Response(contribution_rows(self.filter_queryset(self.get_queryset())))
+
     @action(detail=True, methods=["post"], url_path="verify")
     def verify(self, request, pk=None):
         contribution = self.get_object()
+        if contribution.cooperative.is_period_closed(contribution.date):
+            return Response({"detail": CLOSED_PERIOD_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
         if contribution.status != Contribution.Status.PENDING:
             return Response(
                 {"detail": "Only PENDING contributions can be verified."},
@@ -60,6 +70,8 @@ class ContributionViewSet(CreateModelMixin, viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=["post"], url_path="unverify")
     def unverify(self, request, pk=None):
         contribution = self.get_object()
+        if contribution.cooperative.is_period_closed(contribution.date):
+            return Response({"detail": CLOSED_PERIOD_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
         if contribution.status != Contribution.Status.VERIFIED:
             return Response(
                 {"detail": "Only VERIFIED contributions can be unverified."},
@@ -73,4 +85,4 @@ class ContributionViewSet(CreateModelMixin, viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=["get"], url_path="recent")
     def recent(self, request):
         qs = self.get_queryset().order_by("-date", "-created_at")[:10]
-        return Response(self.get_serializer(qs, many=True).data)
+        return Response(contribution_rows(qs))
@@ -1,28 +1,41 @@
 from django.contrib import admin
-from .models import Cooperative, CooperativeMembership
+
+from apps.core.admin_tools import AutocompleteFilter, LargeTableAdminMixin
+from apps.core.reconciliation import bump_reports_version
+
+from .models import Cooperative, CooperativeMembership, refresh_member_counts
 
 
 @admin.register(Cooperative)
 class CooperativeAdmin(admin.ModelAdmin):
-    list_display = ("name", "created_at")
+    list_display = ("name", "member_count", "verified_member_count", "created_at")
     search_fields = ("name",)
     filter_horizontal = ("admins",)
 
 
 @admin.register(CooperativeMembership)
-class CooperativeMembershipAdmin(admin.ModelAdmin):
+class CooperativeMembershipAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("user", "cooperative", "is_verified")
-    list_filter = ("is_verified", "cooperative")
-    search_fields = ("user__email", "user__phone_number", "cooperative__name")
+    list_filter = ("is_verified", ("cooperative", AutocompleteFilter))
+    list_select_related = ("user", "cooperative")
+    search_fields = ("user__phone_number", "user__email", "user__first_name", "user__last_name", "cooperative__name")
+    search_user_path = "user"
+    autocomplete_fields = ("user", "cooperative")
     list_editable = ("is_verified",)  # Tick/untick directly in the list
     actions = ["mark_verified", "mark_unverified"]
 
     @admin.action(description="Verify selected members")
     def mark_verified(self, request, queryset):
+        cooperative_ids = set(queryset.values_list("cooperative_id", flat=True))
         updated = queryset.update(is_verified=True)
+        refresh_member_counts(cooperative_ids)
+        bump_reports_version()
         self.message_user(request, f"{updated} membership(s) marked as verified.")
 
     @admin.action(description="Unverify selected members")
     def mark_unverified(self, request, queryset):
+        cooperative_ids = set(queryset.values_list("cooperative_id", flat=True))
         updated = queryset.update(is_verified=False)
+        refresh_member_counts(cooperative_ids)
+        bump_reports_version()
         self.message_user(request, f"{updated} membership(s) marked as unverified.")
@@ -6,3 +6,6 @@ class CooperativesConfig(AppConfig):
     name = "apps.cooperatives"
     label = "cooperatives"
     verbose_name = "Cooperatives"
+
+    def ready(self):
+        from . import signals  # noqa: F401
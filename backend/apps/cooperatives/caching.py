@@ -0,0 +1,49 @@
+"""Two-tier cache for the public ``signup_choices`` list (process memory, then the shared cache).
+
+Entries are dropped on ``Cooperative`` save/delete (see ``signals.py``). Other
+processes keep their in-memory copy for at most ``LOCAL_TTL_SECONDS``.
+Queryset ``.update()``/``.delete()`` bypass signals; call
+``invalidate_signup_choices()`` after those.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+from .models import Cooperative
+
+SIGNUP_CHOICES_CACHE_KEY = "cooperatives:signup_choices:v1"
+LOCAL_TTL_SECONDS = 30
+SHARED_TTL_SECONDS = 60 * 60
+HTTP_MAX_AGE_SECONDS = 60
+
+# (expires_at, (data, etag)) for this process.
+_local = [0.0, None]
+
+
+def _load():
+    # Imported here: this module loads with the app registry (via signals), and
+    # DRF's renderers pull in most of DRF, which management commands never need.
+    from apps.core.renderers import ORJSONRenderer
+
+    data = list(Cooperative.objects.order_by("name").values("id", "name"))
+    etag = '"%s"' % hashlib.sha256(ORJSONRenderer().render(data)).hexdigest()[:32]
+    return data, etag
+
+
+def get_signup_choices():
+    """Return ``(choices, etag)``; only a miss in both tiers queries the database."""
+    now = time.monotonic()
+    if _local[1] is not None and _local[0] > now:
+        return _local[1]
+    entry = cache.get(SIGNUP_CHOICES_CACHE_KEY)
+    if entry is None:
+        entry = _load()
+        cache.set(SIGNUP_CHOICES_CACHE_KEY, entry, SHARED_TTL_SECONDS)
+    _local[0], _local[1] = now + LOCAL_TTL_SECONDS, entry
+    return entry
+
+
+def invalidate_signup_choices():
+    _local[0], _local[1] = 0.0, None
+    cache.delete(SIGNUP_CHOICES_CACHE_KEY)
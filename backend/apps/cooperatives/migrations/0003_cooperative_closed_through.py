@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cooperatives", "0002_add_is_verified_to_membership"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cooperative",
+            name="closed_through",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+    ]
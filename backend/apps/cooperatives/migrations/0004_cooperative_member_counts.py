@@ -0,0 +1,39 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_member_counts(apps, schema_editor):
+    Cooperative = apps.get_model("cooperatives", "Cooperative")
+    CooperativeMembership = apps.get_model("cooperatives", "CooperativeMembership")
+    counts = (
+        CooperativeMembership.objects.filter(cooperative=OuterRef("pk"))
+        .order_by()
+        .values("cooperative")
+        .annotate(total=Count("pk"), verified=Count("pk", filter=Q(is_verified=True)))
+    )
+    Cooperative.objects.update(
+        member_count=Coalesce(Subquery(counts.values("total")), 0),
+        verified_member_count=Coalesce(Subquery(counts.values("verified")), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cooperatives", "0003_cooperative_closed_through"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cooperative",
+            name="member_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="cooperative",
+            name="verified_member_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_member_counts, migrations.RunPython.noop),
+    ]
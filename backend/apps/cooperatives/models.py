@@ -1,11 +1,21 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+CLOSED_PERIOD_MESSAGE = "This period has been closed and can no longer be changed."
 
 
 class Cooperative(models.Model):
     name = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Last day of the latest closed financial period; income and contributions
+    # dated on or before it are frozen (see ``apps.core.periods``).
+    closed_through = models.DateField(null=True, blank=True, editable=False)
+    # Denormalized from CooperativeMembership by ``refresh_member_counts``.
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    verified_member_count = models.PositiveIntegerField(default=0, editable=False)
 
     admins = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
@@ -20,6 +30,9 @@ class Cooperative(models.Model):
     def __str__(self):
         return self.name
 
+    def is_period_closed(self, day) -> bool:
+        return bool(self.closed_through and day and day <= self.closed_through)
+
 
 class CooperativeMembership(models.Model):
     user = models.OneToOneField(
@@ -39,3 +52,22 @@ class CooperativeMembership(models.Model):
 
     def __str__(self):
         return f"{self.user} @ {self.cooperative}"
+
+
+def refresh_member_counts(cooperative_ids):
+    """Recount members of the given cooperatives with one UPDATE (called from ``signals.py``).
+
+    Counts are recomputed rather than incremented, so concurrent membership
+    changes cannot drift them. Queryset ``.update()``/``.delete()`` on
+    memberships bypass signals; call this after those.
+    """
+    counts = (
+        CooperativeMembership.objects.filter(cooperative=OuterRef("pk"))
+        .order_by()
+        .values("cooperative")
+        .annotate(total=Count("pk"), verified=Count("pk", filter=Q(is_verified=True)))
+    )
+    Cooperative.objects.filter(pk__in=cooperative_ids).update(
+        member_count=Coalesce(Subquery(counts.values("total")), 0),
+        verified_member_count=Coalesce(Subquery(counts.values("verified")), 0),
+    )
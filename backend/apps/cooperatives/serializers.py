@@ -10,19 +10,35 @@ class CooperativeCreateSerializer(serializers.ModelSerializer):
 
 
 class CooperativeSerializer(serializers.ModelSerializer):
-    members = serializers.SerializerMethodField()
+    """Members are not embedded: page through ``/api/cooperatives/<id>/members/``."""
+
     admins = serializers.SerializerMethodField()
 
     class Meta:
         model = Cooperative
-        fields = ["id", "name", "created_at", "updated_at", "members", "admins"]
+        fields = ["id", "name", "created_at", "updated_at", "member_count", "verified_member_count", "admins"]
         read_only_fields = fields
 
-    def get_members(self, obj):
-        return [
-            {"id": m.user_id, "email": m.user.email or m.user.phone_number or "", "is_verified": m.is_verified}
-            for m in obj.members.select_related("user").all()
-        ]
-
     def get_admins(self, obj):
         return [{"id": u.id, "email": u.email or u.phone_number or ""} for u in obj.admins.all()]
+
+
+MEMBER_ROW_FIELDS = ("id", "user_id", "user__email", "user__phone_number", "user__first_name", "user__last_name", "is_verified")
+
+
+def member_rows(memberships):
+    """One page of memberships (``.values(*MEMBER_ROW_FIELDS)`` dicts) as API rows.
+
+    ``id`` is the rider's user id, as in ``members/<id>/verify/``; ``email``
+    falls back to the phone number like the admins list.
+    """
+    return [
+        {
+            "id": row["user_id"],
+            "email": row["user__email"] or row["user__phone_number"] or "",
+            "phone_number": row["user__phone_number"],
+            "name": f"{row['user__first_name']} {row['user__last_name']}".strip(),
+            "is_verified": row["is_verified"],
+        }
+        for row in memberships
+    ]
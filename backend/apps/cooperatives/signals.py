@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.core.reconciliation import bump_reports_version
+
+from .caching import invalidate_signup_choices
+from .models import Cooperative, CooperativeMembership, refresh_member_counts
+
+
+@receiver(post_save, sender=Cooperative)
+@receiver(post_delete, sender=Cooperative)
+def cooperative_changed(sender, **kwargs):
+    # Drop now for this request, and again after commit so a concurrent reader
+    # cannot re-cache the pre-commit list.
+    invalidate_signup_choices()
+    transaction.on_commit(invalidate_signup_choices)
+
+
+@receiver(pre_save, sender=CooperativeMembership)
+def remember_previous_cooperative(sender, instance, update_fields=None, **kwargs):
+    # A membership moved to another cooperative must also be uncounted from the old one.
+    instance._previous_cooperative_id = None
+    if instance.pk and (update_fields is None or "cooperative" in update_fields):
+        instance._previous_cooperative_id = (
+            CooperativeMembership.objects.filter(pk=instance.pk).values_list("cooperative_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=CooperativeMembership)
+@receiver(post_delete, sender=CooperativeMembership)
+def membership_changed(sender, instance, **kwargs):
+    refresh_member_counts({instance.cooperative_id, getattr(instance, "_previous_cooperative_id", None)} - {None})
+    # Verification decides whose income admins' reports include.
+    transaction.on_commit(bump_reports_version)
+
+
+@receiver(m2m_changed, sender=Cooperative.admins.through)
+def cooperative_admins_changed(sender, action, **kwargs):
+    # Which cooperatives an admin sees is part of every cached report's scope.
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_reports_version()
+        transaction.on_commit(bump_reports_version)
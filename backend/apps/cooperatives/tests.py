@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -33,6 +35,34 @@ class CooperativeTests(TestCase):
         self.assertIn('Alpha Coop', names)
         self.assertIn('Beta Coop', names)
 
+    def test_signup_choices_served_from_cache(self):
+        self.client.get('/api/cooperatives/signup_choices/')
+        with self.assertNumQueries(0):
+            resp = self.client.get('/api/cooperatives/signup_choices/')
+        self.assertEqual(len(resp.json()), 2)
+        self.assertIn('max-age', resp.headers['Cache-Control'])
+        self.assertIn('public', resp.headers['Cache-Control'])
+
+    def test_signup_choices_invalidated_on_save_and_delete(self):
+        self.client.get('/api/cooperatives/signup_choices/')
+        gamma = Cooperative.objects.create(name='Gamma Coop')
+        names = [c['name'] for c in self.client.get('/api/cooperatives/signup_choices/').json()]
+        self.assertIn('Gamma Coop', names)
+        gamma.name = 'Delta Coop'
+        gamma.save()
+        names = [c['name'] for c in self.client.get('/api/cooperatives/signup_choices/').json()]
+        self.assertEqual(names, ['Alpha Coop', 'Beta Coop', 'Delta Coop'])
+        gamma.delete()
+        self.assertEqual(len(self.client.get('/api/cooperatives/signup_choices/').json()), 2)
+
+    def test_signup_choices_etag_not_modified(self):
+        etag = self.client.get('/api/cooperatives/signup_choices/').headers['ETag']
+        resp = self.client.get('/api/cooperatives/signup_choices/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        Cooperative.objects.create(name='Gamma Coop')
+        resp = self.client.get('/api/cooperatives/signup_choices/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
     def test_rider_sees_own_cooperative(self):
         self._auth_rider()
         resp = self.client.get('/api/cooperatives/')
@@ -49,6 +79,18 @@ class CooperativeTests(TestCase):
         self.assertIn('is_verified', resp.data)
         self.assertIn('id', resp.data)
 
+    def test_verify_member_explicit_state(self):
+        self._auth_admin()
+        url = '/api/cooperatives/{}/members/{}/verify/'.format(self.coop.id, self.rider.id)
+        for _ in range(2):
+            resp = self.client.post(url, {'is_verified': True}, format='json')
+            self.assertEqual(resp.data, {'id': self.rider.id, 'is_verified': True})
+        self.coop.refresh_from_db()
+        self.assertEqual(self.coop.verified_member_count, 1)
+        self.assertFalse(self.client.post(url).data['is_verified'])
+        self.assertEqual(self.client.post(url, {'is_verified': 'yes'}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(url, [True], format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_verify_member_rider_forbidden(self):
         self._auth_rider()
         resp = self.client.post('/api/cooperatives/{}/members/{}/verify/'.format(self.coop.id, self.rider.id))
@@ -64,3 +106,135 @@ class CooperativeTests(TestCase):
         self._auth_rider()
         resp = self.client.post('/api/cooperatives/', {'name': 'New Coop'}, format='json')
         self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class CooperativeMembersTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Alpha Coop')
+        for i in range(5):
+            rider = User.objects.create_user(username=f'07880300{i:02d}', phone_number=f'07880300{i:02d}', password=None, role=User.Role.RIDER, first_name=f'Rider{i}')
+            CooperativeMembership.objects.create(user=rider, cooperative=self.coop, is_verified=i < 2)
+        self.admin_user = User.objects.create_user(username='admin@test.com', email='admin@test.com', phone_number='0788222222', password='admin123', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        self.coop.admins.add(self.admin_user)
+        refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_parent_carries_counts_only(self):
+        resp = self.client.get(f'/api/cooperatives/{self.coop.id}/')
+        self.assertNotIn('members', resp.data)
+        self.assertEqual((resp.data['member_count'], resp.data['verified_member_count']), (5, 2))
+
+    def test_counters_follow_membership_changes(self):
+        membership = CooperativeMembership.objects.filter(is_verified=False).first()
+        membership.is_verified = True
+        membership.save(update_fields=['is_verified'])
+        other = Cooperative.objects.create(name='Beta Coop')
+        moved = CooperativeMembership.objects.filter(is_verified=False).first()
+        moved.cooperative = other
+        moved.save()
+        CooperativeMembership.objects.filter(is_verified=True).first().user.delete()
+        self.coop.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.coop.member_count, self.coop.verified_member_count), (3, 2))
+        self.assertEqual((other.member_count, other.verified_member_count), (1, 0))
+
+    def test_members_cursor_pages_and_filters(self):
+        resp = self.client.get(f'/api/cooperatives/{self.coop.id}/members/?page_size=3')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data['results']), 3)
+        rest = self.client.get(resp.data['next'])
+        self.assertEqual(len(rest.data['results']), 2)
+        self.assertIsNone(rest.data['next'])
+        resp = self.client.get(f'/api/cooperatives/{self.coop.id}/members/?verified=0')
+        self.assertEqual([m['is_verified'] for m in resp.data['results']], [False] * 3)
+        resp = self.client.get(f'/api/cooperatives/{self.coop.id}/members/?search=Rider3')
+        self.assertEqual([m['phone_number'] for m in resp.data['results']], ['0788030003'])
+
+    def test_members_hidden_from_riders_and_other_admins(self):
+        rider = User.objects.get(phone_number='0788030000')
+        refresh = RefreshToken.for_user(rider)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        self.assertEqual(self.client.get(f'/api/cooperatives/{self.coop.id}/members/').status_code, status.HTTP_403_FORBIDDEN)
+        other_admin = User.objects.create_user(username='other@test.com', email='other@test.com', phone_number='0788333333', password='x', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        refresh = RefreshToken.for_user(other_admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        self.assertEqual(self.client.get(f'/api/cooperatives/{self.coop.id}/members/').status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BulkVerifyMembersTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Alpha Coop')
+        self.other = Cooperative.objects.create(name='Beta Coop')
+        self.riders = []
+        for i in range(6):
+            rider = User.objects.create_user(username=f'07880400{i:02d}', phone_number=f'07880400{i:02d}', password=None, role=User.Role.RIDER)
+            CooperativeMembership.objects.create(user=rider, cooperative=self.coop if i < 5 else self.other)
+            self.riders.append(rider)
+        self.admin_user = User.objects.create_user(username='admin@test.com', email='admin@test.com', phone_number='0788222222', password='admin123', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        self.coop.admins.add(self.admin_user)
+        refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_listed_members_verified_in_one_update(self):
+        ids = [r.id for r in self.riders[:3]] + [self.riders[5].id]
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(f'/api/cooperatives/{self.coop.id}/members/verify/', {'is_verified': True, 'members': ids}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data, {'updated': 3, 'member_count': 5, 'verified_member_count': 3})
+        self.assertEqual(len([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "cooperatives_membership"')]), 1)
+        self.assertFalse(CooperativeMembership.objects.get(user=self.riders[5]).is_verified)
+        again = self.client.post(f'/api/cooperatives/{self.coop.id}/members/verify/', {'is_verified': True, 'members': ids}, format='json')
+        self.assertEqual(again.data['updated'], 0)
+
+    def test_filter_accepts_boolean_verified(self):
+        CooperativeMembership.objects.filter(user=self.riders[0]).update(is_verified=True)
+        resp = self.client.post(f'/api/cooperatives/{self.coop.id}/members/verify/', {'is_verified': False, 'filter': {'verified': True}}, format='json')
+        self.assertEqual(resp.data['updated'], 1)
+
+    def test_single_verify_scoped_to_own_cooperative(self):
+        url = f'/api/cooperatives/{self.other.id}/members/{self.riders[5].id}/verify/'
+        self.assertEqual(self.client.post(url, {'is_verified': True}, format='json').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(CooperativeMembership.objects.get(user=self.riders[5]).is_verified)
+        superuser = User.objects.create_superuser(username='root@test.com', email='root@test.com', phone_number='0788333333', password='x')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(superuser).access_token}')
+        self.assertTrue(self.client.post(url, {'is_verified': True}, format='json').data['is_verified'])
+
+    def test_filter_selects_members(self):
+        self.client.post(f'/api/cooperatives/{self.coop.id}/members/verify/', {'is_verified': True, 'filter': {}}, format='json')
+        resp = self.client.post(f'/api/cooperatives/{self.coop.id}/members/verify/', {'is_verified': False, 'filter': {'search': '0788040001'}}, format='json')
+        self.assertEqual((resp.data['updated'], resp.data['verified_member_count']), (1, 4))
+
+    def test_bad_requests(self):
+        url = f'/api/cooperatives/{self.coop.id}/members/verify/'
+        self.assertEqual(self.client.post(url, {'members': [1]}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(url, {'is_verified': True}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(url, {'is_verified': True, 'members': ['x']}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(url, [{'is_verified': True}], format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        for bad in ({'verfied': '0'}, {'verified': 'yes'}, {'verified': 1}, {'search': 5}):
+            resp = self.client.post(url, {'is_verified': True, 'filter': bad}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST, bad)
+        self.assertFalse(CooperativeMembership.objects.filter(is_verified=True).exists())
+        resp = self.client.post(f'/api/cooperatives/{self.other.id}/members/verify/', {'is_verified': True, 'filter': {}}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CooperativeMembershipAdminTests(TestCase):
+
+    def setUp(self):
+        self.coop = Cooperative.objects.create(name='Alpha Coop')
+        for i in range(3):
+            rider = User.objects.create_user(username=f'078802000{i}', phone_number=f'078802000{i}', password=None, role=User.Role.RIDER)
+            CooperativeMembership.objects.create(user=rider, cooperative=self.coop, is_verified=bool(i % 2))
+        superuser = User.objects.create_superuser(username='root', email='root@test.com', phone_number='0788000001', password='x')
+        self.client.force_login(superuser)
+
+    def test_changelist_filters_and_searches(self):
+        resp = self.client.get(f'/admin/cooperatives/cooperativemembership/?cooperative__id__exact={self.coop.id}&is_verified__exact=0')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.context['cl'].result_count, 2)
+        resp = self.client.get('/admin/cooperatives/cooperativemembership/?q=0788020001')
+        self.assertEqual([m.user.phone_number for m in resp.context['cl'].result_list], ['0788020001'])
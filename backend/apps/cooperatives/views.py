@@ -1,12 +1,59 @@
-from django.db.models import Prefetch
+import logging
+
+from django.db import DatabaseError, transaction
+from django.db.models import F, Q
+from django.utils.cache import patch_cache_control
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.pagination import RiderCursorPagination
 from apps.core.permissions import cooperative_admin_has_operational_data
+from apps.core.reconciliation import bump_reports_version
+
+from .caching import HTTP_MAX_AGE_SECONDS, get_signup_choices
+from .models import Cooperative, CooperativeMembership, refresh_member_counts
+from .serializers import MEMBER_ROW_FIELDS, CooperativeCreateSerializer, CooperativeSerializer, member_rows
+
+logger = logging.getLogger(__name__)
+
+BULK_VERIFY_MAX_IDS = 5000
+
+
+def _filter_members(memberships, params):
+    """Apply the ``verified`` (``1``/``0``) and ``search`` member filters from ``params``."""
+    verified = str(params.get("verified", ""))
+    if verified in ("0", "1"):
+        memberships = memberships.filter(is_verified=verified == "1")
+    search = str(params.get("search", "")).strip()
+    if search:
+        memberships = memberships.filter(
+            Q(user__email__icontains=search)
+            | Q(user__phone_number__icontains=search)
+            | Q(user__first_name__icontains=search)
+            | Q(user__last_name__icontains=search)
+        )
+    return memberships
+
 
-from .models import Cooperative, CooperativeMembership
-from .serializers import CooperativeCreateSerializer, CooperativeSerializer
+def _bulk_member_filter(params):
+    """Validate a bulk ``filter`` body for ``_filter_members``; returns ``(params, error)``.
+
+    A write must not widen to every member because of a typo, so unknown keys
+    and values of the wrong type are errors rather than ignored.
+    """
+    unknown = sorted(set(params) - {"verified", "search"})
+    if unknown:
+        return None, {"filter": [f"Unknown keys: {', '.join(unknown)}."]}
+    verified = params.get("verified")
+    if isinstance(verified, bool):
+        verified = "1" if verified else "0"
+    if verified is not None and verified not in ("0", "1"):
+        return None, {"filter": ["verified must be true, false, \"1\" or \"0\"."]}
+    search = params.get("search", "")
+    if not isinstance(search, str):
+        return None, {"filter": ["search must be a string."]}
+    return {"verified": verified or "", "search": search}, None
 
 
 class CooperativeViewSet(viewsets.ModelViewSet):
@@ -39,10 +86,7 @@ class CooperativeViewSet(viewsets.ModelViewSet):
         else:
             qs = Cooperative.objects.none()
 
-        return qs.prefetch_related(
-            Prefetch("members", queryset=CooperativeMembership.objects.select_related("user")),
-            "admins",
-        )
+        return qs.prefetch_related("admins")
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -57,25 +101,113 @@ class CooperativeViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"], permission_classes=[permissions.AllowAny])
     def signup_choices(self, request):
         try:
-            coops = Cooperative.objects.all().values("id", "name").order_by("name")
-            return Response(list(coops))
-        except Exception:
+            coops, etag = get_signup_choices()
+        except DatabaseError:
+            # Keep the signup page usable; the failure is not cached.
+            logger.exception("Could not load cooperative signup choices")
             return Response([])
+        if etag in request.headers.get("If-None-Match", ""):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(coops)
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=HTTP_MAX_AGE_SECONDS)
+        return response
+
+    @action(detail=True, methods=["get"])
+    def members(self, request, pk=None):
+        """Cursor-paginated members (``?verified=1|0``, ``?search=`` on email, phone or name)."""
+        user = request.user
+        if not (user.is_superuser or cooperative_admin_has_operational_data(user)):
+            return Response(
+                {"detail": "Only cooperative administrators can list members."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        cooperative = self.get_object()
+        memberships = _filter_members(CooperativeMembership.objects.filter(cooperative=cooperative), request.query_params)
+        paginator = RiderCursorPagination()
+        page = paginator.paginate_queryset(memberships.values(*MEMBER_ROW_FIELDS), request, view=self)
+        return paginator.get_paginated_response(member_rows(page))
+
+    @action(detail=True, methods=["post"], url_path="members/verify")
+    def verify_members(self, request, pk=None):
+        """Set ``is_verified`` for many members at once with a single UPDATE.
+
+        Body: ``{"is_verified": true, "members": [<user id>, ...]}`` or
+        ``{"is_verified": true, "filter": {"verified": "0", "search": "..."}}``
+        (an empty filter selects every member; unknown keys are rejected).
+        """
+        user = request.user
+        if not (user.is_superuser or cooperative_admin_has_operational_data(user)):
+            return Response(
+                {"detail": "Only cooperative administrators can verify members."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        cooperative = self.get_object()
+        if not isinstance(request.data, dict):
+            return Response({"detail": "Send a JSON object."}, status=status.HTTP_400_BAD_REQUEST)
+        state = request.data.get("is_verified")
+        if not isinstance(state, bool):
+            return Response({"is_verified": ["Must be true or false."]}, status=status.HTTP_400_BAD_REQUEST)
+        memberships = CooperativeMembership.objects.filter(cooperative=cooperative)
+        if "members" in request.data:
+            ids = request.data["members"]
+            if (
+                not isinstance(ids, list)
+                or len(ids) > BULK_VERIFY_MAX_IDS
+                or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+            ):
+                return Response(
+                    {"members": [f"A list of at most {BULK_VERIFY_MAX_IDS} member ids."]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            memberships = memberships.filter(user_id__in=ids)
+        elif isinstance(request.data.get("filter"), dict):
+            params, error = _bulk_member_filter(request.data["filter"])
+            if error:
+                return Response(error, status=status.HTTP_400_BAD_REQUEST)
+            memberships = _filter_members(memberships, params)
+        else:
+            return Response({"detail": "Send members or filter."}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            # update() skips the membership signals: refresh the counters and
+            # report caches here, in the same transaction.
+            updated = memberships.exclude(is_verified=state).update(is_verified=state)
+            refresh_member_counts([cooperative.pk])
+            transaction.on_commit(bump_reports_version)
+        cooperative.refresh_from_db(fields=["member_count", "verified_member_count"])
+        return Response(
+            {
+                "updated": updated,
+                "member_count": cooperative.member_count,
+                "verified_member_count": cooperative.verified_member_count,
+            }
+        )
 
     @action(detail=True, methods=["post"], url_path="members/(?P<member_id>[^/.]+)/verify")
     def verify_member(self, request, pk=None, member_id=None):
+        """Set one member's ``is_verified`` from the body, or flip it when the body has none.
+
+        Either way it is a single ``UPDATE``, so two admins clicking at once
+        cannot both read the old value and write the same flip.
+        """
         user = request.user
-        if not (user.is_authenticated and user.is_cooperative_admin and user.is_staff):
+        if not (user.is_superuser or cooperative_admin_has_operational_data(user)):
             return Response(
                 {"detail": "Only cooperative administrators can verify members."},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        try:
-            membership = CooperativeMembership.objects.get(
-                cooperative_id=pk, user_id=member_id
-            )
-        except CooperativeMembership.DoesNotExist:
-            return Response({"detail": "Member not found."}, status=status.HTTP_404_NOT_FOUND)
-        membership.is_verified = not membership.is_verified
-        membership.save(update_fields=["is_verified"])
-        return Response({"id": membership.user_id, "is_verified": membership.is_verified})
+        cooperative = self.get_object()
+        if not isinstance(request.data, dict):
+            return Response({"detail": "Send a JSON object."}, status=status.HTTP_400_BAD_REQUEST)
+        state = request.data.get("is_verified")
+        if state is not None and not isinstance(state, bool):
+            return Response({"is_verified": ["Must be true or false."]}, status=status.HTTP_400_BAD_REQUEST)
+        membership = CooperativeMembership.objects.filter(cooperative=cooperative, user_id=member_id)
+        with transaction.atomic():
+            if not membership.update(is_verified=~F("is_verified") if state is None else state):
+                return Response({"detail": "Member not found."}, status=status.HTTP_404_NOT_FOUND)
+            refresh_member_counts([cooperative.pk])
+            transaction.on_commit(bump_reports_version)
+            member_id, is_verified = membership.values_list("user_id", "is_verified").get()
+        return Response({"id": member_id, "is_verified": is_verified})
@@ -0,0 +1,139 @@
+"""Changelist building blocks for admin pages over very large tables."""
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.forms.utils import flatatt
+from django.utils.functional import cached_property
+
+from apps.users.search import indexed_condition
+
+
+def estimated_row_count(model, using="default"):
+    """Planner row estimate for ``model``'s table on Postgres; ``None`` elsewhere or if never analyzed."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that replaces ``COUNT(*)`` on an unfiltered changelist with the planner estimate.
+
+    Filtered querysets, small tables and non-Postgres databases still get an
+    exact count.
+    """
+
+    exact_count_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        if isinstance(qs, QuerySet) and not qs.query.where:
+            estimate = estimated_row_count(qs.model, qs.db)
+            if estimate is not None and estimate >= self.exact_count_threshold:
+                return estimate
+        return super().count
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """Foreign-key list filter backed by the admin autocomplete view instead of a full option list.
+
+    The related model's admin must define ``search_fields``. Only the selected
+    object, if any, is loaded to render the filter.
+    """
+
+    template = "admin/core/autocomplete_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = "%s__%s__exact" % (field_path, field.target_field.name)
+        lookup_val = params.get(self.lookup_kwarg)
+        self.lookup_val = lookup_val[-1] if isinstance(lookup_val, list) else lookup_val
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.widget = AutocompleteSelect(field, model_admin.admin_site)
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def choices(self, changelist):
+        # The template also needs the select's attributes, which depend on the changelist.
+        attrs = self.widget.build_attrs({"id": "autocomplete-filter-%s" % self.field_path})
+        attrs["data-filter-url"] = changelist.get_query_string({self.lookup_kwarg: "__value__"})
+        attrs["data-clear-url"] = changelist.get_query_string(remove=[self.lookup_kwarg])
+        self.select_attrs = flatatt(attrs)
+        self.selected = None
+        if self.lookup_val:
+            related = self.field.remote_field.model._default_manager.filter(
+                **{self.field.target_field.name: self.lookup_val}
+            ).first()
+            if related is not None:
+                self.selected = (self.lookup_val, str(related))
+        yield {
+            "selected": not self.lookup_val,
+            "query_string": attrs["data-clear-url"],
+            "display": "All",
+        }
+
+
+class LargeTableAdminMixin:
+    """ModelAdmin defaults for tables with millions of rows.
+
+    - estimated counts instead of ``COUNT(*)`` on unfiltered pages, and no
+      second "full result" count on filtered ones;
+    - no facet counts;
+    - phone-like and email terms are indexed prefix matches on the user at
+      ``search_user_path`` (``apps.users.search``); other terms fall back to
+      ``search_fields``.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    search_user_path = None
+
+    @property
+    def media(self):
+        media = super().media
+        if any(isinstance(f, (list, tuple)) and f[1] is AutocompleteFilter for f in self.list_filter):
+            media += AutocompleteSelect(None, self.admin_site).media
+            media += forms.Media(js=["core/admin/autocomplete_filter.js"])
+        return media
+
+    def get_search_results(self, request, queryset, search_term):
+        condition = indexed_condition(search_term, f"{self.search_user_path}__")
+        if condition is not None:
+            return queryset.filter(condition), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+class ClosedPeriodAdminMixin:
+    """Read-only change view and no delete for rows in a closed financial period.
+
+    New or edited rows dated into a closed period are rejected by the model's
+    ``clean()``.
+    """
+
+    def _in_closed_period(self, obj):
+        return obj is not None and obj.cooperative.is_period_closed(obj.date)
+
+    def has_change_permission(self, request, obj=None):
+        return super().has_change_permission(request, obj) and not self._in_closed_period(obj)
+
+    def has_delete_permission(self, request, obj=None):
+        return super().has_delete_permission(request, obj) and not self._in_closed_period(obj)
+
+    def delete_queryset(self, request, queryset):
+        # "Delete selected" never asks per object; drop the frozen rows here.
+        from .periods import OPEN_TAIL
+
+        super().delete_queryset(request, queryset.filter(OPEN_TAIL))
@@ -0,0 +1,72 @@
+"""Keyset-batched processing for data migrations and management commands.
+
+Rows are read in primary-key order with ``WHERE pk > last ORDER BY pk LIMIT n``
+(no OFFSET, no long-lived cursor), and each batch is committed in its own
+transaction together with its checkpoint. A rerun with the same checkpoint
+name continues after the last committed batch.
+"""
+from django.db import transaction
+
+
+def iter_keyset_batches(queryset, batch_size=1000, start_after=None):
+    """Yield lists of model instances from ``queryset`` in primary-key order, one query per batch."""
+    qs = queryset.order_by("pk")
+    last_pk = start_after
+    while True:
+        page = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
+
+
+class Checkpoint:
+    """Persist progress of a named job in ``BatchCheckpoint``.
+
+    In a data migration pass the historical model
+    (``apps.get_model("core", "BatchCheckpoint")``) and depend on
+    ``("core", "0001_initial")``.
+    """
+
+    def __init__(self, name, model=None):
+        if model is None:
+            from .models import BatchCheckpoint as model
+        self.name = name
+        self.model = model
+
+    def load(self):
+        row = self.model.objects.filter(name=self.name).values_list("last_pk", "processed").first()
+        return row if row is not None else (None, 0)
+
+    def save(self, last_pk, processed):
+        self.model.objects.update_or_create(
+            name=self.name, defaults={"last_pk": last_pk, "processed": processed}
+        )
+
+    def clear(self):
+        self.model.objects.filter(name=self.name).delete()
+
+
+def run_in_batches(queryset, process_batch, batch_size=1000, checkpoint=None, progress=None):
+    """Call ``process_batch(rows)`` for each keyset batch, committing batch by batch.
+
+    ``process_batch`` should do its writes in bulk (``bulk_update``,
+    ``bulk_create``, ``update()``). With a ``Checkpoint``, the last pk is saved
+    in the same transaction as the batch and cleared once the table is done.
+    ``progress(processed, last_pk)`` is called after each commit. Returns the
+    number of rows seen, including any counted before a resume.
+    """
+    last_pk, processed = checkpoint.load() if checkpoint is not None else (None, 0)
+    for batch in iter_keyset_batches(queryset, batch_size, start_after=last_pk):
+        last_pk = batch[-1].pk
+        processed += len(batch)
+        with transaction.atomic(using=queryset.db):
+            process_batch(batch)
+            if checkpoint is not None:
+                checkpoint.save(last_pk, processed)
+        if progress is not None:
+            progress(processed, last_pk)
+    if checkpoint is not None:
+        checkpoint.clear()
+    return processed
@@ -0,0 +1,13 @@
+"""Small timing helper shared by the ``bench_*`` management commands."""
+import time
+
+
+def best_of(repeat, fn):
+    """Run ``fn`` ``repeat`` times; return (fastest wall-clock seconds, last result)."""
+    best, out = None, None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
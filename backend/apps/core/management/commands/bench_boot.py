@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Each target runs in a fresh interpreter so nothing is already imported.
+TARGETS = {
+    "setup": "import django; django.setup()",
+    "wsgi": "import config.wsgi",
+}
+
+
+def _run(args, extra_env=None):
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings")}
+    env.update(extra_env or {})
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *args], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise CommandError(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+    return elapsed, result.stderr
+
+
+def parse_importtime(text):
+    """``-X importtime`` stderr -> [(cumulative_us, self_us, module, depth)] in import order."""
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative), int(self_us), name.strip(), depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold-start cost in fresh interpreters: 'manage.py check' and WSGI app creation "
+        "(best of --repeat), or with --importtime the slowest imports of a target."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--importtime", type=int, metavar="N", help="Show the N slowest imports instead of timing.")
+        parser.add_argument("--target", choices=sorted(TARGETS), default="wsgi", help="What --importtime profiles.")
+        parser.add_argument("--max-check-ms", type=float, help="Fail if 'manage.py check' is slower than this.")
+        parser.add_argument("--max-wsgi-ms", type=float, help="Fail if WSGI app creation is slower than this.")
+
+    def handle(self, *args, **options):
+        if options["importtime"]:
+            self._profile(options["target"], options["importtime"])
+            return
+        repeat = max(1, options["repeat"])
+        check = min(_run(["manage.py", "check"])[0] for _ in range(repeat))
+        wsgi = min(_run(["-c", TARGETS["wsgi"]])[0] for _ in range(repeat))
+        baseline = min(_run(["-c", "pass"])[0] for _ in range(repeat))
+        self.stdout.write(
+            f"interpreter={baseline * 1000:6.1f} ms  manage.py check={check * 1000:6.1f} ms  "
+            f"wsgi app={wsgi * 1000:6.1f} ms  (best of {repeat})"
+        )
+        failures = [
+            f"{label} took {elapsed * 1000:.0f} ms (limit {limit:.0f} ms)"
+            for label, elapsed, limit in (
+                ("manage.py check", check, options["max_check_ms"]),
+                ("WSGI app creation", wsgi, options["max_wsgi_ms"]),
+            )
+            if limit is not None and elapsed * 1000 > limit
+        ]
+        if failures:
+            raise CommandError("; ".join(failures))
+
+    def _profile(self, target, count):
+        _, stderr = _run(["-X", "importtime", "-c", TARGETS[target]])
+        rows = parse_importtime(stderr)
+        total = sum(cumulative for cumulative, _, _, depth in rows if depth == 0)
+        self.stdout.write(f"{target}: {len(rows)} modules, {total / 1000:.1f} ms cumulative (importtime adds overhead)")
+        self.stdout.write(f"{'cumulative ms':>14} {'self ms':>8}  module")
+        for cumulative, self_us, name, _ in sorted(rows, reverse=True)[:count]:
+            self.stdout.write(f"{cumulative / 1000:14.1f} {self_us / 1000:8.1f}  {name}")
@@ -0,0 +1,72 @@
+import io
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.benchmark import best_of
+from apps.core.parsers import ORJSONParser
+from apps.core.renderers import ORJSONRenderer, orjson
+
+
+def _list_payload(n):
+    """Shape of ``/api/contributions/``: serializer output, amounts already strings."""
+    created = datetime(2026, 1, 1, 8, 0, tzinfo=dt_timezone.utc)
+    return [
+        {
+            "id": i,
+            "rider": {"id": i % 500, "email": f"rider{i % 500}@example.com", "phone_number": f"07{i % 500:08d}"},
+            "cooperative": {"id": 1, "name": "Benchmark Coop"},
+            "date": (date(2020, 1, 1) + timedelta(days=i // 500)).isoformat(),
+            "amount": f"{(i % 9000) + 100}.50",
+            "status": "VERIFIED" if i % 3 else "PENDING",
+            "created_at": created.isoformat().replace("+00:00", "Z"),
+            "updated_at": created.isoformat().replace("+00:00", "Z"),
+        }
+        for i in range(n)
+    ]
+
+
+def _report_payload(n):
+    """Shape of ``/api/reports/income-by-rider/``: raw Decimal totals from aggregates."""
+    return {
+        "results": [
+            {
+                "rider_id": i,
+                "rider_email": f"rider{i}@example.com",
+                "cooperative_id": i % 20,
+                "cooperative_name": f"Coop {i % 20}",
+                "total": Decimal(i * 137) / Decimal(4),
+            }
+            for i in range(n)
+        ]
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare DRF's stdlib JSON renderer/parser with the orjson-backed ones on large payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write("orjson is not installed; ORJSONRenderer falls back to the stdlib renderer.")
+        rows, repeat = options["rows"], options["repeat"]
+        for label, payload in (("list", _list_payload(rows)), ("report", _report_payload(rows))):
+            std_s, std_body = best_of(repeat, lambda: JSONRenderer().render(payload))
+            fast_s, fast_body = best_of(repeat, lambda: ORJSONRenderer().render(payload))
+            self.stdout.write(
+                f"render {label:7s} stdlib={std_s * 1000:7.1f} ms  orjson={fast_s * 1000:7.1f} ms  "
+                f"speedup={std_s / fast_s:5.2f}x  identical={std_body == fast_body}  bytes={len(fast_body)}"
+            )
+            std_s, _ = best_of(repeat, lambda: JSONParser().parse(io.BytesIO(std_body)))
+            fast_s, _ = best_of(repeat, lambda: ORJSONParser().parse(io.BytesIO(std_body)))
+            self.stdout.write(
+                f"parse  {label:7s} stdlib={std_s * 1000:7.1f} ms  orjson={fast_s * 1000:7.1f} ms  "
+                f"speedup={std_s / fast_s:5.2f}x"
+            )
+
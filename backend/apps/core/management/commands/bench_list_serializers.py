@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from apps.contributions.models import Contribution
+from apps.contributions.serializers import ContributionSerializer, contribution_rows
+from apps.cooperatives.models import Cooperative
+from apps.core.benchmark import best_of
+from apps.income.models import IncomeRecord
+from apps.income.serializers import IncomeRecordSerializer, income_record_rows
+from apps.users.models import User
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ModelSerializer vs the values()-based fast path on large income/contribution lists. "
+        "Fixture rows are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--riders", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._seed(options["rows"], options["riders"])
+                self._run(options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, n_rows, n_riders):
+        coop = Cooperative.objects.create(name="Benchmark Coop")
+        riders = User.objects.bulk_create(
+            User(
+                username=f"bench{i:06d}",
+                email=f"bench{i:06d}@bench.local" if i % 2 else None,
+                phone_number=f"09{i:08d}",
+                role=User.Role.RIDER,
+            )
+            for i in range(n_riders)
+        )
+        start = date(2020, 1, 1)
+        days_per_rider = -(-n_rows // n_riders)
+        income, contributions = [], []
+        for i in range(n_rows):
+            rider = riders[i % n_riders]
+            day = start + timedelta(days=i // n_riders)
+            income.append(IncomeRecord(rider=rider, cooperative=coop, date=day, amount=Decimal("1234.50")))
+            contributions.append(Contribution(rider=rider, cooperative=coop, date=day, amount=Decimal("250")))
+        IncomeRecord.objects.bulk_create(income, batch_size=2000)
+        Contribution.objects.bulk_create(contributions, batch_size=2000)
+        self.stdout.write(f"Seeded {n_rows} rows per table ({n_riders} riders x {days_per_rider} days).")
+
+    def _run(self, repeat):
+        renderer = JSONRenderer()
+        cases = [
+            (
+                "income",
+                IncomeRecord.objects.select_related("rider", "cooperative"),
+                lambda qs: IncomeRecordSerializer(qs, many=True).data,
+                income_record_rows,
+            ),
+            (
+                "contributions",
+                Contribution.objects.select_related("rider", "cooperative"),
+                lambda qs: ContributionSerializer(qs, many=True).data,
+                contribution_rows,
+            ),
+        ]
+        for label, qs, slow, fast in cases:
+            slow_s, slow_body = best_of(repeat, lambda: renderer.render(slow(qs.all())))
+            fast_s, fast_body = best_of(repeat, lambda: renderer.render(fast(qs.all())))
+            self.stdout.write(
+                f"{label:14s} serializer={slow_s * 1000:8.1f} ms  values()={fast_s * 1000:8.1f} ms  "
+                f"speedup={slow_s / fast_s:5.2f}x  identical={slow_body == fast_body}  bytes={len(fast_body)}"
+            )
+
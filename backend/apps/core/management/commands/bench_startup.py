@@ -0,0 +1,94 @@
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+CONFIG = Path(settings.BASE_DIR) / "config" / "gunicorn_conf.py"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+    except urllib.error.HTTPError as exc:  # 4xx still means the app answered
+        exc.read()
+    return time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Start Gunicorn with config/gunicorn_conf.py (one worker) with and without warm-up, and report "
+        "time from spawn to first response, first-request latency and steady-state latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/cooperatives/signup_choices/")
+        parser.add_argument("--repeat", type=int, default=3, help="Server starts per mode.")
+        parser.add_argument("--requests", type=int, default=20, help="Requests after the first, per start.")
+        parser.add_argument("--boot-timeout", type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        for warmup in ("0", "1"):
+            runs = [self._run(warmup, options) for _ in range(max(1, options["repeat"]))]
+            spawn, first, steady = (statistics.median(values) for values in zip(*runs))
+            self.stdout.write(
+                f"warmup={warmup}  spawn->first response={spawn * 1000:7.1f} ms  "
+                f"first request={first * 1000:6.1f} ms  steady median={steady * 1000:5.1f} ms"
+            )
+
+    def _run(self, warmup, options):
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}{options['path']}"
+        env = {
+            **os.environ,
+            "GUNICORN_BIND": f"127.0.0.1:{port}",
+            "WEB_CONCURRENCY": "1",
+            "GUNICORN_WARMUP": warmup,
+        }
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", str(CONFIG), "config.wsgi:application"],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            # The first line from a booted worker is the signal that it is about to serve.
+            for line in server.stderr:
+                if "Booting worker" in line:
+                    break
+                if time.perf_counter() - started > options["boot_timeout"]:
+                    raise CommandError("Gunicorn did not boot in time.")
+            else:
+                raise CommandError("Gunicorn exited during startup; run it by hand to see the error.")
+            while True:
+                try:
+                    first = _get(url)
+                    break
+                except (ConnectionError, urllib.error.URLError):
+                    if time.perf_counter() - started > options["boot_timeout"]:
+                        raise CommandError(f"No response from {url}.") from None
+                    time.sleep(0.01)
+            spawn = time.perf_counter() - started
+            steady = statistics.median(_get(url) for _ in range(max(1, options["requests"])))
+            return spawn, first, steady
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from apps.core.partitioning import (
+    DEFAULT_MONTHS_AHEAD,
+    PARTITIONED_TABLES,
+    convert_to_partitioned,
+    ensure_partitions,
+    is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-create monthly partitions of the income and contribution tables (PostgreSQL). "
+        "Run from cron at least monthly so new rows never land in the default partition."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months", type=int, default=DEFAULT_MONTHS_AHEAD, help="Months ahead of the current one.")
+        parser.add_argument("--convert", action="store_true", help="Convert tables that are not partitioned yet.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "postgresql":
+            self.stdout.write(f"Partitioning needs PostgreSQL ({connection.vendor} in use); nothing to do.")
+            return
+        current = timezone.localdate().replace(day=1)
+        for table in PARTITIONED_TABLES:
+            with connection.cursor() as cursor:
+                partitioned = is_partitioned(cursor, table)
+            if not partitioned:
+                if not options["convert"]:
+                    self.stderr.write(f"{table} is not partitioned; rerun with --convert to rebuild it.")
+                    continue
+                self.stdout.write(f"Converting {table}...")
+                convert_to_partitioned(connection, table, options["months"])
+            created = ensure_partitions(connection, table, current, options["months"])
+            self.stdout.write(f"{table}: {len(created)} partition(s) created{': ' + ', '.join(created) if created else ''}.")
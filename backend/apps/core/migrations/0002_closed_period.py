@@ -0,0 +1,54 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+        ("cooperatives", "0003_cooperative_closed_through"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClosedPeriod",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("month", models.DateField(help_text="First day of the closed month.")),
+                ("closed_at", models.DateTimeField(auto_now_add=True)),
+                ("closed_by", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="+", to=settings.AUTH_USER_MODEL)),
+                ("cooperative", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="closed_periods", to="cooperatives.cooperative")),
+            ],
+            options={
+                "db_table": "core_closed_period",
+                "ordering": ["cooperative", "month"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("cooperative", "month"), name="unique_closed_period_per_coop_month"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="PeriodSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("month", models.DateField()),
+                ("income_total", models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ("contribution_total", models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ("cooperative", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="cooperatives.cooperative")),
+                ("period", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="snapshots", to="core.closedperiod")),
+                ("rider", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "db_table": "core_period_snapshot",
+                "indexes": [
+                    models.Index(fields=["rider", "month"], name="snapshot_rider_month_idx"),
+                    models.Index(fields=["cooperative", "month"], name="snapshot_coop_month_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=("period", "rider"), name="unique_period_snapshot_per_rider"),
+                ],
+            },
+        ),
+    ]
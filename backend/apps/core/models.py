@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db import models
+
+
+class BatchCheckpoint(models.Model):
+    """Last primary key committed by a named batched job (see ``apps.core.batching``)."""
+
+    name = models.CharField(max_length=200, unique=True)
+    last_pk = models.BigIntegerField(null=True, blank=True)
+    processed = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "core_batch_checkpoint"
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_pk}"
+
+
+class ClosedPeriod(models.Model):
+    """A cooperative month whose totals are frozen in ``PeriodSnapshot`` rows."""
+
+    cooperative = models.ForeignKey(
+        "cooperatives.Cooperative",
+        on_delete=models.CASCADE,
+        related_name="closed_periods",
+    )
+    month = models.DateField(help_text="First day of the closed month.")
+    closed_at = models.DateTimeField(auto_now_add=True)
+    closed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    class Meta:
+        db_table = "core_closed_period"
+        ordering = ["cooperative", "month"]
+        constraints = [
+            models.UniqueConstraint(fields=["cooperative", "month"], name="unique_closed_period_per_coop_month"),
+        ]
+
+    def __str__(self):
+        return f"{self.cooperative} {self.month:%Y-%m}"
+
+
+class PeriodSnapshot(models.Model):
+    """Per-rider totals of a closed period; ``None`` means the rider had no rows of that kind."""
+
+    period = models.ForeignKey(ClosedPeriod, on_delete=models.CASCADE, related_name="snapshots")
+    cooperative = models.ForeignKey("cooperatives.Cooperative", on_delete=models.CASCADE, related_name="+")
+    month = models.DateField()
+    rider = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    income_total = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    contribution_total = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        db_table = "core_period_snapshot"
+        constraints = [
+            models.UniqueConstraint(fields=["period", "rider"], name="unique_period_snapshot_per_rider"),
+        ]
+        indexes = [
+            models.Index(fields=["rider", "month"], name="snapshot_rider_month_idx"),
+            models.Index(fields=["cooperative", "month"], name="snapshot_coop_month_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.rider} {self.month:%Y-%m}"
@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+
+class RiderCursorPagination(CursorPagination):
+    """Keyset pages over riders by id: constant cost per page however deep the client goes."""
+
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
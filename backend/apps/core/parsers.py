@@ -0,0 +1,22 @@
+"""JSON parser backed by orjson, with DRF's ``JSONParser`` as the fallback."""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer, orjson
+
+
+class ORJSONParser(JSONParser):
+    """Drop-in ``JSONParser`` that decodes UTF-8 bodies with orjson when it is installed."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET).lower().replace("_", "-")
+        if orjson is None or encoding not in ("utf-8", "utf8") or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
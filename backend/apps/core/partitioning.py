@@ -0,0 +1,136 @@
+"""Optional monthly range partitioning of the income and contribution tables (PostgreSQL only).
+
+Partitioned tables keep each month in its own heap and indexes, so recent
+date-range queries prune old months and index maintenance only touches the
+current partition. Turned on with ``manage.py create_partitions --convert``;
+no migration converts the tables, so migration history never depends on
+this module. Other backends, SQLite included, keep plain tables.
+
+PostgreSQL requires the partition key in every unique constraint, so the
+primary key becomes ``(id, date)``; ``id`` stays unique because it still
+comes from a single sequence. A ``_default`` partition catches rows outside
+the pre-created months, and ``create_partitions`` moves them out when it
+adds the matching month.
+"""
+from datetime import date
+
+from django.db import transaction
+from django.utils import timezone
+
+PARTITIONED_TABLES = ("income_incomerecord", "contributions_contribution")
+PARTITION_KEY = "date"
+DEFAULT_MONTHS_AHEAD = 3
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y_%m}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def is_partitioned(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+        [table],
+    )
+    return cursor.fetchone() is not None
+
+
+def existing_partitions(cursor, table):
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)",
+        [table],
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def attach_partition_sql(quote, table, month):
+    """Statements that add ``month``'s partition, moving any matching rows out of the default partition."""
+    name, default = quote(partition_name(table, month)), quote(default_partition_name(table))
+    parent, key = quote(table), quote(PARTITION_KEY)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    in_range = f"{key} >= '{start}' AND {key} < '{end}'"
+    return [
+        f"CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS)",
+        f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_range}",
+        f"DELETE FROM {default} WHERE {in_range}",
+        f"ALTER TABLE {parent} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')",
+    ]
+
+
+def ensure_partitions(connection, table, first_month, months_ahead=DEFAULT_MONTHS_AHEAD):
+    """Create missing month partitions from ``first_month`` through ``months_ahead`` months after it."""
+    quote = connection.ops.quote_name
+    created = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        existing = existing_partitions(cursor, table)
+        for offset in range(months_ahead + 1):
+            month = add_months(first_month, offset)
+            if partition_name(table, month) in existing:
+                continue
+            for statement in attach_partition_sql(quote, table, month):
+                cursor.execute(statement)
+            created.append(partition_name(table, month))
+    return created
+
+
+def convert_to_partitioned(connection, table, months_ahead=DEFAULT_MONTHS_AHEAD, today=None):
+    """Rebuild ``table`` as a monthly range-partitioned table, keeping its rows, constraints and indexes."""
+    quote = connection.ops.quote_name
+    parent, key, old = quote(table), quote(PARTITION_KEY), quote(f"{table}_unpartitioned")
+    sequence = quote(f"{table}_id_seq")
+    current = (today or timezone.localdate()).replace(day=1)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f', 'c') ORDER BY contype DESC",
+            [table],
+        )
+        constraints = cursor.fetchall()
+        constraint_names = {name for name, _, _ in constraints}
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s AND schemaname = current_schema()",
+            [table],
+        )
+        indexes = [definition for name, definition in cursor.fetchall() if name not in constraint_names]
+        cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {parent}")
+        low, high = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {parent} RENAME TO {old}")
+        cursor.execute(f"CREATE TABLE {parent} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE ({key})")
+        cursor.execute(f"CREATE TABLE {quote(default_partition_name(table))} PARTITION OF {parent} DEFAULT")
+        month = (low or current).replace(day=1)
+        last = max((high or current).replace(day=1), add_months(current, months_ahead))
+        while month <= last:
+            cursor.execute(
+                f"CREATE TABLE {quote(partition_name(table, month))} PARTITION OF {parent} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+            month = add_months(month, 1)
+        cursor.execute(f"INSERT INTO {parent} SELECT * FROM {old}")
+        cursor.execute(f"DROP TABLE {old}")
+
+        # Identity columns cannot be declared on a partitioned table before PostgreSQL 17.
+        cursor.execute(f"CREATE SEQUENCE {sequence} OWNED BY {parent}.{quote('id')}")
+        cursor.execute(f"ALTER TABLE {parent} ALTER COLUMN {quote('id')} SET DEFAULT nextval('{sequence}')")
+        cursor.execute(
+            f"SELECT setval('{sequence}', COALESCE((SELECT MAX({quote('id')}) FROM {parent}), 1), "
+            f"(SELECT MAX({quote('id')}) FROM {parent}) IS NOT NULL)"
+        )
+        for name, kind, definition in constraints:
+            if kind == "p":
+                definition = f"PRIMARY KEY ({quote('id')}, {key})"
+            cursor.execute(f"ALTER TABLE {parent} ADD CONSTRAINT {quote(name)} {definition}")
+        for definition in indexes:
+            cursor.execute(definition)
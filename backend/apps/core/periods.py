@@ -0,0 +1,147 @@
+"""Financial period close: freeze a cooperative's monthly totals.
+
+Closing a month closes every month from the previous close (or the first
+month with data) through it, so each cooperative has a single watermark,
+``Cooperative.closed_through``. Rows on or before it are locked, their
+per-rider totals live in ``PeriodSnapshot``, and stats endpoints aggregate
+live rows only for the open tail after it (``OPEN_TAIL``).
+"""
+import calendar
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import F, Min, Q, Sum
+from django.db.models.functions import TruncMonth, TruncYear
+from django.utils import timezone
+
+from apps.contributions.models import Contribution
+from apps.cooperatives.models import Cooperative
+from apps.income.models import IncomeRecord
+
+from .models import ClosedPeriod, PeriodSnapshot
+
+# Filter for IncomeRecord/Contribution querysets: rows not covered by a snapshot.
+OPEN_TAIL = Q(cooperative__closed_through__isnull=True) | Q(date__gt=F("cooperative__closed_through"))
+
+
+class PeriodCloseError(Exception):
+    pass
+
+
+def month_end(first):
+    return first.replace(day=calendar.monthrange(first.year, first.month)[1])
+
+
+def _next_month(first):
+    return month_end(first) + timedelta(days=1)
+
+
+def close_period(cooperative, month, user=None):
+    """Close ``cooperative`` through ``month`` (any date in it). Returns the new ``ClosedPeriod`` rows."""
+    first = month.replace(day=1)
+    last = month_end(first)
+    if last >= timezone.localdate():
+        raise PeriodCloseError("Only months that have ended can be closed.")
+    with transaction.atomic():
+        coop = Cooperative.objects.select_for_update().get(pk=cooperative.pk)
+        if coop.closed_through and last <= coop.closed_through:
+            raise PeriodCloseError("This month is already closed.")
+        if coop.closed_through:
+            start = coop.closed_through + timedelta(days=1)
+        else:
+            earliest = [
+                model.objects.filter(cooperative=coop).aggregate(first=Min("date"))["first"]
+                for model in (IncomeRecord, Contribution)
+            ]
+            start = min([d for d in earliest if d] or [first]).replace(day=1)
+            start = min(start, first)
+        pending = Contribution.objects.filter(
+            cooperative=coop, date__range=(start, last), status=Contribution.Status.PENDING
+        ).count()
+        if pending:
+            raise PeriodCloseError(f"{pending} contribution(s) in this range are still pending verification.")
+
+        periods = {}
+        cursor = start
+        while cursor <= first:
+            periods[cursor] = ClosedPeriod(cooperative=coop, month=cursor, closed_by=user)
+            cursor = _next_month(cursor)
+        ClosedPeriod.objects.bulk_create(periods.values())
+        if not all(p.pk for p in periods.values()):
+            # Backends without RETURNING from bulk_create.
+            periods = {p.month: p for p in ClosedPeriod.objects.filter(cooperative=coop, month__gte=start)}
+
+        totals = {}
+        for model, field in ((IncomeRecord, "income_total"), (Contribution, "contribution_total")):
+            rows = (
+                model.objects.filter(cooperative=coop, date__range=(start, last))
+                .annotate(period=TruncMonth("date"))
+                .values("period", "rider_id")
+                .annotate(total=Sum("amount"))
+                .order_by()
+            )
+            for row in rows:
+                totals.setdefault((row["period"], row["rider_id"]), {})[field] = row["total"]
+        PeriodSnapshot.objects.bulk_create(
+            [
+                PeriodSnapshot(period=periods[period], cooperative=coop, month=period, rider_id=rider_id, **fields)
+                for (period, rider_id), fields in totals.items()
+            ],
+            batch_size=1000,
+        )
+        coop.closed_through = last
+        coop.save(update_fields=["closed_through"])
+    cooperative.closed_through = last
+    return list(periods.values())
+
+
+def reopen_period(cooperative, month):
+    """Reopen ``month`` and every later closed month of ``cooperative``."""
+    first = month.replace(day=1)
+    with transaction.atomic():
+        coop = Cooperative.objects.select_for_update().get(pk=cooperative.pk)
+        if not coop.closed_through or first > coop.closed_through:
+            raise PeriodCloseError("This month is not closed.")
+        ClosedPeriod.objects.filter(cooperative=coop, month__gte=first).delete()
+        previous = ClosedPeriod.objects.filter(cooperative=coop).order_by("-month").values_list("month", flat=True).first()
+        coop.closed_through = month_end(previous) if previous else None
+        coop.save(update_fields=["closed_through"])
+    cooperative.closed_through = coop.closed_through
+
+
+def snapshot_queryset(user):
+    """Snapshots visible to ``user``, scoped like the income and contribution lists."""
+    qs = PeriodSnapshot.objects.all()
+    if user.is_superuser:
+        return qs
+    if user.is_rider:
+        return qs.filter(rider=user)
+    if user.is_cooperative_admin and user.is_staff:
+        return qs.filter(cooperative__admins=user, rider__cooperative_membership__is_verified=True)
+    return qs.none()
+
+
+def period_totals(live_qs, snapshots, field, group_by="month", year=None):
+    """``[{"period", "total"}]`` per month or year: snapshots for closed months plus the live open tail."""
+    if group_by == "year":
+        trunc, fmt = TruncYear, "%Y"
+    else:
+        trunc, fmt = TruncMonth, "%Y-%m"
+        if year:
+            live_qs = live_qs.filter(date__year=year)
+            snapshots = snapshots.filter(month__year=year)
+    totals = {}
+    live = live_qs.filter(OPEN_TAIL).annotate(bucket=trunc("date")).values("bucket").annotate(total=Sum("amount"))
+    frozen = (
+        snapshots.filter(**{f"{field}__isnull": False})
+        .annotate(bucket=trunc("month"))
+        .values("bucket")
+        .annotate(total=Sum(field))
+    )
+    for rows in (live.order_by(), frozen.order_by()):
+        for row in rows:
+            period = row["bucket"]
+            if isinstance(period, date):
+                period = period.strftime(fmt)
+            totals[period] = totals.get(period, 0) + (row["total"] or 0)
+    return [{"period": period, "total": str(total)} for period, total in sorted(totals.items())]
@@ -0,0 +1,93 @@
+"""Per-rider, per-period income vs. contributions (``/api/reports/reconciliation/``).
+
+A page is a set of riders; for them, one grouped query over income and one
+over contributions produce ``(rider_id, period)`` totals that are merged in
+memory. Responses are cached per user and query string under a global
+reports version that every income or contribution write bumps (see
+``signals.py``), so a cached page never outlives the data it was built from.
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Case, DecimalField, Sum, Value, When
+from django.db.models.functions import TruncMonth, TruncYear
+
+from apps.contributions.models import Contribution
+
+REPORTS_VERSION_KEY = "reports:version"
+RECONCILIATION_CACHE_SECONDS = 5 * 60
+_RATIO_PLACES = Decimal("0.0001")
+
+
+def reports_version():
+    return cache.get(REPORTS_VERSION_KEY, 0)
+
+
+def bump_reports_version():
+    try:
+        cache.incr(REPORTS_VERSION_KEY)
+    except ValueError:
+        cache.set(REPORTS_VERSION_KEY, 1, None)
+
+
+def _ratio(part, whole):
+    if not whole:
+        return None
+    return str((part / whole).quantize(_RATIO_PLACES))
+
+
+def reconcile(income_qs, contribution_qs, rider_ids, group_by="month"):
+    """``{rider_id: [period rows]}`` for ``rider_ids``; periods ascending, ``YYYY-MM`` or ``YYYY``."""
+    trunc, fmt = (TruncYear, "%Y") if group_by == "year" else (TruncMonth, "%Y-%m")
+    zero = Decimal("0")
+    merged = {}
+
+    def row(rider_id, period):
+        key = (rider_id, period.strftime(fmt))
+        if key not in merged:
+            merged[key] = {"income": zero, "submitted": zero, "verified": zero, "contributions": 0}
+        return merged[key]
+
+    income = (
+        income_qs.filter(rider_id__in=rider_ids)
+        .annotate(bucket=trunc("date"))
+        .values("rider_id", "bucket")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    )
+    for r in income:
+        row(r["rider_id"], r["bucket"])["income"] = r["total"] or zero
+    contributions = (
+        contribution_qs.filter(rider_id__in=rider_ids)
+        .annotate(bucket=trunc("date"))
+        .values("rider_id", "bucket")
+        .annotate(
+            submitted=Sum("amount"),
+            verified=Sum(
+                Case(
+                    When(status=Contribution.Status.VERIFIED, then="amount"),
+                    default=Value(0),
+                    output_field=DecimalField(),
+                )
+            ),
+        )
+        .order_by()
+    )
+    for r in contributions:
+        entry = row(r["rider_id"], r["bucket"])
+        entry["submitted"] = r["submitted"] or zero
+        entry["verified"] = r["verified"] or zero
+
+    by_rider = {}
+    for (rider_id, period), totals in sorted(merged.items()):
+        by_rider.setdefault(rider_id, []).append(
+            {
+                "period": period,
+                "income": str(totals["income"]),
+                "contributions_submitted": str(totals["submitted"]),
+                "contributions_verified": str(totals["verified"]),
+                "submitted_ratio": _ratio(totals["submitted"], totals["income"]),
+                "verified_ratio": _ratio(totals["verified"], totals["income"]),
+            }
+        )
+    return by_rider
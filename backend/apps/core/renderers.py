@@ -0,0 +1,69 @@
+"""JSON renderer backed by orjson, with DRF's ``JSONRenderer`` as the fallback."""
+import math
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only where orjson is not installed
+    orjson = None
+
+# Datetimes go through DRF's encoder so their format matches the stdlib renderer exactly.
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+)
+
+_drf_default = JSONEncoder().default
+
+
+def _has_non_finite(data):
+    """True if ``data`` holds a NaN or infinite float or Decimal anywhere in its dicts and lists."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, Decimal):
+            if not value.is_finite():
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Drop-in ``JSONRenderer`` that encodes with orjson when it is installed.
+
+    Types orjson does not handle natively (Decimal, lazy strings, querysets,
+    datetimes) are delegated to DRF's encoder, so output matches the default
+    renderer: serializer ``DecimalField`` values stay strings, bare Decimals in
+    report payloads stay numbers. Indented output (browsable API, ``; indent=``)
+    and non-strict settings use the stdlib path. orjson writes NaN and
+    infinity as ``null``; such payloads also go through the stdlib path, which
+    rejects them as the default strict renderer does.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self.compact or self.ensure_ascii or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_drf_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder still accepts.
+            return super().render(data, accepted_media_type, renderer_context)
+        # A non-finite number comes out as null; only then is it worth walking the data.
+        if b"null" in ret and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same JavaScript-subset escaping as DRF's renderer.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -0,0 +1,102 @@
+"""Read-replica routing.
+
+Reads go to the ``replica`` database only inside views that opt in through
+``ReplicaReadMixin.replica_actions`` (reports, stats, summaries, lists), and
+only when the requesting user has not written recently. Everything else,
+and every write, uses ``default``. Two things keep reads consistent with the
+user's own writes:
+
+- a write in the current request switches the rest of that request back to
+  the primary;
+- ``StickyPrimaryMiddleware`` remembers users who wrote (successful unsafe
+  request) for ``REPLICA_STICKY_SECONDS``, via the shared cache, so follow-up
+  reads from any worker skip the lagging replica.
+
+Without a ``replica`` entry in ``DATABASES`` all of this is a no-op.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = "replica"
+# Same as rest_framework.permissions.SAFE_METHODS; not imported so the
+# middleware does not load DRF before the first API request needs it.
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.settings
+
+
+def _sticky_key(user_id):
+    return f"db:sticky-primary:{user_id}"
+
+
+def mark_recent_writer(user):
+    cache.set(_sticky_key(user.pk), 1, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_recent_writer(user):
+    return bool(user and user.is_authenticated and cache.get(_sticky_key(user.pk)))
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get() and replica_configured():
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes for the rest of this request. Always name the
+        # primary: without a router answer Django would write back to the
+        # database an instance was loaded from.
+        _read_from_replica.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+
+class ReplicaReadMixin:
+    """Serve the listed safe actions from the replica (see module docstring)."""
+
+    replica_actions = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_from_replica.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_from_replica.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication and permission checks run on the primary.
+        super().initial(request, *args, **kwargs)
+        if (
+            request.method in SAFE_METHODS
+            and self.action in self.replica_actions
+            and replica_configured()
+            and not is_recent_writer(request.user)
+        ):
+            _read_from_replica.set(True)
+
+
+class StickyPrimaryMiddleware:
+    """Pin a user's reads to the primary for a short while after they write."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replica_configured():
+            # DRF copies the token-authenticated user onto the Django request.
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                mark_recent_writer(user)
+        return response
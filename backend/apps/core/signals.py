@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.contributions.models import Contribution
+from apps.income.models import IncomeRecord
+
+from .reconciliation import bump_reports_version
+from .statements import bump_rider_generation
+
+
+@receiver(post_save, sender=IncomeRecord)
+@receiver(post_delete, sender=IncomeRecord)
+@receiver(post_save, sender=Contribution)
+@receiver(post_delete, sender=Contribution)
+def statement_inputs_changed(sender, instance, **kwargs):
+    # As with signup choices: bump now and again after commit so a statement
+    # rendered from pre-commit data cannot stay pinned.
+    rider_id = instance.rider_id
+    bump_rider_generation(rider_id)
+    bump_reports_version()
+    transaction.on_commit(lambda: bump_rider_generation(rider_id))
+    transaction.on_commit(bump_reports_version)
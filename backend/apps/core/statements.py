@@ -0,0 +1,111 @@
+"""Monthly rider statements (income and contributions), cached by content hash.
+
+The rendered HTML is stored in the cache under the SHA-256 of its inputs, so
+an unchanged month is never re-rendered. For closed months (ending before
+today) a pointer from (rider, generation, month) to that hash is kept as
+well, so repeat downloads skip the database entirely. Any income or
+contribution write for the rider bumps the rider's generation (see
+``signals.py``), which orphans every pointer for that rider.
+"""
+import calendar
+import hashlib
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import CharField, Value
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from apps.contributions.models import Contribution
+from apps.income.models import IncomeRecord
+
+STATEMENT_TEMPLATE = "core/statement.html"
+# Bump when the template or row layout changes so old artifacts are not reused.
+STATEMENT_VERSION = 2
+STATEMENT_CACHE_SECONDS = 60 * 60 * 24 * 30
+
+
+def parse_month(value):
+    """``"2026-02"`` -> (date(2026, 2, 1), date(2026, 2, 28)); ``ValueError`` on bad input."""
+    year, month = (int(part) for part in str(value).split("-"))
+    try:
+        first = date(year, month, 1)
+    except OverflowError:
+        raise ValueError(f"Year out of range: {year}") from None
+    return first, first.replace(day=calendar.monthrange(year, month)[1])
+
+
+def _generation_key(rider_id):
+    return f"statement:gen:{rider_id}"
+
+
+def bump_rider_generation(rider_id):
+    try:
+        cache.incr(_generation_key(rider_id))
+    except ValueError:
+        cache.set(_generation_key(rider_id), 1, None)
+
+
+def statement_rows(rider_id, first, last):
+    """Income and contribution lines for the month as one ``UNION ALL`` query, by date and cooperative."""
+    income = (
+        IncomeRecord.objects.filter(rider_id=rider_id, date__range=(first, last))
+        .annotate(kind=Value("income", output_field=CharField()), state=Value("", output_field=CharField()))
+        .values_list("date", "kind", "amount", "state", "cooperative__name")
+        .order_by()
+    )
+    contributions = (
+        Contribution.objects.filter(rider_id=rider_id, date__range=(first, last))
+        .annotate(kind=Value("contribution", output_field=CharField()))
+        .values_list("date", "kind", "amount", "status", "cooperative__name")
+        .order_by()
+    )
+    return sorted(income.union(contributions, all=True), key=lambda row: (row[0], row[4], row[1]))
+
+
+def _summarize(rows):
+    totals = {"income": Decimal("0"), "verified": Decimal("0"), "pending": Decimal("0")}
+    # One line per (day, cooperative): records are unique per rider, cooperative and date.
+    lines = {}
+    for day, kind, amount, state, cooperative in rows:
+        line = lines.setdefault((day, cooperative), {"date": day, "cooperative": cooperative, "income": None, "contribution": None, "status": ""})
+        if kind == "income":
+            line["income"] = amount
+            totals["income"] += amount
+        else:
+            line["contribution"] = amount
+            line["status"] = state
+            totals["verified" if state == Contribution.Status.VERIFIED else "pending"] += amount
+    return list(lines.values()), totals
+
+
+def get_statement(rider, month_value):
+    """Return ``(html, digest)`` for the rider's statement of ``month_value`` (``YYYY-MM``)."""
+    first, last = parse_month(month_value)
+    closed = last < timezone.localdate()
+    pointer_key = None
+    if closed:
+        generation = cache.get(_generation_key(rider.pk), 0)
+        pointer_key = f"statement:ptr:{rider.pk}:{generation}:{first:%Y-%m}"
+        digest = cache.get(pointer_key)
+        if digest is not None:
+            html = cache.get(f"statement:html:{digest}")
+            if html is not None:
+                return html, digest
+
+    rows = statement_rows(rider.pk, first, last)
+    identity = (STATEMENT_VERSION, rider.pk, rider.get_full_name(), rider.phone_number, rider.email, first, closed)
+    digest = hashlib.sha256(repr((identity, rows)).encode()).hexdigest()
+    artifact_key = f"statement:html:{digest}"
+    html = cache.get(artifact_key)
+    if html is None:
+        lines, totals = _summarize(rows)
+        html = render_to_string(
+            STATEMENT_TEMPLATE,
+            {"rider": rider, "month": first, "lines": lines, "totals": totals, "closed": closed},
+        )
+        cache.set(artifact_key, html, STATEMENT_CACHE_SECONDS)
+    if pointer_key is not None:
+        cache.set(pointer_key, digest, STATEMENT_CACHE_SECONDS)
+    return html, digest
@@ -0,0 +1,13 @@
+'use strict';
+{
+    const $ = django.jQuery;
+
+    // Navigate to the filtered changelist when a value is picked in an AutocompleteFilter.
+    $(function() {
+        $('select[data-filter-url]').on('change', function() {
+            window.location.href = this.value
+                ? this.dataset.filterUrl.replace('__value__', encodeURIComponent(this.value))
+                : this.dataset.clearUrl;
+        });
+    });
+}
@@ -1,10 +1,23 @@
+import importlib
 from datetime import date
+from unittest import skipUnless
+from unittest.mock import Mock
+from decimal import Decimal
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.db import IntegrityError, connection, connections, router, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 from apps.cooperatives.models import Cooperative, CooperativeMembership
 from apps.contributions.models import Contribution
+from apps.core.batching import Checkpoint, run_in_batches
+from apps.core.models import BatchCheckpoint, PeriodSnapshot
+from apps.core.partitioning import convert_to_partitioned, default_partition_name, existing_partitions, is_partitioned
+from apps.core.replica import REPLICA_ALIAS
+from apps.core.statements import _summarize, statement_rows
 from apps.income.models import IncomeRecord
 from apps.users.models import User
 
@@ -46,3 +59,377 @@ class ReportTests(TestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertIn('results', resp.data)
         self.assertIsInstance(resp.data['results'], list)
+
+
+class StatementTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.rider = User.objects.create_user(username='0788111111', phone_number='0788111111', password='rider123', role=User.Role.RIDER, first_name='Aline')
+        CooperativeMembership.objects.create(user=self.rider, cooperative=self.coop, is_verified=True)
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 3, 1), amount=5000)
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 3, 2), amount=7000)
+        Contribution.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 3, 1), amount=500, status=Contribution.Status.VERIFIED)
+        Contribution.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 3, 2), amount=700)
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 4, 1), amount=9999)
+
+    def _auth(self, user):
+        r = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(r.access_token))
+
+    def test_rider_gets_own_month(self):
+        self._auth(self.rider)
+        resp = self.client.get('/api/reports/statement/?month=2024-03')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp['Content-Type'], 'text/html; charset=utf-8')
+        body = resp.content.decode()
+        self.assertIn('Aline', body)
+        self.assertIn('12000.00', body)
+        self.assertIn('500.00', body)
+        self.assertIn('700.00', body)
+        self.assertNotIn('9999', body)
+
+    def test_closed_month_served_from_cache(self):
+        self._auth(self.rider)
+        first = self.client.get('/api/reports/statement/?month=2024-03')
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.client.get('/api/reports/statement/?month=2024-03')
+        self.assertEqual(again.content, first.content)
+        self.assertFalse([q for q in ctx.captured_queries if 'UNION' in q['sql']])
+        resp = self.client.get('/api/reports/statement/?month=2024-03', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_write_invalidates_cached_statement(self):
+        self._auth(self.rider)
+        first = self.client.get('/api/reports/statement/?month=2024-03')
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 3, 3), amount=1000)
+        resp = self.client.get('/api/reports/statement/?month=2024-03')
+        self.assertNotEqual(resp['ETag'], first['ETag'])
+        self.assertIn('13000.00', resp.content.decode())
+
+    def test_admin_scoped_to_own_cooperative(self):
+        admin_user = User.objects.create_user(username='admin@test.com', email='admin@test.com', phone_number='0788222222', password='x', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        other = Cooperative.objects.create(name='Other Coop')
+        other.admins.add(admin_user)
+        self._auth(admin_user)
+        resp = self.client.get(f'/api/reports/statement/?month=2024-03&rider={self.rider.id}')
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.coop.admins.add(admin_user)
+        resp = self.client.get(f'/api/reports/statement/?month=2024-03&rider={self.rider.id}')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_same_day_in_two_cooperatives_gets_two_lines(self):
+        other = Cooperative.objects.create(name='Second Coop')
+        IncomeRecord.objects.create(rider=self.rider, cooperative=other, date=date(2024, 3, 1), amount=3333)
+        lines, totals = _summarize(statement_rows(self.rider.pk, date(2024, 3, 1), date(2024, 3, 31)))
+        self.assertEqual([(l['date'].day, l['cooperative'], l['income'], l['contribution']) for l in lines], [(1, 'Second Coop', Decimal('3333'), None), (1, 'Test Coop', Decimal('5000'), Decimal('500')), (2, 'Test Coop', Decimal('7000'), Decimal('700'))])
+        self.assertEqual(totals['income'], Decimal('15333'))
+
+    def test_rejects_bad_month(self):
+        self._auth(self.rider)
+        self.assertEqual(self.client.get('/api/reports/statement/?month=2024-13').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get('/api/reports/statement/?month=99999999999999999999-01').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get('/api/reports/statement/').status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReconciliationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.admin = User.objects.create_user(username='0788000000', phone_number='0788000000', password='admin123', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        self.coop.admins.add(self.admin)
+        self.riders = []
+        for n in range(3):
+            rider = User.objects.create_user(username=f'078811111{n}', phone_number=f'078811111{n}', password='rider123', role=User.Role.RIDER)
+            CooperativeMembership.objects.create(user=rider, cooperative=self.coop, is_verified=True)
+            self.riders.append(rider)
+        rider = self.riders[0]
+        IncomeRecord.objects.create(rider=rider, cooperative=self.coop, date=date(2024, 3, 1), amount=10000)
+        Contribution.objects.create(rider=rider, cooperative=self.coop, date=date(2024, 3, 1), amount=500, status=Contribution.Status.VERIFIED)
+        Contribution.objects.create(rider=rider, cooperative=self.coop, date=date(2024, 3, 2), amount=700)
+        Contribution.objects.create(rider=rider, cooperative=self.coop, date=date(2024, 4, 1), amount=300)
+
+    def _auth(self, user):
+        r = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(r.access_token))
+
+    def test_rider_forbidden(self):
+        self._auth(self.riders[0])
+        resp = self.client.get('/api/reports/reconciliation/')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_periods_merged_per_rider(self):
+        self._auth(self.admin)
+        resp = self.client.get('/api/reports/reconciliation/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        first = resp.data['results'][0]
+        self.assertEqual(first['rider_id'], self.riders[0].pk)
+        march, april = first['periods']
+        self.assertEqual(march['period'], '2024-03')
+        self.assertEqual(Decimal(march['income']), Decimal('10000'))
+        self.assertEqual(Decimal(march['contributions_submitted']), Decimal('1200'))
+        self.assertEqual(Decimal(march['contributions_verified']), Decimal('500'))
+        self.assertEqual(march['submitted_ratio'], '0.1200')
+        self.assertEqual(march['verified_ratio'], '0.0500')
+        self.assertEqual(april['period'], '2024-04')
+        self.assertIsNone(april['submitted_ratio'])
+        self.assertEqual(resp.data['results'][1]['periods'], [])
+
+    def test_cursor_pages_and_filters(self):
+        self._auth(self.admin)
+        resp = self.client.get('/api/reports/reconciliation/?page_size=2&to=2024-03')
+        self.assertEqual(len(resp.data['results']), 2)
+        self.assertEqual(len(resp.data['results'][0]['periods']), 1)
+        resp = self.client.get(resp.data['next'])
+        self.assertEqual([r['rider_id'] for r in resp.data['results']], [self.riders[2].pk])
+        resp = self.client.get('/api/reports/reconciliation/?from=bad')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.get('/api/reports/reconciliation/?to=99999999999999999999-01')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cached_until_data_changes(self):
+        self._auth(self.admin)
+        first = self.client.get('/api/reports/reconciliation/')
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.client.get('/api/reports/reconciliation/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse([q for q in ctx.captured_queries if 'income_incomerecord' in q['sql']])
+        IncomeRecord.objects.create(rider=self.riders[1], cooperative=self.coop, date=date(2024, 3, 5), amount=4000)
+        resp = self.client.get('/api/reports/reconciliation/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(Decimal(resp.data['results'][1]['periods'][0]['income']), Decimal('4000'))
+
+    def test_admin_link_change_invalidates_cache(self):
+        other = Cooperative.objects.create(name='Other Coop')
+        rider = User.objects.create_user(username='0788222222', phone_number='0788222222', password='rider123', role=User.Role.RIDER)
+        CooperativeMembership.objects.create(user=rider, cooperative=other, is_verified=True)
+        self._auth(self.admin)
+        first = self.client.get('/api/reports/reconciliation/')
+        self.assertNotIn(rider.pk, [r['rider_id'] for r in first.data['results']])
+        other.admins.add(self.admin)
+        resp = self.client.get('/api/reports/reconciliation/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn(rider.pk, [r['rider_id'] for r in resp.data['results']])
+
+
+class PeriodCloseTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.rider = User.objects.create_user(username='0788111111', phone_number='0788111111', password='rider123', role=User.Role.RIDER)
+        CooperativeMembership.objects.create(user=self.rider, cooperative=self.coop, is_verified=True)
+        self.admin_user = User.objects.create_user(username='admin@test.com', email='admin@test.com', phone_number='0788222222', password='admin123', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        self.coop.admins.add(self.admin_user)
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 1, 5), amount=1000)
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 2, 5), amount=2000)
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 3, 5), amount=4000)
+        Contribution.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 2, 5), amount=200, status=Contribution.Status.VERIFIED)
+
+    def _auth(self, user):
+        r = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(r.access_token))
+
+    def _income_stats(self, query='group_by=month&year=2024'):
+        self._auth(self.rider)
+        return self.client.get('/api/income/stats/?' + query).data['data']
+
+    def test_close_freezes_totals_and_stats_match(self):
+        before = self._income_stats()
+        before_year = self._income_stats('group_by=year')
+        self._auth(self.admin_user)
+        resp = self.client.post('/api/periods/close/', {'cooperative': self.coop.id, 'month': '2024-02'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data['closed_months'], ['2024-01', '2024-02'])
+        self.assertEqual(PeriodSnapshot.objects.count(), 2)
+        self.assertEqual(self._income_stats(), before)
+        self.assertEqual(self._income_stats('group_by=year'), before_year)
+        # Closed months come from snapshots, not live rows.
+        IncomeRecord.objects.filter(date=date(2024, 1, 5)).update(amount=1)
+        self.assertEqual(self._income_stats(), before)
+        self._auth(self.admin_user)
+        resp = self.client.get('/api/reports/contributions-stats/?group_by=month&year=2024')
+        self.assertEqual([row['period'] for row in resp.data['data']], ['2024-02'])
+        self.assertEqual(Decimal(resp.data['data'][0]['total']), Decimal('200'))
+
+    def test_closed_period_rejects_edits(self):
+        self.coop.closed_through = date(2024, 2, 29)
+        self.coop.save()
+        self._auth(self.rider)
+        resp = self.client.post('/api/income/', {'cooperative': self.coop.id, 'date': '2024-02-10', 'amount': '10'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('date', resp.data)
+        resp = self.client.post('/api/contributions/', {'cooperative': self.coop.id, 'date': '2024-02-10', 'amount': '10'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        contribution = Contribution.objects.get()
+        self._auth(self.admin_user)
+        resp = self.client.post(f'/api/contributions/{contribution.id}/unverify/')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        contribution.refresh_from_db()
+        self.assertEqual(contribution.status, Contribution.Status.VERIFIED)
+
+    def test_pending_contributions_block_close(self):
+        Contribution.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 1, 6), amount=50)
+        self._auth(self.admin_user)
+        resp = self.client.post('/api/periods/close/', {'cooperative': self.coop.id, 'month': '2024-02'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.coop.refresh_from_db()
+        self.assertIsNone(self.coop.closed_through)
+
+    def test_reopen_restores_live_totals(self):
+        self._auth(self.admin_user)
+        self.client.post('/api/periods/close/', {'cooperative': self.coop.id, 'month': '2024-02'}, format='json')
+        resp = self.client.post('/api/periods/reopen/', {'cooperative': self.coop.id, 'month': '2024-02'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['closed_months'], ['2024-01'])
+        self.assertEqual(resp.data['closed_through'], date(2024, 1, 31))
+        self.assertEqual(PeriodSnapshot.objects.count(), 1)
+
+    def test_other_cooperative_admin_cannot_close(self):
+        other = User.objects.create_user(username='other@test.com', email='other@test.com', phone_number='0788333333', password='x', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        self._auth(other)
+        resp = self.client.post('/api/periods/close/', {'cooperative': self.coop.id, 'month': '2024-02'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ReplicaRoutingTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # A second, empty SQLite database stands in for the replica. Nothing is
+        # replicated into it, so a read that lands there sees no rows.
+        default = connections.settings['default']
+        connections.settings[REPLICA_ALIAS] = connections.configure_settings({'default': default, REPLICA_ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}})[REPLICA_ALIAS]
+        with connections[REPLICA_ALIAS].schema_editor() as editor:
+            for model in django_apps.get_models():
+                editor.create_model(model)
+        cls.databases = {'default', REPLICA_ALIAS}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA_ALIAS].close()
+        del connections[REPLICA_ALIAS]
+        del connections.settings[REPLICA_ALIAS]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.rider = User.objects.create_user(username='0788111111', phone_number='0788111111', password='rider123', role=User.Role.RIDER)
+        CooperativeMembership.objects.create(user=self.rider, cooperative=self.coop, is_verified=True)
+
+    def _auth(self, user):
+        r = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(r.access_token))
+
+    def test_list_and_stats_read_from_replica(self):
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2026, 2, 1), amount=100)
+        self._auth(self.rider)
+        self.assertEqual(self.client.get('/api/income/').data, [])
+        self.assertEqual(self.client.get('/api/income/stats/?group_by=month').data['data'], [])
+
+    def test_reports_read_from_replica(self):
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2026, 2, 1), amount=100)
+        admin_user = User.objects.create_user(username='admin@test.com', email='admin@test.com', phone_number='0788222222', password='x', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        self.coop.admins.add(admin_user)
+        self._auth(admin_user)
+        resp = self.client.get('/api/reports/income-by-rider/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['results'], [])
+
+    def test_write_goes_to_primary_and_pins_reads(self):
+        self._auth(self.rider)
+        resp = self.client.post('/api/income/', {'cooperative': self.coop.id, 'date': '2026-02-01', 'amount': '100'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(IncomeRecord.objects.using('default').count(), 1)
+        self.assertEqual(IncomeRecord.objects.using(REPLICA_ALIAS).count(), 0)
+        self.assertEqual(len(self.client.get('/api/income/').data), 1)
+        cache.clear()
+        self.assertEqual(self.client.get('/api/income/').data, [])
+
+    def test_router_never_writes_to_replica(self):
+        self.assertEqual(router.db_for_read(IncomeRecord), 'default')
+        self.assertEqual(router.db_for_write(IncomeRecord, instance=Mock(_state=Mock(db=REPLICA_ALIAS))), 'default')
+
+
+class BatchingTests(TestCase):
+
+    def setUp(self):
+        self.coop = Cooperative.objects.create(name='Batch Coop')
+        self.users = [User.objects.create_user(username=f'07880300{i:02d}', phone_number=f'07880300{i:02d}', password=None) for i in range(7)]
+
+    def test_batches_are_keyset_ordered_and_complete(self):
+        seen = []
+        with CaptureQueriesContext(connection) as ctx:
+            total = run_in_batches(User.objects.all(), lambda batch: seen.append([u.pk for u in batch]), batch_size=3)
+        selects = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 4)
+        self.assertFalse(any('OFFSET' in sql for sql in selects))
+        self.assertEqual(total, 7)
+        self.assertEqual([len(b) for b in seen], [3, 3, 1])
+        self.assertEqual(sum(seen, []), sorted(u.pk for u in self.users))
+
+    def test_resumes_after_checkpoint_and_clears_it(self):
+        checkpoint = Checkpoint('test-job')
+        checkpoint.save(self.users[3].pk, 4)
+        seen = []
+        total = run_in_batches(User.objects.all(), lambda batch: seen.extend(u.pk for u in batch), batch_size=2, checkpoint=checkpoint)
+        self.assertEqual(seen, [u.pk for u in self.users[4:]])
+        self.assertEqual(total, 7)
+        self.assertFalse(BatchCheckpoint.objects.filter(name='test-job').exists())
+
+    def test_failed_batch_keeps_last_committed_checkpoint(self):
+        checkpoint = Checkpoint('failing-job')
+
+        def process(batch):
+            if self.users[4] in batch:
+                raise RuntimeError('boom')
+
+        with self.assertRaises(RuntimeError):
+            run_in_batches(User.objects.all(), process, batch_size=2, checkpoint=checkpoint)
+        self.assertEqual(checkpoint.load(), (self.users[3].pk, 4))
+
+    def test_phone_normalization_migration(self):
+        migration = importlib.import_module('apps.users.migrations.0004_normalize_phone_numbers_to_ten_digits')
+        a = User.objects.create_user(username='078 804 0001', phone_number='078-804-0001', password=None)
+        b = User.objects.create_user(username='250788040002', phone_number='+250 788 040 002', password=None)
+        clash = User.objects.create_user(username='x-clash', phone_number='(078) 803 0000', password=None)
+        migration.normalize_phone_numbers(django_apps, None)
+        a.refresh_from_db()
+        b.refresh_from_db()
+        clash.refresh_from_db()
+        self.assertEqual((a.username, a.phone_number), ('0788040001', '0788040001'))
+        self.assertEqual((b.username, b.phone_number), ('0788040002', '0788040002'))
+        self.assertEqual(clash.phone_number, '(078) 803 0000')
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Partitioning DDL needs PostgreSQL.')
+class ConvertToPartitionedTests(TestCase):
+
+    def setUp(self):
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.rider = User.objects.create_user(username='0788111111', phone_number='0788111111', password=None, role=User.Role.RIDER)
+        self.old = [IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2026, m, 5), amount=m) for m in (1, 2)]
+
+    def test_rows_keys_sequence_and_default_partition(self):
+        table = 'income_incomerecord'
+        convert_to_partitioned(connection, table, months_ahead=1, today=date(2026, 3, 15))
+        with connection.cursor() as cursor:
+            self.assertTrue(is_partitioned(cursor, table))
+            self.assertEqual(existing_partitions(cursor, table), {default_partition_name(table), *(f'{table}_p2026_{m:02d}' for m in (1, 2, 3, 4))})
+            cursor.execute("SELECT pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [table])
+            self.assertEqual(cursor.fetchone()[0], 'PRIMARY KEY (id, date)')
+        self.assertEqual(list(IncomeRecord.objects.order_by('pk').values_list('pk', 'amount')), [(r.pk, Decimal(r.amount)) for r in self.old])
+        late = IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2027, 6, 1), amount=9)
+        self.assertGreater(late.pk, self.old[-1].pk)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT id FROM {default_partition_name(table)}')
+            self.assertEqual(cursor.fetchall(), [(late.pk,)])
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2026, 1, 5), amount=1)
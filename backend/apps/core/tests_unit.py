@@ -1,6 +1,24 @@
-from unittest.mock import Mock
+import io
+import os
+import subprocess
+import sys
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest.mock import Mock, patch
+from django.core.management import call_command
+from django.db.models import QuerySet
 from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from apps.core.admin_tools import EstimatedCountPaginator
+from apps.core.management.commands.bench_boot import parse_importtime
+from apps.core.parsers import ORJSONParser
+from apps.core.partitioning import add_months, attach_partition_sql, partition_name
 from apps.core.permissions import IsCooperativeAdmin, IsRider
+from apps.core.renderers import ORJSONRenderer
+from apps.core.warmup import warm_up
+from config.gunicorn_conf import default_workers
 
 class PermissionUnitTests(SimpleTestCase):
 
@@ -13,3 +31,99 @@ class PermissionUnitTests(SimpleTestCase):
         req = Mock()
         req.user = Mock(is_authenticated=True, is_cooperative_admin=True, is_staff=False)
         self.assertFalse(IsCooperativeAdmin().has_permission(req, None))
+
+
+class ORJSONRendererUnitTests(SimpleTestCase):
+
+    def _payload(self):
+        return {
+            'results': [{'rider_id': 1, 'rider_email': None, 'total': Decimal('3000.50')}],
+            'amount': '10000.00',
+            'created_at': datetime(2026, 2, 26, 8, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'date': date(2026, 2, 26),
+            'label': gettext_lazy('Pending'),
+            'notes': 'Umumotari \u2028 ubwishingizi \u2029 é',
+        }
+
+    def test_output_matches_default_renderer(self):
+        payload = self._payload()
+        self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_falls_back_without_orjson(self):
+        payload = self._payload()
+        with patch('apps.core.renderers.orjson', None):
+            self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_indent_uses_stdlib_path(self):
+        payload = self._payload()
+        out = ORJSONRenderer().render(payload, 'application/json; indent=4')
+        self.assertEqual(out, JSONRenderer().render(payload, 'application/json; indent=4'))
+
+    def test_non_finite_numbers_rejected_like_default_renderer(self):
+        for value in (float('nan'), float('inf'), Decimal('NaN')):
+            payload = {'results': [{'total': value, 'note': None}]}
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(payload)
+            with self.assertRaises(ValueError):
+                ORJSONRenderer().render(payload)
+
+    def test_parser_round_trip_and_errors(self):
+        data = ORJSONParser().parse(io.BytesIO(b'{"amount": "5000", "date": "2026-02-26"}'))
+        self.assertEqual(data, {'amount': '5000', 'date': '2026-02-26'})
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"amount": NaN}'))
+
+
+class EstimatedCountPaginatorUnitTests(SimpleTestCase):
+
+    @patch('apps.core.admin_tools.estimated_row_count', return_value=5_000_000)
+    def test_unfiltered_large_table_uses_estimate(self, mock_estimate):
+        qs = Mock(spec=QuerySet, model=Mock(), db='default', query=Mock(where=None))
+        self.assertEqual(EstimatedCountPaginator(qs, 100).count, 5_000_000)
+        qs.count.assert_not_called()
+
+
+class PartitioningUnitTests(SimpleTestCase):
+
+    def test_add_months_crosses_years(self):
+        self.assertEqual(add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+        self.assertEqual(add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+
+    def test_attach_moves_rows_out_of_default(self):
+        sql = attach_partition_sql(lambda name: f'"{name}"', 'income_incomerecord', date(2026, 12, 1))
+        self.assertEqual(partition_name('income_incomerecord', date(2026, 12, 1)), 'income_incomerecord_p2026_12')
+        self.assertIn('FROM "income_incomerecord_default" WHERE "date" >= \'2026-12-01\' AND "date" < \'2027-01-01\'', sql[1])
+        self.assertTrue(sql[2].startswith('DELETE FROM "income_incomerecord_default"'))
+        self.assertEqual(sql[3], 'ALTER TABLE "income_incomerecord" ATTACH PARTITION "income_incomerecord_p2026_12" FOR VALUES FROM (\'2026-12-01\') TO (\'2027-01-01\')')
+
+    def test_command_is_noop_without_postgres(self):
+        out = io.StringIO()
+        call_command('create_partitions', stdout=out)
+        self.assertIn('nothing to do', out.getvalue())
+
+
+class WarmupUnitTests(SimpleTestCase):
+
+    def test_warm_up_covers_urls_serializers_and_templates(self):
+        timings = warm_up()
+        self.assertGreater(timings['urls'][0], 10)
+        self.assertGreaterEqual(timings['serializers'][0], 5)
+        self.assertEqual(timings['templates'][0], 1)
+
+    def test_default_workers_scales_with_cpus_and_is_capped(self):
+        self.assertEqual(default_workers(1, 12), 3)
+        self.assertEqual(default_workers(4, 12), 9)
+        self.assertEqual(default_workers(16, 12), 12)
+
+
+class StartupImportUnitTests(SimpleTestCase):
+
+    def test_parse_importtime(self):
+        text = 'import time: self [us] | cumulative | imported package\nimport time:       120 |        120 |   dotenv.parser\nimport time:       300 |        420 | dotenv\n'
+        self.assertEqual(parse_importtime(text), [(120, 120, 'dotenv.parser', 1), (420, 300, 'dotenv', 0)])
+
+    def test_setup_does_not_load_drf_renderers(self):
+        code = 'import sys, django; django.setup(); print("rest_framework.renderers" in sys.modules)'
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'config.settings'}
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True).stdout
+        self.assertEqual(out.strip(), 'False')
@@ -1,10 +1,11 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import ReportViewSet
+from .views import PeriodViewSet, ReportViewSet
 
 router = DefaultRouter()
 router.register(r"reports", ReportViewSet, basename="report")
+router.register(r"periods", PeriodViewSet, basename="period")
 
 urlpatterns = [
     path("api/", include(router.urls)),
@@ -1,12 +1,24 @@
+import hashlib
+
+from django.core.cache import cache
 from django.db.models import Case, Count, DecimalField, Sum, Value, When
-from django.db.models.functions import TruncMonth, TruncYear
+from django.http import HttpResponse
 
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from apps.contributions.models import Contribution
+from apps.cooperatives.models import Cooperative
 from apps.income.models import IncomeRecord
+from apps.users.models import User
+
+from .models import ClosedPeriod
+from .pagination import RiderCursorPagination
+from .periods import PeriodCloseError, close_period, period_totals, reopen_period, snapshot_queryset
+from .reconciliation import RECONCILIATION_CACHE_SECONDS, reconcile, reports_version
+from .replica import ReplicaReadMixin
+from .statements import get_statement, parse_month
 
 
 def _income_queryset(user):
@@ -43,8 +55,83 @@ def _contribution_queryset(user):
     return qs
 
 
-class ReportViewSet(viewsets.ViewSet):
+def _statement_rider(user, rider_id):
+    """Rider whose statement ``user`` may download, or ``None``."""
+    if rider_id in (None, "") or (user.is_rider and str(rider_id) == str(user.pk)):
+        return user if user.is_rider else None
+    riders = User.objects.filter(pk=rider_id, role=User.Role.RIDER)
+    if user.is_superuser:
+        pass
+    elif user.is_cooperative_admin and user.is_staff:
+        riders = riders.filter(
+            cooperative_membership__cooperative__admins=user,
+            cooperative_membership__is_verified=True,
+        )
+    else:
+        return None
+    return riders.first()
+
+
+def _reconciliation_riders(user):
+    riders = User.objects.filter(role=User.Role.RIDER)
+    if not user.is_superuser:
+        riders = riders.filter(
+            cooperative_membership__cooperative__admins=user,
+            cooperative_membership__is_verified=True,
+        )
+    return riders.only("id", "email", "phone_number")
+
+
+def _managed_cooperative(user, cooperative_id):
+    """Cooperative whose periods ``user`` may close or reopen, or ``None``."""
+    qs = Cooperative.objects.all()
+    if user.is_superuser:
+        pass
+    elif user.is_cooperative_admin and user.is_staff:
+        qs = qs.filter(admins=user)
+    else:
+        return None
+    try:
+        return qs.filter(pk=int(cooperative_id)).first()
+    except (TypeError, ValueError):
+        return None
+
+
+class ReportViewSet(ReplicaReadMixin, viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    # Not ``statement`` or ``reconciliation``: their caches could pin a lagging replica's view.
+    replica_actions = ("income_by_rider", "income_by_cooperative", "contributions_summary", "contributions_stats")
+
+    @action(detail=False, methods=["get"])
+    def statement(self, request):
+        """Printable HTML statement for one rider and month (``?month=YYYY-MM[&rider=<id>]``)."""
+        month = request.query_params.get("month")
+        if not month:
+            return Response({"detail": "month is required (YYYY-MM)."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rider_id = request.query_params.get("rider")
+            if rider_id not in (None, ""):
+                rider_id = int(rider_id)
+        except ValueError:
+            return Response({"detail": "rider must be an integer id."}, status=status.HTTP_400_BAD_REQUEST)
+        rider = _statement_rider(request.user, rider_id)
+        if rider is None:
+            return Response({"detail": "Statement not available."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            first, _ = parse_month(month)
+        except ValueError:
+            return Response({"detail": "month must be YYYY-MM."}, status=status.HTTP_400_BAD_REQUEST)
+        html, digest = get_statement(rider, first.strftime("%Y-%m"))
+        etag = f'"{digest}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(html, content_type="text/html; charset=utf-8")
+            filename = f"statement-{rider.pk}-{first:%Y-%m}.html"
+            response["Content-Disposition"] = f'inline; filename="{filename}"'
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
     @action(detail=False, methods=["get"], url_path="income-by-rider")
     def income_by_rider(self, request):
@@ -160,28 +247,118 @@ class ReportViewSet(viewsets.ViewSet):
         qs = _contribution_queryset(user)
         if verified_only:
             qs = qs.filter(status=Contribution.Status.VERIFIED)
-        if group_by == "year":
-            rows = (
-                qs.annotate(period=TruncYear("date"))
-                .values("period")
-                .annotate(total=Sum("amount"))
-                .order_by("period")
+        # Closed periods only ever hold verified contributions, so one snapshot serves both modes.
+        data = period_totals(qs, snapshot_queryset(user), "contribution_total", group_by, year)
+        return Response({"group_by": group_by, "data": data})
+
+    @action(detail=False, methods=["get"])
+    def reconciliation(self, request):
+        """Income vs. submitted and verified contributions per rider and period, a page of riders at a time.
+
+        ``?from=YYYY-MM&to=YYYY-MM&group_by=month|year&cooperative=<id>&cursor=...``
+        """
+        user = request.user
+        if not (user.is_authenticated and (user.is_superuser or (user.is_cooperative_admin and user.is_staff))):
+            return Response(
+                {"detail": "Only verified cooperative administrators can view this report."},
+                status=status.HTTP_403_FORBIDDEN,
             )
-            data = [
-                {"period": row["period"].strftime("%Y"), "total": str(row["total"] or 0)}
-                for row in rows
-            ]
+        params = request.query_params
+        group_by = "year" if params.get("group_by") == "year" else "month"
+        try:
+            first = parse_month(params["from"])[0] if params.get("from") else None
+            last = parse_month(params["to"])[1] if params.get("to") else None
+        except ValueError:
+            return Response({"detail": "from and to must be YYYY-MM."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            cooperative_id = int(params["cooperative"]) if params.get("cooperative") else None
+        except ValueError:
+            return Response({"detail": "cooperative must be an integer id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # The reports version moves on every income or contribution write, so
+        # the key (and the ETag derived from it) changes whenever the data does.
+        digest = hashlib.sha256(repr((reports_version(), user.pk, sorted(params.lists()))).encode()).hexdigest()
+        etag = f'"{digest[:32]}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
         else:
-            if year:
-                qs = qs.filter(date__year=year)
-            rows = (
-                qs.annotate(period=TruncMonth("date"))
-                .values("period")
-                .annotate(total=Sum("amount"))
-                .order_by("period")
-            )
-            data = [
-                {"period": row["period"].strftime("%Y-%m"), "total": str(row["total"] or 0)}
-                for row in rows
-            ]
-        return Response({"group_by": group_by, "data": data})
+            cache_key = f"reports:reconciliation:{digest}"
+            payload = cache.get(cache_key)
+            if payload is None:
+                riders, income_qs, contribution_qs = (
+                    _reconciliation_riders(user),
+                    _income_queryset(user),
+                    _contribution_queryset(user),
+                )
+                if first:
+                    income_qs, contribution_qs = income_qs.filter(date__gte=first), contribution_qs.filter(date__gte=first)
+                if last:
+                    income_qs, contribution_qs = income_qs.filter(date__lte=last), contribution_qs.filter(date__lte=last)
+                if cooperative_id is not None:
+                    riders = riders.filter(cooperative_membership__cooperative_id=cooperative_id)
+                    income_qs = income_qs.filter(cooperative_id=cooperative_id)
+                    contribution_qs = contribution_qs.filter(cooperative_id=cooperative_id)
+                paginator = RiderCursorPagination()
+                page = paginator.paginate_queryset(riders, request, view=self)
+                periods = reconcile(income_qs, contribution_qs, [rider.pk for rider in page], group_by)
+                results = [
+                    {
+                        "rider_id": rider.pk,
+                        "rider_email": rider.email,
+                        "rider_phone": rider.phone_number,
+                        "periods": periods.get(rider.pk, []),
+                    }
+                    for rider in page
+                ]
+                payload = {"group_by": group_by, **paginator.get_paginated_response(results).data}
+                cache.set(cache_key, payload, RECONCILIATION_CACHE_SECONDS)
+            response = Response(payload)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class PeriodViewSet(viewsets.ViewSet):
+    """Close and reopen monthly financial periods of a cooperative."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def _describe(self, cooperative):
+        months = ClosedPeriod.objects.filter(cooperative=cooperative).values_list("month", flat=True)
+        return {
+            "cooperative": cooperative.pk,
+            "closed_through": cooperative.closed_through,
+            "closed_months": [month.strftime("%Y-%m") for month in months],
+        }
+
+    def _change(self, request, operation, success_status):
+        cooperative = _managed_cooperative(request.user, request.data.get("cooperative"))
+        if cooperative is None:
+            return Response({"detail": "Cooperative not found."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            first, _ = parse_month(request.data.get("month"))
+        except ValueError:
+            return Response({"month": ["Use YYYY-MM."]}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            operation(cooperative, first)
+        except PeriodCloseError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self._describe(cooperative), status=success_status)
+
+    def list(self, request):
+        cooperative = _managed_cooperative(request.user, request.query_params.get("cooperative"))
+        if cooperative is None:
+            return Response({"detail": "Cooperative not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self._describe(cooperative))
+
+    @action(detail=False, methods=["post"])
+    def close(self, request):
+        return self._change(
+            request,
+            lambda cooperative, first: close_period(cooperative, first, user=request.user),
+            status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=["post"])
+    def reopen(self, request):
+        return self._change(request, reopen_period, status.HTTP_200_OK)
@@ -0,0 +1,93 @@
+"""Process warm-up run by the Gunicorn config (``config/gunicorn_conf.py``) before traffic.
+
+``warm_up()`` does the lazy work the first request would otherwise pay for:
+it compiles every URL pattern, builds the fields of every model serializer
+(which also fills the model ``_meta`` caches), primes the fast row
+formatters and loads templates. With ``preload_app`` it runs once in the
+master and workers inherit the result through fork, so it must not leave
+database connections open. ``connect_databases()`` runs in each worker.
+"""
+import logging
+import time
+
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils.module_loading import autodiscover_modules
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+WARM_TEMPLATES = ("core/statement.html",)
+
+
+def _compile_patterns(resolver):
+    count = 0
+    resolver.pattern.regex  # noqa: B018 - compiles and caches the pattern
+    for entry in resolver.url_patterns:
+        if isinstance(entry, URLResolver):
+            count += _compile_patterns(entry)
+        elif isinstance(entry, URLPattern):
+            entry.pattern.regex  # noqa: B018
+            count += 1
+    return count
+
+
+def _model_serializers():
+    found, stack = [], [serializers.ModelSerializer]
+    while stack:
+        for subclass in stack.pop().__subclasses__():
+            stack.append(subclass)
+            if getattr(getattr(subclass, "Meta", None), "model", None) is not None:
+                found.append(subclass)
+    return found
+
+
+def warm_urls():
+    resolver = get_resolver()
+    resolver._populate()
+    return _compile_patterns(resolver)
+
+
+def warm_serializers():
+    autodiscover_modules("serializers")
+    warmed = 0
+    for serializer_class in _model_serializers():
+        try:
+            serializer_class().fields
+        except Exception:  # warm-up is best effort; the request path reports real errors
+            logger.debug("Could not warm %s", serializer_class, exc_info=True)
+            continue
+        warmed += 1
+    from apps.contributions.serializers import _contribution_field_formatters
+    from apps.income.serializers import _income_record_field_formatters
+
+    _contribution_field_formatters()
+    _income_record_field_formatters()
+    return warmed
+
+
+def warm_templates():
+    for name in WARM_TEMPLATES:
+        get_template(name)
+    return len(WARM_TEMPLATES)
+
+
+def warm_up():
+    """Warm everything that can be shared across forked workers. Returns ``{step: (count, seconds)}``."""
+    timings = {}
+    for name, step in (("urls", warm_urls), ("serializers", warm_serializers), ("templates", warm_templates)):
+        started = time.perf_counter()
+        timings[name] = (step(), time.perf_counter() - started)
+    # Sockets must not be shared across fork.
+    connections.close_all()
+    return timings
+
+
+def connect_databases():
+    """Open this process's connection to every configured database (persistent if ``CONN_MAX_AGE``)."""
+    for alias in connections:
+        try:
+            connections[alias].ensure_connection()
+        except Exception:
+            logger.warning("Warm-up could not connect to database %r", alias, exc_info=True)
@@ -1,10 +1,18 @@
 from django.contrib import admin
+
+from apps.core.admin_tools import ClosedPeriodAdminMixin
+
 from .models import IncomeRecord
 
 
 @admin.register(IncomeRecord)
-class IncomeRecordAdmin(admin.ModelAdmin):
-    list_display = ("rider", "cooperative", "date", "amount")
-    list_filter = ("cooperative", "date")
+class IncomeRecordAdmin(ClosedPeriodAdminMixin, admin.ModelAdmin):
+    list_display = ("rider", "cooperative", "date", "amount", "source")
+    list_filter = ("cooperative", "source", "date")
     search_fields = ("rider__email", "cooperative__name")
     date_hierarchy = "date"
+
+    def save_model(self, request, obj, form, change):
+        # A hand edit takes the row over: rollup_rides only rewrites rows it owns.
+        obj.source = IncomeRecord.Source.MANUAL
+        super().save_model(request, obj, form, change)
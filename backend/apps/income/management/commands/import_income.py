@@ -0,0 +1,242 @@
+import csv
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.cooperatives.models import CooperativeMembership
+from apps.core.reconciliation import bump_reports_version
+from apps.core.statements import bump_rider_generation
+from apps.income.models import IncomeRecord
+from apps.users.phone_utils import normalize_phone_number
+
+_COLUMN_ALIASES = {
+    "phone": "phone",
+    "phone_number": "phone",
+    "date": "date",
+    "amount": "amount",
+    "notes": "notes",
+}
+_MAX_AMOUNT = Decimal("9999999999.99")  # IncomeRecord.amount: max_digits=12, decimal_places=2
+_CENT = Decimal("0.01")
+
+
+def _csv_rows(path):
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield header
+        yield from reader
+
+
+def _xlsx_rows(path):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise CommandError("Reading .xlsx files needs openpyxl (pip install openpyxl); or export the sheet to CSV.") from exc
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield ["" if v is None else v for v in row]
+    finally:
+        workbook.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream historical income from a CSV (or .xlsx) file with columns phone, date, amount[, notes]. "
+        "Riders are matched by normalized phone to their cooperative membership; rows that duplicate "
+        "an existing (rider, cooperative, date) are skipped. Progress is checkpointed per batch so an "
+        "interrupted import can be resumed with --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=str)
+        parser.add_argument("--cooperative", type=int, help="Only accept riders who are members of this cooperative id.")
+        parser.add_argument("--date-format", default="%Y-%m-%d", help="strptime format of the date column.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--checkpoint", type=str, help="Checkpoint file (default: <path>.checkpoint).")
+        parser.add_argument("--resume", action="store_true", help="Skip rows already committed per the checkpoint.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate and count without writing.")
+        parser.add_argument("--max-errors-shown", type=int, default=20)
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.is_file():
+            raise CommandError(f"No such file: {path}")
+        checkpoint_path = Path(options["checkpoint"] or f"{path}.checkpoint")
+        self.date_format = options["date_format"]
+        self.max_errors_shown = options["max_errors_shown"]
+        batch_size = max(1, options["batch_size"])
+
+        stats = {"rows": 0, "inserted": 0, "duplicates": 0, "errors": 0}
+        start_line = 1
+        if options["resume"] and checkpoint_path.is_file():
+            saved = json.loads(checkpoint_path.read_text())
+            if saved.get("path") != str(path.resolve()):
+                raise CommandError(f"Checkpoint {checkpoint_path} belongs to another file: {saved.get('path')}")
+            start_line = saved["next_line"]
+            stats.update(saved["stats"])
+            self.stdout.write(f"Resuming at data line {start_line}.")
+
+        riders = self._rider_lookup(options["cooperative"])
+        self.stdout.write(f"Loaded {len(riders)} rider phone numbers.")
+
+        rows = _xlsx_rows(path) if path.suffix.lower() == ".xlsx" else _csv_rows(path)
+        header = next(rows, None)
+        if header is None:
+            raise CommandError("File is empty.")
+        columns = self._columns(header)
+
+        numbered = enumerate(rows, start=1)
+        if start_line > 1:
+            numbered = islice(numbered, start_line - 1, None)
+        seen = set()
+        while True:
+            chunk = list(islice(numbered, batch_size))
+            if not chunk:
+                break
+            records = []
+            for line, raw in chunk:
+                stats["rows"] += 1
+                record = self._build(line, raw, columns, riders, stats)
+                if record is None:
+                    continue
+                key = (record.rider_id, record.cooperative_id, record.date)
+                if key in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(key)
+                records.append(record)
+            records = self._drop_existing(records, stats)
+            next_line = chunk[-1][0] + 1
+            if options["dry_run"]:
+                stats["inserted"] += len(records)
+            else:
+                with transaction.atomic():
+                    # ignore_conflicts silently skips rows stored since _drop_existing;
+                    # count what actually landed.
+                    before = len(self._stored_keys(records))
+                    IncomeRecord.objects.bulk_create(records, batch_size=batch_size, ignore_conflicts=True)
+                    inserted = len(self._stored_keys(records)) - before
+                stats["inserted"] += inserted
+                stats["duplicates"] += len(records) - inserted
+                # bulk_create skips signals; drop cached statements and reports by hand.
+                for rider_id in {r.rider_id for r in records}:
+                    bump_rider_generation(rider_id)
+                bump_reports_version()
+            if not options["dry_run"]:
+                # Written after commit: a crash in between only replays a batch the dedupe step then skips.
+                self._save_checkpoint(checkpoint_path, path, next_line, stats)
+            self.stdout.write(
+                f"line {next_line - 1}: rows={stats['rows']} inserted={stats['inserted']} "
+                f"duplicates={stats['duplicates']} errors={stats['errors']}"
+            )
+
+        verb = "Would insert" if options["dry_run"] else "Inserted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {stats['inserted']} of {stats['rows']} rows "
+                f"({stats['duplicates']} duplicates, {stats['errors']} errors)."
+            )
+        )
+        if not options["dry_run"] and checkpoint_path.is_file():
+            checkpoint_path.unlink()
+
+    def _rider_lookup(self, cooperative_id):
+        """Map normalized phone -> (user_id, cooperative_id, closed_through), one query for the whole import."""
+        qs = CooperativeMembership.objects.all()
+        if cooperative_id is not None:
+            qs = qs.filter(cooperative_id=cooperative_id)
+        lookup = {}
+        rows = qs.values_list("user_id", "cooperative_id", "cooperative__closed_through", "user__phone_number")
+        for user_id, coop_id, closed_through, phone in rows.iterator():
+            normalized = normalize_phone_number(phone)
+            if normalized:
+                lookup[normalized] = (user_id, coop_id, closed_through)
+        return lookup
+
+    def _columns(self, header):
+        columns = {}
+        for index, name in enumerate(header):
+            key = _COLUMN_ALIASES.get(str(name).strip().lower())
+            if key and key not in columns:
+                columns[key] = index
+        missing = {"phone", "date", "amount"} - columns.keys()
+        if missing:
+            raise CommandError(f"Missing column(s): {', '.join(sorted(missing))}. Header was: {header}")
+        return columns
+
+    def _build(self, line, raw, columns, riders, stats):
+        def cell(name):
+            index = columns.get(name)
+            return raw[index] if index is not None and index < len(raw) else ""
+
+        phone = normalize_phone_number(str(cell("phone")))
+        rider = riders.get(phone) if phone else None
+        if rider is None:
+            return self._error(line, stats, f"unknown rider phone {cell('phone')!r}")
+        day = cell("date")
+        if isinstance(day, datetime):
+            day = day.date()
+        elif not isinstance(day, date):
+            try:
+                day = datetime.strptime(str(day).strip(), self.date_format).date()
+            except ValueError:
+                return self._error(line, stats, f"bad date {day!r}")
+        if rider[2] and day <= rider[2]:
+            return self._error(line, stats, f"{day} is in a closed period")
+        try:
+            amount = Decimal(str(cell("amount")).strip().replace(",", ""))
+            if not amount.is_finite():
+                return self._error(line, stats, f"bad amount {cell('amount')!r}")
+            amount = amount.quantize(_CENT)
+        except InvalidOperation:
+            return self._error(line, stats, f"bad amount {cell('amount')!r}")
+        if amount < 0 or amount > _MAX_AMOUNT:
+            return self._error(line, stats, f"amount out of range {amount}")
+        return IncomeRecord(
+            rider_id=rider[0],
+            cooperative_id=rider[1],
+            date=day,
+            amount=amount,
+            notes=str(cell("notes") or "").strip(),
+        )
+
+    def _error(self, line, stats, message):
+        stats["errors"] += 1
+        if stats["errors"] <= self.max_errors_shown:
+            self.stderr.write(f"line {line}: {message}")
+        return None
+
+    def _stored_keys(self, records):
+        """The (rider, cooperative, date) keys of ``records`` already in the table, in one query."""
+        if not records:
+            return set()
+        keys = {(r.rider_id, r.cooperative_id, r.date) for r in records}
+        days = [r.date for r in records]
+        stored = IncomeRecord.objects.filter(
+            rider_id__in={r.rider_id for r in records},
+            date__gte=min(days),
+            date__lte=max(days),
+        ).values_list("rider_id", "cooperative_id", "date")
+        return keys.intersection(stored)
+
+    def _drop_existing(self, records, stats):
+        """One query per batch for keys already stored; the unique constraint is the final guard."""
+        existing = self._stored_keys(records)
+        kept = [r for r in records if (r.rider_id, r.cooperative_id, r.date) not in existing]
+        stats["duplicates"] += len(records) - len(kept)
+        return kept
+
+    def _save_checkpoint(self, checkpoint_path, path, next_line, stats):
+        tmp = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+        tmp.write_text(json.dumps({"path": str(path.resolve()), "next_line": next_line, "stats": stats}))
+        os.replace(tmp, checkpoint_path)
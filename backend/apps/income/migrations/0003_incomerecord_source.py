@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("income", "0002_add_notes_to_incomerecord"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="incomerecord",
+            name="source",
+            field=models.CharField(
+                choices=[("manual", "Entered by hand"), ("rides", "Rolled up from rides")],
+                default="manual",
+                editable=False,
+                max_length=10,
+            ),
+        ),
+    ]
@@ -1,10 +1,17 @@
 from decimal import Decimal
 
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from apps.cooperatives.models import CLOSED_PERIOD_MESSAGE
+
 
 class IncomeRecord(models.Model):
+    class Source(models.TextChoices):
+        MANUAL = "manual", "Entered by hand"
+        RIDES = "rides", "Rolled up from rides"
+
     rider = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -22,6 +29,8 @@ class IncomeRecord(models.Model):
         default=Decimal("0"),
     )
     notes = models.TextField(blank=True, default="")
+    # ``rollup_rides`` only ever overwrites rows it created itself.
+    source = models.CharField(max_length=10, choices=Source.choices, default=Source.MANUAL, editable=False)
 
     class Meta:
         db_table = "income_incomerecord"
@@ -33,5 +42,10 @@ class IncomeRecord(models.Model):
             )
         ]
 
+    def clean(self):
+        super().clean()
+        if self.cooperative_id and self.cooperative.is_period_closed(self.date):
+            raise ValidationError({"date": CLOSED_PERIOD_MESSAGE})
+
     def __str__(self):
         return f"{self.rider} @ {self.cooperative} on {self.date}: {self.amount}"
@@ -1,7 +1,9 @@
+from functools import cache
+
 from django.db import IntegrityError
 from rest_framework import serializers
 
-from apps.cooperatives.models import CooperativeMembership
+from apps.cooperatives.models import CLOSED_PERIOD_MESSAGE, CooperativeMembership
 
 from .models import IncomeRecord
 
@@ -22,6 +24,40 @@ class IncomeRecordSerializer(serializers.ModelSerializer):
         return {"id": obj.cooperative_id, "name": obj.cooperative.name}
 
 
+INCOME_RECORD_ROW_FIELDS = (
+    "id",
+    "rider_id",
+    "rider__email",
+    "cooperative_id",
+    "cooperative__name",
+    "date",
+    "amount",
+    "notes",
+)
+
+
+@cache
+def _income_record_field_formatters():
+    fields = IncomeRecordSerializer().fields
+    return fields["date"].to_representation, fields["amount"].to_representation
+
+
+def income_record_rows(queryset):
+    """Read-only fast path: same JSON as ``IncomeRecordSerializer(many=True)``, built from ``.values()`` rows."""
+    date_repr, amount_repr = _income_record_field_formatters()
+    return [
+        {
+            "id": row["id"],
+            "rider": {"id": row["rider_id"], "email": row["rider__email"]},
+            "cooperative": {"id": row["cooperative_id"], "name": row["cooperative__name"]},
+            "date": date_repr(row["date"]),
+            "amount": amount_repr(row["amount"]),
+            "notes": row["notes"],
+        }
+        for row in queryset.values(*INCOME_RECORD_ROW_FIELDS)
+    ]
+
+
 class IncomeRecordCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = IncomeRecord
@@ -50,6 +86,8 @@ class IncomeRecordCreateSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         request = self.context.get("request")
         cooperative = attrs["cooperative"]
+        if cooperative.is_period_closed(attrs["date"]):
+            raise serializers.ValidationError({"date": CLOSED_PERIOD_MESSAGE})
         date = attrs["date"]
         if IncomeRecord.objects.filter(
             rider=request.user,
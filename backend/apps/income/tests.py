@@ -1,10 +1,20 @@
+import io
+import json
+import os
+import tempfile
 from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+from django.core.management import call_command
 from django.test import TestCase
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 from apps.cooperatives.models import Cooperative, CooperativeMembership
+from apps.income.management.commands.import_income import Command as ImportIncomeCommand
 from apps.income.models import IncomeRecord
+from apps.income.serializers import IncomeRecordSerializer, income_record_rows
 from apps.users.models import User
 
 class IncomeTests(TestCase):
@@ -92,3 +102,83 @@ class IncomeTests(TestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertEqual(len(resp.data), 1)
         self.assertEqual(str(resp.data[0]['amount']), '4000.00')
+
+    def test_values_fast_path_matches_serializer_bytes(self):
+        other = User.objects.create_user(username='0788555555', email='fast@test.com', phone_number='0788555555', password='x', role=User.Role.RIDER)
+        CooperativeMembership.objects.create(user=other, cooperative=self.coop, is_verified=True)
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2026, 2, 26), amount='1234.5', notes='Morning')
+        IncomeRecord.objects.create(rider=other, cooperative=self.coop, date=date(2026, 2, 27), amount=7)
+        qs = IncomeRecord.objects.select_related('rider', 'cooperative')
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(income_record_rows(qs)), renderer.render(IncomeRecordSerializer(qs, many=True).data))
+
+
+class ImportIncomeCommandTests(TestCase):
+
+    def setUp(self):
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.rider = User.objects.create_user(username='0788111111', phone_number='0788111111', password=None, role=User.Role.RIDER)
+        CooperativeMembership.objects.create(user=self.rider, cooperative=self.coop, is_verified=True)
+        self.other = User.objects.create_user(username='0788222222', phone_number='0788222222', password=None, role=User.Role.RIDER)
+        CooperativeMembership.objects.create(user=self.other, cooperative=self.coop, is_verified=True)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, text):
+        path = os.path.join(self.tmpdir.name, 'income.csv')
+        with open(path, 'w', newline='') as fh:
+            fh.write(text)
+        return path
+
+    def test_imports_and_dedupes(self):
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 1, 1), amount=1)
+        path = self._write(
+            'Phone,Date,Amount,Notes\n'
+            '078 811 1111,2024-01-01,500,already stored\n'
+            '0788111111,2024-01-02,"1,250.5",paper ledger\n'
+            '0788111111,2024-01-02,999,same day twice\n'
+            '0788222222,2024-01-02,300,\n'
+            '0788999999,2024-01-03,100,unknown rider\n'
+            '0788222222,not-a-date,100,\n'
+        )
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_income', path, '--batch-size', '2', stdout=out, stderr=err)
+        self.assertEqual(IncomeRecord.objects.count(), 3)
+        row = IncomeRecord.objects.get(rider=self.rider, date=date(2024, 1, 2))
+        self.assertEqual(row.amount, Decimal('1250.50'))
+        self.assertEqual(row.notes, 'paper ledger')
+        self.assertIn('Inserted 2 of 6 rows (2 duplicates, 2 errors)', out.getvalue())
+        self.assertIn('unknown rider phone', err.getvalue())
+        self.assertFalse(os.path.exists(path + '.checkpoint'))
+
+    def test_non_finite_amount_is_a_bad_row(self):
+        path = self._write('phone,date,amount\n0788111111,2024-03-01,NaN\n0788111111,2024-03-02,Infinity\n0788111111,2024-03-03,10\n')
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_income', path, stdout=out, stderr=err)
+        self.assertEqual(list(IncomeRecord.objects.values_list('date', flat=True)), [date(2024, 3, 3)])
+        self.assertIn('Inserted 1 of 3 rows (0 duplicates, 2 errors)', out.getvalue())
+        self.assertIn("bad amount 'NaN'", err.getvalue())
+
+    def test_rows_skipped_by_the_constraint_are_not_counted(self):
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 4, 1), amount=5)
+        path = self._write('phone,date,amount\n0788111111,2024-04-01,10\n0788111111,2024-04-02,20\n')
+        out = io.StringIO()
+        # As if the first row had been stored by someone else after the duplicate check.
+        with patch.object(ImportIncomeCommand, '_drop_existing', lambda self, records, stats: records):
+            call_command('import_income', path, stdout=out, stderr=io.StringIO())
+        self.assertIn('Inserted 1 of 2 rows (1 duplicates, 0 errors)', out.getvalue())
+        self.assertEqual(IncomeRecord.objects.get(date=date(2024, 4, 1)).amount, 5)
+
+    def test_resume_skips_committed_lines(self):
+        path = self._write('phone,date,amount\n0788111111,2024-02-01,10\n0788111111,2024-02-02,20\n0788222222,2024-02-03,30\n')
+        with open(path + '.checkpoint', 'w') as fh:
+            json.dump({'path': os.path.realpath(path), 'next_line': 3, 'stats': {'rows': 2, 'inserted': 2, 'duplicates': 0, 'errors': 0}}, fh)
+        call_command('import_income', path, '--resume', stdout=io.StringIO())
+        self.assertEqual(list(IncomeRecord.objects.values_list('date', flat=True)), [date(2024, 2, 3)])
+
+    def test_dry_run_writes_nothing(self):
+        path = self._write('phone,date,amount\n0788111111,2024-02-01,10\n')
+        out = io.StringIO()
+        call_command('import_income', path, '--dry-run', stdout=out)
+        self.assertFalse(IncomeRecord.objects.exists())
+        self.assertIn('Would insert 1 of 1 rows', out.getvalue())
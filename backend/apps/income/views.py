@@ -1,18 +1,20 @@
 from django.db.models import Sum
-from django.db.models.functions import TruncMonth, TruncYear
 from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.mixins import CreateModelMixin
 from rest_framework.response import Response
 
+from apps.core.periods import period_totals, snapshot_queryset
 from apps.core.permissions import IsRider, cooperative_admin_has_operational_data
+from apps.core.replica import ReplicaReadMixin
 
 from .models import IncomeRecord
-from .serializers import IncomeRecordCreateSerializer, IncomeRecordSerializer
+from .serializers import IncomeRecordCreateSerializer, IncomeRecordSerializer, income_record_rows
 
 
-class IncomeRecordViewSet(CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+class IncomeRecordViewSet(ReplicaReadMixin, CreateModelMixin, viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    replica_actions = ("list", "summary", "stats", "recent")
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -44,6 +46,11 @@ class IncomeRecordViewSet(CreateModelMixin, viewsets.ReadOnlyModelViewSet):
 
         return qs.select_related("rider", "cooperative")
 
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        return Response(income_record_rows(self.filter_queryset(self.get_queryset())))
+
     @action(detail=False, methods=["get"], url_path="summary")
     def summary(self, request):
         qs = self.get_queryset()
@@ -60,39 +67,14 @@ class IncomeRecordViewSet(CreateModelMixin, viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=["get"], url_path="stats")
     def stats(self, request):
-        qs = self.get_queryset()
         group_by = request.query_params.get("group_by", "month")
         year = request.query_params.get("year")
-
-        if group_by == "year":
-            rows = (
-                qs.annotate(period=TruncYear("date"))
-                .values("period")
-                .annotate(total=Sum("amount"))
-                .order_by("period")
-            )
-            data = [
-                {"period": row["period"].strftime("%Y"), "total": str(row["total"] or 0)}
-                for row in rows
-            ]
-        else:
-            if year:
-                qs = qs.filter(date__year=year)
-            rows = (
-                qs.annotate(period=TruncMonth("date"))
-                .values("period")
-                .annotate(total=Sum("amount"))
-                .order_by("period")
-            )
-            data = [
-                {"period": row["period"].strftime("%Y-%m"), "total": str(row["total"] or 0)}
-                for row in rows
-            ]
-
+        data = period_totals(
+            self.get_queryset(), snapshot_queryset(request.user), "income_total", group_by, year
+        )
         return Response({"group_by": group_by, "data": data})
 
     @action(detail=False, methods=["get"], url_path="recent")
     def recent(self, request):
-        from .serializers import IncomeRecordSerializer
         qs = self.get_queryset().order_by("-date", "-id")[:10]
-        return Response(IncomeRecordSerializer(qs, many=True).data)
+        return Response(income_record_rows(qs))
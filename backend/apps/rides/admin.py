@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import Ride
+
+
+@admin.register(Ride)
+class RideAdmin(admin.ModelAdmin):
+    list_display = ("rider", "cooperative", "started_at", "distance_m", "fare")
+    list_filter = ("cooperative",)
+    search_fields = ("rider__email", "rider__phone_number", "cooperative__name")
+    date_hierarchy = "started_at"
+    raw_id_fields = ("rider",)
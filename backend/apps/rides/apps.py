@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class RidesConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.rides"
+    label = "rides"
+    verbose_name = "Rides"
+
+    def ready(self):
+        from . import signals  # noqa: F401
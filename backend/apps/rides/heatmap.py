@@ -0,0 +1,119 @@
+"""Where riders earn: geohash cells over ride start (pickup) and end (drop-off) points.
+
+Rides carry the geohash of their start and end point at ``CELL_PRECISION``
+(7 characters, about 150 m). ``RideCellDay`` holds per cooperative, day and
+cell the pickups, drop-offs and fares (attributed to the pickup cell);
+``refresh_cell_days`` rebuilds it for the days ``rollup_rides`` takes from
+its queue (see ``apps.rides.rollup``). Deleted and moved rides queue their
+old day too, so rebuilt days drop their cells and late-committed rides are
+counted. A heatmap then reads at most one row per cell and day and coarsens
+by geohash prefix, so a month never touches raw rides.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Substr, TruncDate
+from django.utils import timezone
+
+from .models import Ride, RideCellDay
+
+CELL_PRECISION = 7
+MIN_HEATMAP_PRECISION = 4
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_BASE32_INDEX = {char: i for i, char in enumerate(_BASE32)}
+
+
+def geohash(lat, lon, precision=CELL_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coordinate = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def geohash_center(cell):
+    """``(lat, lon)`` at the centre of a geohash cell."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = _BASE32_INDEX[char]
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def _day_bounds(first, last):
+    start = timezone.make_aware(datetime.combine(first, time.min))
+    return start, timezone.make_aware(datetime.combine(last + timedelta(days=1), time.min))
+
+
+def refresh_cell_days(keys):
+    """Rebuild ``RideCellDay`` for the given ``(cooperative_id, day)`` pairs from their rides."""
+    days_by_coop = defaultdict(set)
+    for cooperative_id, day in keys:
+        days_by_coop[cooperative_id].add(day)
+    for cooperative_id, days in days_by_coop.items():
+        start, end = _day_bounds(min(days), max(days))
+        rides = (
+            Ride.objects.filter(cooperative_id=cooperative_id, started_at__gte=start, started_at__lt=end)
+            .annotate(day=TruncDate("started_at"))
+            .filter(day__in=days)
+            .order_by()
+        )
+        cells = defaultdict(lambda: {"pickups": 0, "dropoffs": 0, "fare": 0})
+        for row in rides.exclude(start_cell="").values("day", "start_cell").annotate(n=Count("pk"), fare=Sum("fare")):
+            cell = cells[(row["day"], row["start_cell"])]
+            cell["pickups"], cell["fare"] = row["n"], row["fare"]
+        for row in rides.exclude(end_cell="").values("day", "end_cell").annotate(n=Count("pk")):
+            cells[(row["day"], row["end_cell"])]["dropoffs"] = row["n"]
+        with transaction.atomic():
+            RideCellDay.objects.filter(cooperative_id=cooperative_id, day__in=days).delete()
+            RideCellDay.objects.bulk_create(
+                RideCellDay(cooperative_id=cooperative_id, day=day, cell=cell, **totals)
+                for (day, cell), totals in cells.items()
+            )
+
+
+def heatmap(cooperative, first, last, precision=CELL_PRECISION):
+    """Per-cell pickups, drop-offs and fares of ``cooperative`` between two dates, busiest cells first."""
+    rows = (
+        RideCellDay.objects.filter(cooperative=cooperative, day__gte=first, day__lte=last)
+        .annotate(bucket=Substr("cell", 1, precision))
+        .values("bucket")
+        .annotate(pickups=Sum("pickups"), dropoffs=Sum("dropoffs"), fare=Sum("fare"))
+        .order_by("-pickups", "-dropoffs", "bucket")
+    )
+    out = []
+    for row in rows:
+        lat, lon = geohash_center(row["bucket"])
+        out.append(
+            {
+                "cell": row["bucket"],
+                "lat": round(lat, 5),
+                "lon": round(lon, 5),
+                "pickups": row["pickups"],
+                "dropoffs": row["dropoffs"],
+                "fare": str(row["fare"]),
+            }
+        )
+    return out
@@ -0,0 +1,132 @@
+"""Batch trip upload (``POST /api/rides/batch/``).
+
+The offline app sends hundreds of trips at once. Instead of running a DRF
+serializer per trip, ``parse_rides`` checks the whole batch in one pass over
+plain dicts and returns every problem keyed by position, so the app can fix
+the batch and resend it. Valid batches are written with a single
+``bulk_create``; trips whose ``client_id`` is already stored are skipped.
+Their days are queued for ``rollup_rides`` in the same transaction.
+"""
+import uuid
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.cooperatives.models import CLOSED_PERIOD_MESSAGE
+
+from .heatmap import geohash
+from .models import Ride
+from .rollup import queue_days
+
+RIDE_BATCH_MAX = 500
+MAX_RIDE_DURATION = timedelta(hours=24)
+_MAX_FARE = Decimal("99999999.99")  # Ride.fare: max_digits=10, decimal_places=2
+_MAX_DISTANCE_M = 2_000_000
+_CENT = Decimal("0.01")
+
+
+def _datetime(value):
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        raise ValueError("Use an ISO 8601 date and time.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _is_coordinate(point):
+    return (
+        isinstance(point, list)
+        and len(point) == 2
+        and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in point)
+        and -90 <= point[0] <= 90
+        and -180 <= point[1] <= 180
+    )
+
+
+def _parse_one(item):
+    if not isinstance(item, dict):
+        return None, {"non_field_errors": "Expected an object."}
+    errors, row = {}, {}
+    for field in ("started_at", "ended_at"):
+        try:
+            row[field] = _datetime(item.get(field))
+        except ValueError as exc:
+            errors[field] = str(exc)
+    distance = item.get("distance_m")
+    if isinstance(distance, bool) or not isinstance(distance, (int, float)) or not 0 <= distance <= _MAX_DISTANCE_M:
+        errors["distance_m"] = f"A number of metres between 0 and {_MAX_DISTANCE_M}."
+    else:
+        row["distance_m"] = int(round(distance))
+    try:
+        fare = Decimal(str(item.get("fare"))).quantize(_CENT)
+        if not 0 <= fare <= _MAX_FARE:
+            raise InvalidOperation
+        row["fare"] = fare
+    except (InvalidOperation, ValueError):
+        errors["fare"] = "A non-negative amount."
+    client_id = item.get("client_id")
+    if client_id in (None, ""):
+        row["client_id"] = None
+    else:
+        try:
+            row["client_id"] = uuid.UUID(str(client_id))
+        except ValueError:
+            errors["client_id"] = "Must be a UUID."
+    for field in ("start", "end"):
+        point = item.get(field)
+        if point is None:
+            row[f"{field}_cell"] = ""
+        elif _is_coordinate(point):
+            row[f"{field}_cell"] = geohash(*point)
+        else:
+            errors[field] = "Expected [lat, lon]."
+    if "started_at" in row and "ended_at" in row:
+        duration = row["ended_at"] - row["started_at"]
+        if duration < timedelta(0):
+            errors["ended_at"] = "Must not be before started_at."
+        elif duration > MAX_RIDE_DURATION:
+            errors["ended_at"] = "A ride cannot last more than 24 hours."
+    return (None, errors) if errors else (row, None)
+
+
+def parse_rides(items, cooperative):
+    """Validate a batch of trip dicts. Returns ``(rows, errors)``; ``errors`` is ``[{"index": i, ...}]``."""
+    rows, errors, seen = [], [], set()
+    for index, item in enumerate(items):
+        row, row_errors = _parse_one(item)
+        if row is not None:
+            row_errors = {}
+            if cooperative.is_period_closed(timezone.localdate(row["started_at"])):
+                row_errors["started_at"] = CLOSED_PERIOD_MESSAGE
+            if row["client_id"] is not None:
+                if row["client_id"] in seen:
+                    row_errors["client_id"] = "Repeated within this batch."
+                seen.add(row["client_id"])
+        if row_errors:
+            errors.append({"index": index, **row_errors})
+        else:
+            rows.append(row)
+    return rows, errors
+
+
+def store_rides(rider, cooperative, rows):
+    """Insert parsed rows for ``rider``. Returns ``(created, duplicates)``."""
+    client_ids = [row["client_id"] for row in rows if row["client_id"] is not None]
+    existing = set(
+        Ride.objects.filter(rider=rider, client_id__in=client_ids).values_list("client_id", flat=True)
+    ) if client_ids else set()
+    rides = [
+        Ride(rider=rider, cooperative=cooperative, **row)
+        for row in rows
+        if row["client_id"] is None or row["client_id"] not in existing
+    ]
+    with transaction.atomic():
+        # ignore_conflicts covers a concurrent retry of the same upload.
+        Ride.objects.bulk_create(rides, ignore_conflicts=True)
+        # bulk_create sends no post_save; queue the days in this transaction.
+        queue_days(rides)
+    return len(rides), len(rows) - len(rides)
@@ -0,0 +1,59 @@
+import json
+import math
+import random
+
+from django.core.management.base import BaseCommand
+
+from apps.core.benchmark import best_of
+from apps.rides.tracks import decode_track, encode_track, simplify
+
+
+def synthetic_track(n_points, seed=0):
+    """A city ride: one fix per second, ~8 m/s, slowly turning, with ~3 m GPS noise."""
+    rng = random.Random(seed)
+    lat, lon, heading, t = -1.9441, 30.0619, 0.0, 1_700_000_000
+    points = []
+    for _ in range(n_points):
+        heading += rng.gauss(0, 0.08)
+        lat += 8 * math.cos(heading) / 111_320 + rng.gauss(0, 3 / 111_320)
+        lon += 8 * math.sin(heading) / 111_320 + rng.gauss(0, 3 / 111_320)
+        t += 1
+        points.append((lat, lon, t))
+    return points
+
+
+class Command(BaseCommand):
+    help = (
+        "Storage bytes per point and encode/decode/simplify throughput of the ride track blob format "
+        "on synthetic GPS traces (no database access)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--points", type=int, default=3600, help="Points per track (one per second).")
+        parser.add_argument("--tracks", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        n, count = options["points"], options["tracks"]
+        tracks = [synthetic_track(n, seed) for seed in range(count)]
+        total = n * count
+
+        encode_s, blobs = best_of(options["repeat"], lambda: [encode_track(points) for points in tracks])
+        decode_s, decoded = best_of(options["repeat"], lambda: [decode_track(blob) for blob in blobs])
+        blob_bytes = sum(len(blob) for blob in blobs)
+        json_bytes = sum(len(json.dumps(points)) for points in tracks)
+        self.stdout.write(f"{count} tracks x {n} points")
+        self.stdout.write(
+            f"bytes/point: blob={blob_bytes / total:5.2f}  float64 rows={24:5.2f}  JSON={json_bytes / total:5.2f}"
+        )
+        self.stdout.write(
+            f"encode: {total / encode_s / 1e6:5.2f} M points/s   decode: {total / decode_s / 1e6:5.2f} M points/s"
+        )
+        for tolerance in (2, 5, 10, 25):
+            seconds, kept = best_of(
+                options["repeat"], lambda: [simplify(lats, lons, tolerance) for lats, lons, _ in decoded]
+            )
+            kept_points = sum(len(indices) for indices in kept)
+            self.stdout.write(
+                f"simplify {tolerance:>3} m: kept {kept_points / total:6.1%}  {total / seconds / 1e6:5.2f} M points/s"
+            )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.rides.rollup import queue_all_days, rollup_rides
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold days with new or changed rides into daily income records (one per rider, cooperative "
+        "and day). Safe to run from cron, also concurrently; only queued days are recomputed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Queued days per transaction.")
+        parser.add_argument("--rebuild", action="store_true", help="Queue and recompute every day with rides.")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        if options["rebuild"]:
+            self.stdout.write(f"Queued {queue_all_days(batch_size)} rider-days.")
+        queued, days = rollup_rides(
+            batch_size=batch_size,
+            progress=lambda queued, days: self.stdout.write(f"queued={queued} days={days}"),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {queued} queued days into {days} rider-days."))
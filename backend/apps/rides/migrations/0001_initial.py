@@ -0,0 +1,41 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("cooperatives", "0003_cooperative_closed_through"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Ride",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("started_at", models.DateTimeField()),
+                ("ended_at", models.DateTimeField()),
+                ("distance_m", models.PositiveIntegerField(help_text="Distance in metres.")),
+                ("fare", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("client_id", models.UUIDField(blank=True, editable=False, null=True)),
+                ("cooperative", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="rides", to="cooperatives.cooperative")),
+                ("rider", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="rides", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "db_table": "rides_ride",
+                "ordering": ["-started_at"],
+                "indexes": [
+                    models.Index(fields=["rider", "started_at"], name="ride_rider_started_idx"),
+                    models.Index(fields=["cooperative", "started_at"], name="ride_coop_started_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=("rider", "client_id"), name="unique_ride_per_rider_client_id"),
+                    models.CheckConstraint(condition=models.Q(("ended_at__gte", models.F("started_at"))), name="ride_ends_after_start"),
+                ],
+            },
+        ),
+    ]
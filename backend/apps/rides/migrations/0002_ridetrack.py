@@ -0,0 +1,23 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rides", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RideTrack",
+            fields=[
+                ("ride", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="track", serialize=False, to="rides.ride")),
+                ("points", models.PositiveIntegerField()),
+                ("data", models.BinaryField()),
+            ],
+            options={
+                "db_table": "rides_track",
+            },
+        ),
+    ]
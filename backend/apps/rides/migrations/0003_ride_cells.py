@@ -0,0 +1,41 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cooperatives", "0003_cooperative_closed_through"),
+        ("rides", "0002_ridetrack"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ride",
+            name="start_cell",
+            field=models.CharField(blank=True, default="", max_length=7),
+        ),
+        migrations.AddField(
+            model_name="ride",
+            name="end_cell",
+            field=models.CharField(blank=True, default="", max_length=7),
+        ),
+        migrations.CreateModel(
+            name="RideCellDay",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("cell", models.CharField(max_length=7)),
+                ("pickups", models.PositiveIntegerField(default=0)),
+                ("dropoffs", models.PositiveIntegerField(default=0)),
+                ("fare", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ("cooperative", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="cooperatives.cooperative")),
+            ],
+            options={
+                "db_table": "rides_cell_day",
+                "constraints": [
+                    models.UniqueConstraint(fields=("cooperative", "day", "cell"), name="unique_cell_per_coop_day"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import TruncDate
+
+ROLLUP_CHECKPOINT = "rides.income_rollup"
+
+
+def from_watermark_to_queue(apps, schema_editor):
+    """Mark income the rollup wrote as its own, and queue the days the old id watermark had not reached."""
+    Ride = apps.get_model("rides", "Ride")
+    PendingRideDay = apps.get_model("rides", "PendingRideDay")
+    IncomeRecord = apps.get_model("income", "IncomeRecord")
+    BatchCheckpoint = apps.get_model("core", "BatchCheckpoint")
+
+    # Rows equal to their day's ride total came from the rollup; anything else was typed in.
+    day_total = (
+        Ride.objects.filter(
+            rider_id=OuterRef("rider_id"), cooperative_id=OuterRef("cooperative_id"), started_at__date=OuterRef("date")
+        )
+        .order_by()
+        .values("rider_id")
+        .annotate(total=Sum("fare"))
+        .values("total")
+    )
+    IncomeRecord.objects.annotate(ride_total=Subquery(day_total)).filter(ride_total=F("amount")).update(source="rides")
+
+    checkpoint = BatchCheckpoint.objects.filter(name=ROLLUP_CHECKPOINT).first()
+    rides = Ride.objects.all()
+    if checkpoint is not None and checkpoint.last_pk is not None:
+        rides = rides.filter(pk__gt=checkpoint.last_pk)
+    keys = rides.annotate(day=TruncDate("started_at")).values_list("rider_id", "cooperative_id", "day").distinct().order_by()
+    PendingRideDay.objects.bulk_create(
+        [PendingRideDay(rider_id=rider_id, cooperative_id=cooperative_id, day=day) for rider_id, cooperative_id, day in keys],
+        batch_size=2000,
+    )
+    BatchCheckpoint.objects.filter(name=ROLLUP_CHECKPOINT).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cooperatives", "0004_cooperative_member_counts"),
+        ("core", "0001_initial"),
+        ("income", "0003_incomerecord_source"),
+        ("rides", "0003_ride_cells"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingRideDay",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("cooperative", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="cooperatives.cooperative")),
+                ("rider", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "db_table": "rides_pending_day",
+            },
+        ),
+        migrations.RunPython(from_watermark_to_queue, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.db import models
+
+
+class Ride(models.Model):
+    """One trip logged by a rider, usually uploaded in batches by the offline app."""
+
+    rider = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="rides",
+    )
+    cooperative = models.ForeignKey(
+        "cooperatives.Cooperative",
+        on_delete=models.CASCADE,
+        related_name="rides",
+    )
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField()
+    distance_m = models.PositiveIntegerField(help_text="Distance in metres.")
+    fare = models.DecimalField(max_digits=10, decimal_places=2)
+    # Generated on the device; lets a retried upload skip trips already stored.
+    client_id = models.UUIDField(null=True, blank=True, editable=False)
+    # Geohashes of the start and end points (see ``apps.rides.heatmap``); blank when unknown.
+    start_cell = models.CharField(max_length=7, blank=True, default="")
+    end_cell = models.CharField(max_length=7, blank=True, default="")
+
+    class Meta:
+        db_table = "rides_ride"
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["rider", "started_at"], name="ride_rider_started_idx"),
+            models.Index(fields=["cooperative", "started_at"], name="ride_coop_started_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["rider", "client_id"], name="unique_ride_per_rider_client_id"),
+            models.CheckConstraint(condition=models.Q(ended_at__gte=models.F("started_at")), name="ride_ends_after_start"),
+        ]
+
+    def __str__(self):
+        return f"{self.rider} @ {self.cooperative} at {self.started_at}: {self.fare}"
+
+
+class RideTrack(models.Model):
+    """GPS trace of a ride as one compressed blob (format in ``apps.rides.tracks``)."""
+
+    ride = models.OneToOneField(Ride, on_delete=models.CASCADE, primary_key=True, related_name="track")
+    points = models.PositiveIntegerField()
+    data = models.BinaryField()
+
+    class Meta:
+        db_table = "rides_track"
+
+    def __str__(self):
+        return f"Track of ride {self.ride_id} ({self.points} points)"
+
+
+class RideCellDay(models.Model):
+    """Pickups, drop-offs and fares of one cooperative in one geohash cell on one day."""
+
+    cooperative = models.ForeignKey(
+        "cooperatives.Cooperative",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    day = models.DateField()
+    cell = models.CharField(max_length=7)
+    pickups = models.PositiveIntegerField(default=0)
+    dropoffs = models.PositiveIntegerField(default=0)
+    fare = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "rides_cell_day"
+        constraints = [
+            models.UniqueConstraint(fields=["cooperative", "day", "cell"], name="unique_cell_per_coop_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.cooperative_id} {self.day} {self.cell}: {self.pickups}/{self.dropoffs}"
+
+
+class PendingRideDay(models.Model):
+    """A (rider, cooperative, day) whose rides changed since ``rollup_rides`` last folded it.
+
+    Rows are appended in the same transaction as the rides they describe and
+    deleted by the rollup once it has recomputed the day, so a ride is picked
+    up whenever its insert commits. The queue is append-only (no unique key):
+    a day queued again while a rollup is running keeps its own row.
+    """
+
+    rider = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    cooperative = models.ForeignKey(
+        "cooperatives.Cooperative",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    day = models.DateField()
+
+    class Meta:
+        db_table = "rides_pending_day"
+
+    def __str__(self):
+        return f"{self.rider_id} @ {self.cooperative_id} on {self.day}"
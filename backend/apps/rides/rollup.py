@@ -0,0 +1,142 @@
+"""Fold logged rides into daily ``IncomeRecord`` rows.
+
+Whatever writes rides also appends the (rider, cooperative, day) keys it
+touched to ``PendingRideDay``, in the same transaction (``queue_days``). A
+run takes queued rows in id order, recomputes those days from *all* of their
+rides with one grouped aggregate and deletes exactly the rows it read, in one
+transaction per batch. A ride is therefore folded whenever its insert
+commits, however its id compares with rides already rolled up, and
+recomputing whole days keeps replays and concurrent runs correct.
+
+The same pass rebuilds the heatmap's per-day cell aggregates for those days
+(``apps.rides.heatmap``). Income rows carry their ``source``: the rollup
+creates, updates and deletes ``rides`` rows only, so a day with a
+hand-entered record keeps it. Deleting a ride, or moving it to another day or
+cooperative, queues its old key too (``signals.py``); a queued day with no
+rides left loses its ``rides`` record. Income in closed periods is never written; ride ingestion refuses
+those days anyway.
+"""
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.cooperatives.models import Cooperative
+from apps.core.reconciliation import bump_reports_version
+from apps.core.statements import bump_rider_generation
+from apps.income.models import IncomeRecord
+
+from .heatmap import refresh_cell_days
+from .models import PendingRideDay, Ride
+
+
+def queue_days(rides):
+    """Queue the (rider, cooperative, day) of each ride for the next rollup. Call inside the writing transaction."""
+    keys = {(ride.rider_id, ride.cooperative_id, timezone.localdate(ride.started_at)) for ride in rides}
+    PendingRideDay.objects.bulk_create(
+        [PendingRideDay(rider_id=rider_id, cooperative_id=cooperative_id, day=day) for rider_id, cooperative_id, day in keys]
+    )
+
+
+def queue_all_days(batch_size=5000):
+    """Queue every day that has rides (``rollup_rides --rebuild``). Returns the number of days queued."""
+    keys = (
+        Ride.objects.annotate(day=TruncDate("started_at"))
+        .values_list("rider_id", "cooperative_id", "day")
+        .distinct()
+        .order_by()
+    )
+    queued = PendingRideDay.objects.bulk_create(
+        [PendingRideDay(rider_id=rider_id, cooperative_id=cooperative_id, day=day) for rider_id, cooperative_id, day in keys],
+        batch_size=batch_size,
+    )
+    return len(queued)
+
+
+def _daily_totals(keys):
+    """``{(rider_id, cooperative_id, day): total fare}`` over all rides on the given keys."""
+    riders = {rider_id for rider_id, _, _ in keys}
+    days = [day for _, _, day in keys]
+    rows = (
+        Ride.objects.filter(rider_id__in=riders)
+        .annotate(day=TruncDate("started_at"))
+        .filter(day__gte=min(days), day__lte=max(days))
+        .values("rider_id", "cooperative_id", "day")
+        .annotate(total=Sum("fare"))
+        .order_by()
+    )
+    totals = {(r["rider_id"], r["cooperative_id"], r["day"]): r["total"] for r in rows}
+    return {key: totals[key] for key in keys if key in totals}
+
+
+def _fold(keys):
+    """Recompute income for ``keys``; returns the keys whose income was written or removed."""
+    refresh_cell_days({(cooperative_id, day) for _, cooperative_id, day in keys})
+    closed_through = dict(
+        Cooperative.objects.filter(pk__in={coop for _, coop, _ in keys}).values_list("pk", "closed_through")
+    )
+    keys = {key for key in keys if not (closed_through.get(key[1]) and key[2] <= closed_through[key[1]])}
+    if not keys:
+        return set()
+    totals = _daily_totals(keys)
+    existing = {
+        (record.rider_id, record.cooperative_id, record.date): record
+        for record in IncomeRecord.objects.filter(
+            rider_id__in={rider_id for rider_id, _, _ in keys},
+            date__gte=min(day for _, _, day in keys),
+            date__lte=max(day for _, _, day in keys),
+        ).only("pk", "rider_id", "cooperative_id", "date", "amount", "source")
+    }
+    # Days whose last ride was deleted or moved away.
+    emptied = [
+        record
+        for key, record in existing.items()
+        if key in keys and key not in totals and record.source == IncomeRecord.Source.RIDES
+    ]
+    created, updated = [], []
+    for key, total in totals.items():
+        record = existing.get(key)
+        if record is None:
+            rider_id, cooperative_id, day = key
+            created.append(
+                IncomeRecord(
+                    rider_id=rider_id, cooperative_id=cooperative_id, date=day, amount=total, source=IncomeRecord.Source.RIDES
+                )
+            )
+        elif record.source == IncomeRecord.Source.RIDES and record.amount != total:
+            record.amount = total
+            updated.append(record)
+    # A hand-entered record that appears meanwhile wins over the ride total.
+    IncomeRecord.objects.bulk_create(created, ignore_conflicts=True)
+    IncomeRecord.objects.bulk_update(updated, ["amount"])
+    if emptied:
+        IncomeRecord.objects.filter(pk__in=[record.pk for record in emptied]).delete()
+    return {(r.rider_id, r.cooperative_id, r.date) for r in created + updated + emptied}
+
+
+def rollup_rides(batch_size=5000, progress=None):
+    """Fold queued days into income, up to ``batch_size`` queue rows per transaction.
+
+    ``progress(queued, days)`` is called after each commit. Returns ``(queued, days)`` for this run:
+    queue rows consumed and rider-days whose income was written.
+    """
+    queued = days = 0
+    while True:
+        with transaction.atomic():
+            pending = list(
+                PendingRideDay.objects.order_by("pk").values_list("pk", "rider_id", "cooperative_id", "day")[:batch_size]
+            )
+            if not pending:
+                return queued, days
+            keys = _fold({(rider_id, cooperative_id, day) for _, rider_id, cooperative_id, day in pending})
+            # Only the rows read above: days queued meanwhile stay for the next batch.
+            PendingRideDay.objects.filter(pk__in=[pk for pk, _, _, _ in pending]).delete()
+        queued += len(pending)
+        days += len(keys)
+        # bulk_create/bulk_update skip signals; drop cached statements and reports by hand.
+        for rider_id in {rider_id for rider_id, _, _ in keys}:
+            bump_rider_generation(rider_id)
+        if keys:
+            bump_reports_version()
+        if progress is not None:
+            progress(queued, days)
@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+from .models import Ride
+
+
+class RideSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Ride
+        fields = ["id", "rider", "cooperative", "started_at", "ended_at", "distance_m", "fare", "client_id"]
+        read_only_fields = fields
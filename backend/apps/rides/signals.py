@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Ride
+from .rollup import queue_days
+
+
+@receiver(pre_save, sender=Ride)
+def remember_previous_day(sender, instance, **kwargs):
+    # A ride moved to another day or cooperative must also be taken out of the old one.
+    instance._previous_ride = None
+    if instance.pk:
+        instance._previous_ride = (
+            Ride.objects.filter(pk=instance.pk).only("rider_id", "cooperative_id", "started_at").first()
+        )
+
+
+@receiver(post_save, sender=Ride)
+@receiver(post_delete, sender=Ride)
+def ride_changed(sender, instance, **kwargs):
+    # Same transaction as the write, so the rollup cannot miss a late commit.
+    queue_days([ride for ride in (instance, getattr(instance, "_previous_ride", None)) if ride is not None])
@@ -0,0 +1,314 @@
+import importlib
+import io
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.cooperatives.models import Cooperative, CooperativeMembership
+from apps.core.models import BatchCheckpoint
+from apps.income.models import IncomeRecord
+from apps.rides.management.commands.bench_tracks import synthetic_track
+from apps.rides.heatmap import geohash
+from apps.rides.models import PendingRideDay, Ride, RideCellDay
+from apps.rides.rollup import queue_days, rollup_rides
+from apps.users.models import User
+
+
+def _trip(day, hour, **extra):
+    return {'started_at': f'2024-03-{day:02d}T{hour:02d}:00:00Z', 'ended_at': f'2024-03-{day:02d}T{hour:02d}:20:00Z', 'distance_m': 4200, 'fare': '1500', **extra}
+
+
+class RideBatchTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.rider = User.objects.create_user(username='0788111111', phone_number='0788111111', password='rider123', role=User.Role.RIDER)
+        CooperativeMembership.objects.create(user=self.rider, cooperative=self.coop, is_verified=True)
+        refresh = RefreshToken.for_user(self.rider)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(refresh.access_token))
+
+    def test_batch_inserts_in_bulk(self):
+        trips = [_trip(1 + n % 28, n % 24, client_id=str(uuid.uuid4())) for n in range(300)]
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post('/api/rides/batch/', {'rides': trips}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data, {'created': 300, 'duplicates': 0})
+        self.assertEqual(Ride.objects.filter(rider=self.rider, cooperative=self.coop).count(), 300)
+        self.assertLess(len(ctx.captured_queries), 15)
+
+    def test_retry_skips_known_client_ids(self):
+        trips = [_trip(1, 8, client_id=str(uuid.uuid4())), _trip(1, 9, client_id=str(uuid.uuid4()))]
+        self.client.post('/api/rides/batch/', trips, format='json')
+        resp = self.client.post('/api/rides/batch/', trips + [_trip(2, 8)], format='json')
+        self.assertEqual(resp.data, {'created': 1, 'duplicates': 2})
+        self.assertEqual(Ride.objects.count(), 3)
+
+    def test_invalid_rows_reject_whole_batch(self):
+        bad = _trip(1, 9, fare='abc')
+        bad['ended_at'] = '2024-03-01T08:00:00Z'
+        resp = self.client.post('/api/rides/batch/', [_trip(1, 8), bad, 'x'], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([e['index'] for e in resp.data['errors']], [1, 2])
+        self.assertIn('fare', resp.data['errors'][0])
+        self.assertIn('ended_at', resp.data['errors'][0])
+        self.assertFalse(Ride.objects.exists())
+
+    def test_closed_period_rejected(self):
+        Cooperative.objects.filter(pk=self.coop.pk).update(closed_through=date(2024, 3, 31))
+        resp = self.client.post('/api/rides/batch/', [_trip(1, 8)], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_by_month(self):
+        self.client.post('/api/rides/batch/', [_trip(1, 8)], format='json')
+        resp = self.client.get('/api/rides/?month=2024-03')
+        self.assertEqual(len(resp.data), 1)
+        self.assertEqual(resp.data[0]['distance_m'], 4200)
+        self.assertEqual(self.client.get('/api/rides/?month=2024-04').data, [])
+
+    def test_admin_cannot_upload(self):
+        admin = User.objects.create_user(username='0788000000', phone_number='0788000000', password='admin123', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        refresh = RefreshToken.for_user(admin)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(refresh.access_token))
+        resp = self.client.post('/api/rides/batch/', [_trip(1, 8)], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class RideRollupTests(TestCase):
+
+    def setUp(self):
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.rider = User.objects.create_user(username='0788111111', phone_number='0788111111', password='rider123', role=User.Role.RIDER)
+        CooperativeMembership.objects.create(user=self.rider, cooperative=self.coop, is_verified=True)
+
+    def _ride(self, day, hour, fare):
+        started = datetime(2024, 3, day, hour, tzinfo=dt_timezone.utc)
+        return Ride.objects.create(rider=self.rider, cooperative=self.coop, started_at=started, ended_at=started + timedelta(minutes=20), distance_m=3000, fare=Decimal(fare))
+
+    def _income(self):
+        return dict(IncomeRecord.objects.filter(rider=self.rider).values_list('date', 'amount'))
+
+    def test_rides_folded_into_daily_income(self):
+        self._ride(1, 8, '1000')
+        self._ride(1, 9, '1500')
+        self._ride(2, 8, '700')
+        self.assertEqual(rollup_rides(), (3, 2))
+        self.assertEqual(self._income(), {date(2024, 3, 1): Decimal('2500'), date(2024, 3, 2): Decimal('700')})
+
+    def test_incremental_run_recomputes_only_new_days(self):
+        self._ride(1, 8, '1000')
+        self._ride(2, 8, '700')
+        rollup_rides()
+        IncomeRecord.objects.filter(date=date(2024, 3, 2)).update(amount=1)
+        self._ride(1, 10, '500')
+        self.assertEqual(rollup_rides(), (1, 1))
+        self.assertEqual(self._income(), {date(2024, 3, 1): Decimal('1500'), date(2024, 3, 2): Decimal('1')})
+        self.assertEqual(rollup_rides(), (0, 0))
+
+    def test_manual_record_wins_over_ride_total(self):
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 3, 1), amount=9, notes='typed')
+        self._ride(1, 8, '1000')
+        self._ride(2, 8, '700')
+        rollup_rides(batch_size=1)
+        self.assertEqual(self._income(), {date(2024, 3, 1): Decimal('9'), date(2024, 3, 2): Decimal('700')})
+        self.assertEqual(IncomeRecord.objects.get(date=date(2024, 3, 2)).source, IncomeRecord.Source.RIDES)
+        self._ride(2, 9, '300')
+        rollup_rides()
+        self.assertEqual(self._income(), {date(2024, 3, 1): Decimal('9'), date(2024, 3, 2): Decimal('1000')})
+
+    def test_late_commit_with_lower_id_is_folded(self):
+        early = self._ride(1, 8, '1000')
+        later = self._ride(2, 8, '700')
+        # The ride with the lower id committed after the higher one had been rolled up.
+        PendingRideDay.objects.filter(day=date(2024, 3, 1)).delete()
+        rollup_rides()
+        self.assertEqual(self._income(), {date(2024, 3, 2): Decimal('700')})
+        self.assertLess(early.pk, later.pk)
+        queue_days([early])
+        self.assertEqual(rollup_rides(), (1, 1))
+        self.assertEqual(self._income(), {date(2024, 3, 1): Decimal('1000'), date(2024, 3, 2): Decimal('700')})
+
+    def test_deleted_ride_leaves_the_day(self):
+        self._ride(1, 8, '100')
+        second = self._ride(1, 9, '50')
+        rollup_rides()
+        second.delete()
+        self.assertEqual(rollup_rides(), (1, 1))
+        self.assertEqual(self._income(), {date(2024, 3, 1): Decimal('100')})
+        Ride.objects.all().delete()
+        rollup_rides()
+        self.assertEqual(self._income(), {})
+
+    def test_moved_ride_leaves_its_old_day(self):
+        first = self._ride(1, 8, '100')
+        self._ride(1, 9, '50')
+        rollup_rides()
+        first.started_at += timedelta(days=1)
+        first.ended_at += timedelta(days=1)
+        first.save()
+        rollup_rides()
+        self.assertEqual(self._income(), {date(2024, 3, 1): Decimal('50'), date(2024, 3, 2): Decimal('100')})
+        IncomeRecord.objects.filter(date=date(2024, 3, 2)).update(source=IncomeRecord.Source.MANUAL)
+        first.delete()
+        rollup_rides()
+        self.assertEqual(self._income(), {date(2024, 3, 1): Decimal('50'), date(2024, 3, 2): Decimal('100')})
+
+    def test_batch_upload_queues_days_with_rides(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.rider).access_token))
+        client.post('/api/rides/batch/', [_trip(1, 8), _trip(1, 9), _trip(2, 8)], format='json')
+        self.assertEqual(sorted(PendingRideDay.objects.values_list('day', flat=True)), [date(2024, 3, 1), date(2024, 3, 2)])
+        self.assertEqual(rollup_rides(), (2, 2))
+        self.assertFalse(PendingRideDay.objects.exists())
+
+    def test_closed_days_untouched_and_command_rebuilds(self):
+        self._ride(1, 8, '1000')
+        Cooperative.objects.filter(pk=self.coop.pk).update(closed_through=date(2024, 3, 31))
+        rollup_rides()
+        self.assertEqual(self._income(), {})
+        Cooperative.objects.filter(pk=self.coop.pk).update(closed_through=None)
+        out = io.StringIO()
+        call_command('rollup_rides', '--rebuild', stdout=out)
+        self.assertIn('Rolled up 1 queued days into 1 rider-days.', out.getvalue())
+        self.assertEqual(self._income(), {date(2024, 3, 1): Decimal('1000')})
+
+    def test_migration_queues_rides_past_the_old_watermark(self):
+        seen = self._ride(1, 8, '1000')
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 3, 1), amount=1000)
+        IncomeRecord.objects.create(rider=self.rider, cooperative=self.coop, date=date(2024, 3, 3), amount=5)
+        self._ride(2, 8, '700')
+        PendingRideDay.objects.all().delete()
+        BatchCheckpoint.objects.create(name='rides.income_rollup', last_pk=seen.pk)
+        migration = importlib.import_module('apps.rides.migrations.0004_pendingrideday')
+        migration.from_watermark_to_queue(django_apps, None)
+        self.assertEqual(list(PendingRideDay.objects.values_list('day', flat=True)), [date(2024, 3, 2)])
+        self.assertEqual(dict(IncomeRecord.objects.values_list('date', 'source')), {date(2024, 3, 1): 'rides', date(2024, 3, 3): 'manual'})
+        self.assertFalse(BatchCheckpoint.objects.exists())
+
+
+class RideTrackTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.rider = User.objects.create_user(username='0788111111', phone_number='0788111111', password='rider123', role=User.Role.RIDER)
+        CooperativeMembership.objects.create(user=self.rider, cooperative=self.coop, is_verified=True)
+        started = datetime(2024, 3, 1, 8, tzinfo=dt_timezone.utc)
+        self.ride = Ride.objects.create(rider=self.rider, cooperative=self.coop, started_at=started, ended_at=started + timedelta(minutes=20), distance_m=3000, fare=Decimal('1000'))
+        refresh = RefreshToken.for_user(self.rider)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(refresh.access_token))
+
+    def test_upload_and_simplify(self):
+        points = [[lat, lon, t] for lat, lon, t in synthetic_track(600)]
+        resp = self.client.put(f'/api/rides/{self.ride.pk}/track/', {'points': points}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertLess(resp.data['bytes'], 600 * 4)
+        full = self.client.get(f'/api/rides/{self.ride.pk}/track/')
+        self.assertEqual(len(full.data['track']), 600)
+        simple = self.client.get(f'/api/rides/{self.ride.pk}/track/?tolerance=10')
+        self.assertLess(len(simple.data['track']), 200)
+        self.assertEqual(simple.data['track'][0], full.data['track'][0])
+        self.assertEqual(simple.data['track'][-1], full.data['track'][-1])
+
+    def test_bad_points_and_missing_track(self):
+        self.assertEqual(self.client.get(f'/api/rides/{self.ride.pk}/track/').status_code, status.HTTP_404_NOT_FOUND)
+        resp = self.client.put(f'/api/rides/{self.ride.pk}/track/', {'points': [[0, 0]]}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        for points in ([[1, 1, 1e20]], [[1, 1, 0], [1, 1, 1e20]]):
+            resp = self.client.put(f'/api/rides/{self.ride.pk}/track/', {'points': points}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_rider_cannot_see_track(self):
+        other = User.objects.create_user(username='0788222222', phone_number='0788222222', password='rider123', role=User.Role.RIDER)
+        refresh = RefreshToken.for_user(other)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(refresh.access_token))
+        resp = self.client.put(f'/api/rides/{self.ride.pk}/track/', {'points': [[0, 0, 0]]}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RideHeatmapTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        self.rider = User.objects.create_user(username='0788111111', phone_number='0788111111', password='rider123', role=User.Role.RIDER)
+        CooperativeMembership.objects.create(user=self.rider, cooperative=self.coop, is_verified=True)
+        self.admin = User.objects.create_user(username='0788000000', phone_number='0788000000', password='admin123', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        self.coop.admins.add(self.admin)
+
+    def _auth(self, user):
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(refresh.access_token))
+
+    def test_cells_from_daily_aggregates(self):
+        self._auth(self.rider)
+        town, market = [-1.9441, 30.0619], [-1.9536, 30.0606]
+        trips = [_trip(1, 8, start=town, end=market), _trip(1, 9, start=town, end=market), _trip(2, 8, start=market, end=town), _trip(3, 8)]
+        self.client.post('/api/rides/batch/', trips, format='json')
+        rollup_rides()
+        self.assertEqual(RideCellDay.objects.filter(cooperative=self.coop).count(), 4)
+        self._auth(self.admin)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(f'/api/rides/heatmap/?cooperative={self.coop.pk}&from=2024-03-01&to=2024-03-31')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in ctx.captured_queries if 'rides_ride' in q['sql']])
+        busiest = resp.data['cells'][0]
+        self.assertEqual(busiest['cell'], geohash(*town))
+        self.assertEqual((busiest['pickups'], busiest['dropoffs']), (2, 1))
+        self.assertEqual(Decimal(busiest['fare']), Decimal('3000'))
+        self.assertAlmostEqual(busiest['lat'], town[0], places=2)
+        coarse = self.client.get(f'/api/rides/heatmap/?cooperative={self.coop.pk}&from=2024-03-01&to=2024-03-31&precision=4')
+        self.assertEqual(len(coarse.data['cells']), 1)
+        self.assertEqual(coarse.data['cells'][0]['pickups'], 3)
+
+    def test_track_upload_fills_cells(self):
+        self._auth(self.rider)
+        self.client.post('/api/rides/batch/', [_trip(1, 8)], format='json')
+        rollup_rides()
+        ride = Ride.objects.get()
+        self.client.put(f'/api/rides/{ride.pk}/track/', {'points': [[-1.9441, 30.0619, 0], [-1.9536, 30.0606, 600]]}, format='json')
+        self.assertEqual(RideCellDay.objects.get(cell=geohash(-1.9441, 30.0619)).pickups, 1)
+
+    def test_late_committed_ride_reaches_cells(self):
+        self._auth(self.rider)
+        self.client.post('/api/rides/batch/', [_trip(1, 8, start=[-1.9441, 30.0619])], format='json')
+        rollup_rides()
+        started = datetime(2024, 3, 1, 7, tzinfo=dt_timezone.utc)
+        # Lower id than the ride already rolled up, as if its transaction committed later.
+        Ride.objects.create(pk=Ride.objects.get().pk - 1, rider=self.rider, cooperative=self.coop, started_at=started, ended_at=started + timedelta(minutes=10), distance_m=900, fare=Decimal('400'), start_cell=geohash(-1.9441, 30.0619))
+        rollup_rides()
+        cell = RideCellDay.objects.get(cell=geohash(-1.9441, 30.0619))
+        self.assertEqual((cell.pickups, cell.fare), (2, Decimal('1900')))
+
+    def test_deleted_and_moved_rides_leave_their_cells(self):
+        self._auth(self.rider)
+        town, market = [-1.9441, 30.0619], [-1.9536, 30.0606]
+        self.client.post('/api/rides/batch/', [_trip(1, 8, start=town, end=market), _trip(1, 9, start=market, end=town)], format='json')
+        rollup_rides()
+        first, second = Ride.objects.order_by('started_at')
+        first.delete()
+        second.started_at += timedelta(days=1)
+        second.ended_at += timedelta(days=1)
+        second.save()
+        rollup_rides()
+        cells = {(c.day, c.cell): (c.pickups, c.dropoffs) for c in RideCellDay.objects.all()}
+        self.assertEqual(cells, {(date(2024, 3, 2), geohash(*market)): (1, 0), (date(2024, 3, 2), geohash(*town)): (0, 1)})
+
+    def test_only_own_cooperative(self):
+        other = Cooperative.objects.create(name='Other Coop')
+        self._auth(self.admin)
+        resp = self.client.get(f'/api/rides/heatmap/?cooperative={other.pk}')
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        resp = self.client.get(f'/api/rides/heatmap/?cooperative={self.coop.pk}&from=2024-02-30')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        for query in ('', '?cooperative=abc'):
+            self.assertEqual(self.client.get(f'/api/rides/heatmap/{query}').status_code, status.HTTP_400_BAD_REQUEST)
+        self._auth(self.rider)
+        self.assertEqual(self.client.get(f'/api/rides/heatmap/?cooperative={self.coop.pk}').status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,46 @@
+import zlib
+from django.test import SimpleTestCase
+from apps.rides.heatmap import geohash, geohash_center
+from apps.rides.management.commands.bench_tracks import synthetic_track
+from apps.rides.tracks import SCALE, decode_track, encode_track, simplify, to_points
+
+class TrackEncodingUnitTests(SimpleTestCase):
+
+    def test_round_trip_at_fixed_point_precision(self):
+        points = synthetic_track(500)
+        lats, lons, times = decode_track(encode_track(points))
+        self.assertEqual(times, [t for _, _, t in points])
+        for (lat, lon, _), (dlat, dlon, _) in zip(points, to_points(lats, lons, times)):
+            self.assertAlmostEqual(lat, dlat, delta=1 / SCALE)
+            self.assertAlmostEqual(lon, dlon, delta=1 / SCALE)
+
+    def test_blob_is_compact(self):
+        blob = encode_track(synthetic_track(3600))
+        self.assertLess(len(blob) / 3600, 4)
+
+    def test_rejects_bad_tracks(self):
+        for points in ([], [(91, 0, 0)], [(0, 0, 10), (0, 0, 5)], [(0, 0, 1e20)], [(0, 0, float('inf'))], [(0, 0, 0), (0, 0, 1e20)]):
+            with self.assertRaises(ValueError):
+                encode_track(points)
+        raw = bytearray(zlib.decompress(encode_track([(0, 0, 0)])))
+        raw[0] = 99
+        with self.assertRaises(ValueError):
+            decode_track(zlib.compress(bytes(raw)))
+
+    def test_simplify_drops_collinear_points(self):
+        lats = [0, 100, 200, 300, 400]
+        lons = [0, 100, 200, 300, 400]
+        self.assertEqual(simplify(lats, lons, 1), [0, 4])
+        lons = [0, 150, 300, 150, 0]
+        self.assertEqual(simplify(lats, lons, 1), [0, 2, 4])
+        self.assertEqual(simplify(lats, lons, 0), [0, 1, 2, 3, 4])
+
+
+class GeohashUnitTests(SimpleTestCase):
+
+    def test_known_value_and_center(self):
+        self.assertEqual(geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        lat, lon = geohash_center('u4pruydqqvj')
+        self.assertAlmostEqual(lat, 57.64911, places=4)
+        self.assertAlmostEqual(lon, 10.40744, places=4)
+        self.assertTrue(geohash(57.64911, 10.40744).startswith(geohash(57.64911, 10.40744, 4)))
@@ -0,0 +1,140 @@
+"""Compact GPS tracks: one compressed blob per ride instead of a row per point.
+
+Points are ``(lat, lon, t)``: degrees and Unix seconds. Coordinates are
+fixed-point (1e-5 degree, about 1 m) and every column is delta-encoded
+against the previous point, stored column by column as little-endian int32
+arrays and zlib-compressed. Consecutive GPS fixes differ by a few units, so
+the deltas compress to a few bytes per point.
+
+Layout after decompression::
+
+    header  <BIq>   version, point count, time of the first point
+    lat     int32[n]  first value absolute, then deltas
+    lon     int32[n]  same
+    t       int32[n]  seconds since the first point, as deltas
+
+``decode_track`` slices the three columns out of the decompressed buffer
+with ``memoryview`` casts, so nothing is copied between decompression and
+the running sums.
+"""
+import math
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+
+TRACK_VERSION = 1
+SCALE = 100_000
+MAX_TRACK_POINTS = 20_000
+_HEADER = struct.Struct("<BIq")
+_MAX_START = 2**63 - 1
+_EARTH_RADIUS_M = 6_371_000
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _deltas(values):
+    previous = 0
+    out = array("i")
+    for value in values:
+        out.append(value - previous)
+        previous = value
+    return out
+
+
+def encode_track(points):
+    """``[(lat, lon, t), ...]`` in time order -> compressed blob. Raises ValueError on bad input."""
+    if not points:
+        raise ValueError("A track needs at least one point.")
+    if len(points) > MAX_TRACK_POINTS:
+        raise ValueError(f"A track has at most {MAX_TRACK_POINTS} points.")
+    if not all(math.isfinite(t) for _, _, t in points):
+        raise ValueError("Timestamps must be finite numbers.")
+    t0 = int(points[0][2])
+    if not -_MAX_START <= t0 <= _MAX_START:
+        raise ValueError("Timestamp out of range.")
+    lats, lons, times = [], [], []
+    for lat, lon, t in points:
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError("Coordinates out of range.")
+        lats.append(round(lat * SCALE))
+        lons.append(round(lon * SCALE))
+        times.append(int(t) - t0)
+    if any(b < a for a, b in zip(times, times[1:])):
+        raise ValueError("Points must be in time order.")
+    try:
+        columns = [_deltas(column) for column in (lats, lons, times)]
+    except OverflowError:
+        raise ValueError("Track spans too long a time.") from None
+    if not _LITTLE_ENDIAN:
+        for column in columns:
+            column.byteswap()
+    raw = _HEADER.pack(TRACK_VERSION, len(points), t0) + b"".join(column.tobytes() for column in columns)
+    return zlib.compress(raw, 6)
+
+
+def decode_track(blob):
+    """Compressed blob -> ``(lats, lons, times)``: lists of fixed-point ints and absolute Unix seconds."""
+    raw = zlib.decompress(blob)
+    version, count, t0 = _HEADER.unpack_from(raw)
+    if version != TRACK_VERSION:
+        raise ValueError(f"Unknown track version {version}.")
+    body = memoryview(raw)[_HEADER.size:]
+    width = count * 4
+    columns = []
+    for i in range(3):
+        chunk = body[i * width:(i + 1) * width]
+        if _LITTLE_ENDIAN:
+            column = chunk.cast("i")
+        else:
+            column = array("i", chunk.tobytes())
+            column.byteswap()
+        columns.append(list(accumulate(column)))
+    lats, lons, offsets = columns
+    return lats, lons, [t0 + offset for offset in offsets]
+
+
+def to_points(lats, lons, times, indices=None):
+    """Decoded columns -> ``[[lat, lon, t], ...]`` in degrees, optionally only at ``indices``."""
+    if indices is None:
+        indices = range(len(lats))
+    return [[lats[i] / SCALE, lons[i] / SCALE, times[i]] for i in indices]
+
+
+def simplify(lats, lons, tolerance_m):
+    """Indices of the points Douglas-Peucker keeps at ``tolerance_m`` metres (always first and last).
+
+    Distances use an equirectangular projection around the track's mean
+    latitude, which is accurate to well under a metre at city scale.
+    """
+    n = len(lats)
+    if n <= 2 or tolerance_m <= 0:
+        return list(range(n))
+    metres_per_unit = math.pi * _EARTH_RADIUS_M / 180 / SCALE
+    kx = metres_per_unit * math.cos(math.radians(sum(lats) / n / SCALE))
+    xs = [lon * kx for lon in lons]
+    ys = [lat * metres_per_unit for lat in lats]
+    keep = bytearray(n)
+    keep[0] = keep[-1] = 1
+    tolerance_sq = tolerance_m * tolerance_m
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = xs[first], ys[first]
+        dx, dy = xs[last] - ax, ys[last] - ay
+        length_sq = dx * dx + dy * dy
+        worst, worst_sq = None, tolerance_sq
+        for i in range(first + 1, last):
+            px, py = xs[i] - ax, ys[i] - ay
+            if length_sq:
+                cross = px * dy - py * dx
+                distance_sq = cross * cross / length_sq
+            else:
+                distance_sq = px * px + py * py
+            if distance_sq > worst_sq:
+                worst, worst_sq = i, distance_sq
+        if worst is not None:
+            keep[worst] = 1
+            stack.append((first, worst))
+            stack.append((worst, last))
+    return [i for i in range(n) if keep[i]]
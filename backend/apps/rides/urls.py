@@ -0,0 +1,11 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from .views import RideViewSet
+
+router = DefaultRouter()
+router.register(r"rides", RideViewSet, basename="ride")
+
+urlpatterns = [
+    path("api/", include(router.urls)),
+]
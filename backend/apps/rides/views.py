@@ -0,0 +1,182 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apps.cooperatives.models import Cooperative, CooperativeMembership
+from apps.core.permissions import IsRider, cooperative_admin_has_operational_data
+from apps.core.statements import parse_month
+
+from .heatmap import CELL_PRECISION, MIN_HEATMAP_PRECISION, geohash, heatmap, refresh_cell_days
+from .ingest import RIDE_BATCH_MAX, parse_rides, store_rides
+from .models import Ride, RideTrack
+from .serializers import RideSerializer
+from .tracks import decode_track, encode_track, simplify, to_points
+
+
+class RideViewSet(viewsets.ReadOnlyModelViewSet):
+    """Trips of the current rider (or of an admin's cooperatives); ``?month=YYYY-MM`` narrows the list."""
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = RideSerializer
+
+    def get_permissions(self):
+        if self.action == "batch" or (self.action == "track" and self.request.method == "PUT"):
+            return [permissions.IsAuthenticated(), IsRider()]
+        return [permissions.IsAuthenticated()]
+
+    def get_queryset(self):
+        user = self.request.user
+        qs = Ride.objects.all()
+        if user.is_superuser:
+            pass
+        elif user.is_cooperative_admin:
+            if cooperative_admin_has_operational_data(user):
+                qs = qs.filter(
+                    cooperative__admins=user, rider__cooperative_membership__is_verified=True
+                ).distinct()
+            else:
+                qs = Ride.objects.none()
+        elif user.is_rider:
+            qs = qs.filter(rider=user)
+        else:
+            qs = Ride.objects.none()
+        month = self.request.query_params.get("month")
+        if month:
+            try:
+                first, last = parse_month(month)
+            except ValueError:
+                return Ride.objects.none()
+            # A plain range on started_at (not __date) so the (rider|cooperative, started_at) indexes apply.
+            start = timezone.make_aware(datetime.combine(first, time.min))
+            end = timezone.make_aware(datetime.combine(last + timedelta(days=1), time.min))
+            qs = qs.filter(started_at__gte=start, started_at__lt=end)
+        return qs
+
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """Upload up to ``RIDE_BATCH_MAX`` trips (a list, or ``{"rides": [...]}``) in one request."""
+        items = request.data.get("rides") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({"detail": "Send a non-empty list of rides."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > RIDE_BATCH_MAX:
+            return Response(
+                {"detail": f"At most {RIDE_BATCH_MAX} rides per request."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        membership = CooperativeMembership.objects.select_related("cooperative").filter(user=request.user).first()
+        if membership is None:
+            return Response({"detail": "You have no cooperative membership."}, status=status.HTTP_400_BAD_REQUEST)
+        if not membership.is_verified:
+            return Response(
+                {"detail": "Your cooperative membership is not verified yet. Please contact your cooperative administrator."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        cooperative = membership.cooperative
+        rows, errors = parse_rides(items, cooperative)
+        if errors:
+            # All or nothing: the app resends the corrected batch, and client_id makes that safe.
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        created, duplicates = store_rides(request.user, cooperative, rows)
+        return Response({"created": created, "duplicates": duplicates}, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["get", "put"])
+    def track(self, request, pk=None):
+        """GPS trace of a ride. PUT ``{"points": [[lat, lon, unix_seconds], ...]}`` (the ride's rider);
+        GET returns it simplified with Douglas-Peucker at ``?tolerance=<metres>`` (default 0: every point).
+        """
+        ride = self.get_object()
+        if request.method == "PUT":
+            return self._store_track(request, ride)
+        row = RideTrack.objects.filter(ride=ride).values_list("points", "data").first()
+        if row is None:
+            return Response({"detail": "This ride has no track."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            tolerance = float(request.query_params.get("tolerance", 0))
+        except ValueError:
+            return Response({"detail": "tolerance must be a number of metres."}, status=status.HTTP_400_BAD_REQUEST)
+        lats, lons, times = decode_track(row[1])
+        kept = simplify(lats, lons, tolerance)
+        return Response(
+            {
+                "ride": ride.pk,
+                "points": row[0],
+                "tolerance_m": tolerance,
+                "track": to_points(lats, lons, times, kept),
+            }
+        )
+
+    def _store_track(self, request, ride):
+        if ride.rider_id != request.user.pk:
+            return Response({"detail": "Only the rider can upload a ride's track."}, status=status.HTTP_403_FORBIDDEN)
+        points = request.data.get("points") if isinstance(request.data, dict) else None
+        if not isinstance(points, list) or not all(
+            isinstance(p, list) and len(p) == 3 and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in p)
+            for p in points
+        ):
+            return Response(
+                {"points": ["Send a list of [lat, lon, unix_seconds] points."]}, status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            data = encode_track(points)
+        except ValueError as exc:
+            return Response({"points": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+        RideTrack.objects.update_or_create(ride=ride, defaults={"points": len(points), "data": data})
+        if not (ride.start_cell and ride.end_cell):
+            ride.start_cell = ride.start_cell or geohash(*points[0][:2])
+            ride.end_cell = ride.end_cell or geohash(*points[-1][:2])
+            ride.save(update_fields=["start_cell", "end_cell"])
+            refresh_cell_days({(ride.cooperative_id, timezone.localdate(ride.started_at))})
+        return Response({"ride": ride.pk, "points": len(points), "bytes": len(data)})
+
+    @action(detail=False, methods=["get"])
+    def heatmap(self, request):
+        """Pickups, drop-offs and fares per geohash cell for a cooperative.
+
+        ``?cooperative=<id>&from=YYYY-MM-DD&to=YYYY-MM-DD&precision=4..7`` (default: the last 30 days, 7).
+        """
+        user = request.user
+        if not (user.is_superuser or cooperative_admin_has_operational_data(user)):
+            return Response(
+                {"detail": "Only verified cooperative administrators can view this report."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        params = request.query_params
+        cooperatives = Cooperative.objects.all() if user.is_superuser else Cooperative.objects.filter(admins=user)
+        try:
+            cooperative_id = int(params.get("cooperative", ""))
+        except ValueError:
+            return Response({"detail": "cooperative must be a cooperative id."}, status=status.HTTP_400_BAD_REQUEST)
+        cooperative = cooperatives.filter(pk=cooperative_id).first()
+        if cooperative is None:
+            return Response({"detail": "Cooperative not found."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            last = parse_date(params["to"]) if params.get("to") else timezone.localdate()
+            first = parse_date(params["from"]) if params.get("from") else last - timedelta(days=29)
+        except (TypeError, ValueError):
+            first = last = None
+        try:
+            precision = int(params.get("precision", CELL_PRECISION))
+        except ValueError:
+            precision = None
+        if first is None or last is None or first > last or (last - first).days > 366:
+            return Response(
+                {"detail": "from and to must be YYYY-MM-DD, in order, at most a year apart."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if precision is None or not MIN_HEATMAP_PRECISION <= precision <= CELL_PRECISION:
+            return Response(
+                {"detail": f"precision must be between {MIN_HEATMAP_PRECISION} and {CELL_PRECISION}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {
+                "cooperative": cooperative.pk,
+                "from": first,
+                "to": last,
+                "precision": precision,
+                "cells": heatmap(cooperative, first, last, precision),
+            }
+        )
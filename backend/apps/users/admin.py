@@ -6,6 +6,7 @@ from apps.cooperatives.models import Cooperative, CooperativeMembership
 
 from .models import User
 from .phone_utils import describe_phone_rule, normalize_phone_number
+from .search import indexed_condition
 
 
 class UserAddForm(forms.ModelForm):
@@ -67,15 +68,11 @@ class UserAdmin(BaseUserAdmin):
     search_fields = (*BaseUserAdmin.search_fields, "phone_number")
 
     def get_search_results(self, request, queryset, search_term):
-        """Also match the same digits with an optional leading + (full string only, not a country rule)."""
-        qs, use_distinct = super().get_search_results(request, queryset, search_term)
-        st = (search_term or "").strip()
-        if st.startswith("+") and len(st) > 1 and st[1:].isdigit():
-            alt = st[1:]
-            qs2, _ = super().get_search_results(request, queryset, alt)
-            qs = (qs | qs2).distinct()
-            return qs, True
-        return qs, use_distinct
+        """Phone-like terms (digits, optional ``+``, spaces, dashes) and emails use the indexed prefix search."""
+        condition = indexed_condition(search_term)
+        if condition is not None:
+            return queryset.filter(condition), False
+        return super().get_search_results(request, queryset, search_term)
 
     fieldsets = BaseUserAdmin.fieldsets + (
         (None, {"fields": ("phone_number", "role")}),
@@ -0,0 +1,16 @@
+"""Password hashers whose work factor is set per deployment."""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """``pbkdf2_sha256`` with iterations from ``PASSWORD_PBKDF2_ITERATIONS``.
+
+    Keeps Django's algorithm name, so existing hashes verify unchanged; hashes
+    stored with a different iteration count report ``must_update`` and are
+    rewritten on the next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", None) or PBKDF2PasswordHasher.iterations
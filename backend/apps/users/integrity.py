@@ -0,0 +1,147 @@
+"""Integrity sweep over ``users_user`` and ``cooperatives_membership``.
+
+Both tables are streamed in keyset batches (``apps.core.batching``) and only
+compact hash maps are kept in memory: normalized phone -> user ids,
+lowercased username -> user id, and the set of user and cooperative ids.
+Users are streamed twice, once to build the maps and once to check each row
+against them, so no row outlives its batch. Problems found:
+
+- ``phone_format``: the stored phone is not the canonical 10 digits;
+- ``duplicate_phone``: two accounts share a phone once normalized;
+- ``invalid_phone``: the stored phone cannot be normalized at all;
+- ``username_mismatch``: a phone- or email-shaped username no longer matches
+  the account's phone or email (the ``_LOGIN_USERNAME_MISMATCH`` case at
+  signup, usually after edits in Django admin);
+- ``orphaned_membership``: a membership pointing at a missing user or
+  cooperative (rows left behind by raw SQL or imports with foreign-key
+  checks off).
+
+Phone formats, username drift and orphans have one safe repair each and are
+fixed by ``apply_fixes``; duplicates and invalid phones need a person.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from apps.cooperatives.models import Cooperative, CooperativeMembership
+from apps.core.batching import iter_keyset_batches
+
+from .phone_utils import normalize_phone_number
+
+User = get_user_model()
+
+ISSUE_KINDS = ("phone_format", "duplicate_phone", "invalid_phone", "username_mismatch", "orphaned_membership")
+
+
+def _issue(kind, pk, detail, fix=None):
+    """``fix`` is ``{field: new_value}`` for users, ``None`` if it needs a person, ``{}`` for deletion."""
+    return {"kind": kind, "id": pk, "detail": detail, "fix": fix}
+
+
+def _expected_username(username, email, phone):
+    """The username signup would have given this account, or ``None`` if it is not a login-shaped one."""
+    if "@" in username:
+        return email.lower() if email else None
+    if normalize_phone_number(username) == username:
+        return phone
+    return None
+
+
+def _iter_users(batch_size, *fields):
+    """Users one at a time, loaded ``batch_size`` rows per keyset query."""
+    for batch in iter_keyset_batches(User.objects.only(*fields), batch_size):
+        yield from batch
+
+
+def scan_users(batch_size=1000):
+    """Stream users and return their issues, with a fix where exactly one is safe."""
+    by_phone, by_username = {}, {}
+    user_ids = set()
+    for user in _iter_users(batch_size, "pk", "username", "phone_number"):
+        user_ids.add(user.pk)
+        by_username[user.username.lower()] = user.pk
+        by_phone.setdefault(normalize_phone_number(user.phone_number or ""), []).append(user.pk)
+
+    issues = []
+    claimed = set(by_username)
+    for user in _iter_users(batch_size, "pk", "username", "phone_number", "email"):
+        pk, username, phone, email = user.pk, user.username, user.phone_number or "", user.email
+        if pk not in user_ids:
+            continue  # signed up between the two passes; the next scan covers it
+        normalized = normalize_phone_number(phone)
+        # A phone edited between the passes is not in the map yet; count it as its own.
+        owners = by_phone.get(normalized, [pk])
+        if normalized is None:
+            issues.append(_issue("invalid_phone", pk, f"phone_number={phone!r}"))
+        elif len(owners) > 1:
+            others = ", ".join(str(other) for other in owners if other != pk)
+            issues.append(_issue("duplicate_phone", pk, f"phone_number={phone!r} also on user {others}"))
+        elif normalized != phone:
+            issues.append(_issue("phone_format", pk, f"phone_number={phone!r} -> {normalized!r}", {"phone_number": normalized}))
+        # Compare against the phone the account will have once its format is fixed;
+        # a phone that needs a person leaves phone logins alone.
+        target_phone = normalized if normalized and len(owners) == 1 else None
+        expected = _expected_username(username, email, target_phone)
+        # Logins are matched case-insensitively, so case alone is not drift.
+        if expected is None or expected.lower() == username.lower():
+            continue
+        detail = f"username={username!r} expected {expected!r}"
+        if expected.lower() in claimed and by_username.get(expected.lower()) != pk:
+            issues.append(_issue("username_mismatch", pk, f"{detail}, already taken"))
+            continue
+        claimed.add(expected.lower())
+        issues.append(_issue("username_mismatch", pk, detail, {"username": expected}))
+    return issues, user_ids
+
+
+def scan_memberships(user_ids, batch_size=1000):
+    """Stream memberships and return those whose user or cooperative no longer exists."""
+    cooperative_ids = set(Cooperative.objects.values_list("pk", flat=True))
+    issues = []
+    queryset = CooperativeMembership.objects.only("pk", "user_id", "cooperative_id")
+    for batch in iter_keyset_batches(queryset, batch_size):
+        for membership in batch:
+            missing = [
+                f"{label} {value} missing"
+                for label, value, known in (
+                    ("user", membership.user_id, user_ids),
+                    ("cooperative", membership.cooperative_id, cooperative_ids),
+                )
+                if value not in known
+            ]
+            if missing:
+                issues.append(_issue("orphaned_membership", membership.pk, ", ".join(missing), {}))
+    return issues
+
+
+def scan(batch_size=1000):
+    """All issues, users first, each ``{"kind", "id", "detail", "fix"}``."""
+    issues, user_ids = scan_users(batch_size)
+    return issues + scan_memberships(user_ids, batch_size)
+
+
+def apply_fixes(issues, batch_size=1000):
+    """Apply every fixable issue in bulk, in one transaction. Returns the number of rows changed.
+
+    User fields go through one ``bulk_update``; orphaned memberships are
+    removed with one ``DELETE`` (the membership signals recount the
+    cooperatives and bump the report caches).
+    """
+    changes = {}
+    orphan_ids = []
+    for issue in issues:
+        if issue["fix"] is None:
+            continue
+        if issue["kind"] == "orphaned_membership":
+            orphan_ids.append(issue["id"])
+        else:
+            changes.setdefault(issue["id"], {}).update(issue["fix"])
+    with transaction.atomic():
+        users = list(User.objects.filter(pk__in=changes).only("pk", "username", "phone_number"))
+        for user in users:
+            for field, value in changes[user.pk].items():
+                setattr(user, field, value)
+        fields = sorted({field for fix in changes.values() for field in fix})
+        if users:
+            User.objects.bulk_update(users, fields, batch_size=batch_size)
+        removed = CooperativeMembership.objects.filter(pk__in=orphan_ids).delete()[0] if orphan_ids else 0
+    return len(users) + removed
@@ -3,13 +3,12 @@ Custom JWT token obtain view that accepts email or phone number as the identifie
 Django's default auth uses username; we resolve email/phone to the stored username.
 """
 
-from django.contrib.auth import authenticate
-
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from .models import User
 from .phone_utils import PHONE_DIGIT_COUNT, digits_only
+from .throttles import LoginIdentifierThrottle, LoginIPThrottle
 
 
 def _resolve_user_for_login(raw: str):
@@ -37,8 +36,13 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Accepts 'username' which can be either email or phone_number."""
 
     def validate(self, attrs):
+        """Resolve the identifier, then authenticate once via the parent serializer.
+
+        The parent's ``authenticate()`` runs ``User.check_password``, which rewrites
+        the stored hash when it was made with a hasher or work factor other than
+        the current ``PASSWORD_HASHERS[0]`` — so cost changes roll out as users log in.
+        """
         raw = (attrs.get("username") or "").strip()
-        password = attrs.get("password", "")
         if not raw:
             from rest_framework import serializers
             raise serializers.ValidationError({"username": "Email or phone number is required."})
@@ -52,21 +56,10 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 "no_active_account",
             )
 
-        authenticated = authenticate(
-            request=self.context.get("request"),
-            username=user.username,
-            password=password,
-        )
-        if authenticated is None:
-            from rest_framework_simplejwt.exceptions import AuthenticationFailed
-            raise AuthenticationFailed(
-                "No active account found with the given credentials",
-                "no_active_account",
-            )
-
         attrs["username"] = user.username
         return super().validate(attrs)
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [LoginIPThrottle, LoginIdentifierThrottle]
@@ -0,0 +1,60 @@
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    BCryptSHA256PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+from django.core.management.base import BaseCommand
+
+from apps.core.benchmark import best_of
+from apps.users.hashers import TunablePBKDF2PasswordHasher
+
+
+def _pbkdf2(iterations):
+    return type(f"PBKDF2x{iterations}", (PBKDF2PasswordHasher,), {"iterations": iterations})()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password verifications per second on one core for each hasher configuration. "
+        "Verification dominates the CPU cost of /api/token/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            nargs="*",
+            default=[100_000, 300_000, PBKDF2PasswordHasher.iterations],
+            help="PBKDF2 iteration counts to compare (the configured one is always included).",
+        )
+        parser.add_argument("--logins", type=int, default=5, help="Verifications per measurement.")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        configured = TunablePBKDF2PasswordHasher()
+        cases = [(f"pbkdf2_sha256 x{configured.iterations} (configured)", configured)]
+        cases += [
+            (f"pbkdf2_sha256 x{n}", _pbkdf2(n))
+            for n in sorted(set(options["iterations"]) - {configured.iterations})
+        ]
+        cases += [
+            ("argon2", Argon2PasswordHasher()),
+            ("bcrypt_sha256", BCryptSHA256PasswordHasher()),
+            ("scrypt", ScryptPasswordHasher()),
+        ]
+        logins = max(1, options["logins"])
+        for label, hasher in cases:
+            try:
+                encoded = hasher.encode("correct horse battery", hasher.salt())
+            except ValueError as exc:
+                # Raised by Django when the optional backend library (argon2-cffi, bcrypt) is missing.
+                self.stdout.write(f"{label:40s} skipped: {exc}")
+                continue
+            seconds, _ = best_of(
+                options["repeat"],
+                lambda: [hasher.verify("correct horse battery", encoded) for _ in range(logins)],
+            )
+            self.stdout.write(
+                f"{label:40s} {seconds / logins * 1000:8.1f} ms/login  {logins / seconds:8.1f} logins/s/core"
+            )
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.core.benchmark import best_of
+from apps.users.models import User
+from apps.users.search import search_condition
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time rider search lookups (phone prefix, email prefix, name) against a large user table. "
+        "Fixture users are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--lookups", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._seed(options["users"])
+                self._run(options["users"], options["lookups"], options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, n_users):
+        User.objects.bulk_create(
+            (
+                User(
+                    username=f"bench{i:07d}",
+                    email=f"Rider.{i:07d}@Bench.local" if i % 3 else None,
+                    phone_number=f"07{i:08d}",
+                    first_name=f"Name{i % 5000}",
+                    role=User.Role.RIDER,
+                )
+                for i in range(n_users)
+            ),
+            batch_size=5000,
+        )
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE users_user")
+
+    def _run(self, n_users, lookups, repeat):
+        step = max(1, n_users // lookups)
+        cases = {
+            "phone prefix": [f"+07{i:08d}"[:9] for i in range(0, n_users, step)],
+            "email prefix": [f"rider.{i:07d}@" for i in range(1, n_users, step)],
+            "name": [f"name{i % 5000}" for i in range(0, n_users, step)],
+        }
+        self.stdout.write(f"{n_users} users, {connection.vendor}")
+        for label, terms in cases.items():
+            def run(terms=terms):
+                for term in terms:
+                    list(User.objects.filter(search_condition(term)).values_list("id", flat=True)[:20])
+
+            seconds, _ = best_of(repeat, run)
+            self.stdout.write(f"{label:>13}: {seconds / len(terms) * 1000:7.3f} ms per lookup")
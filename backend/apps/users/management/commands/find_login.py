@@ -1,9 +1,16 @@
+import csv
+import json
+import sys
+
 from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db.models import Q
+from django.db.models.functions import Lower
 
 User = get_user_model()
 
+REPORT_FIELDS = ("identifier", "status", "id", "username", "phone_number", "email", "role")
+
 
 def _lookup_variants(raw: str) -> list[str]:
     out: list[str] = [raw]
@@ -18,13 +25,62 @@ def _lookup_variants(raw: str) -> list[str]:
     return out
 
 
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def resolve_identifiers(identifiers, chunk_size=500):
+    """Map each identifier to the users whose username (any case) or phone_number equals one of its variants.
+
+    All variants are looked up together, ``chunk_size`` values per ``IN``
+    query, instead of one query per identifier. Both sides of the ``OR`` are
+    indexed (the unique phone_number index and ``user_username_lower_idx``), so
+    PostgreSQL answers each chunk with a bitmap OR of two index scans.
+    """
+    variants = {raw: _lookup_variants(raw) for raw in identifiers}
+    values = sorted({v for vs in variants.values() for v in vs})
+    by_phone, by_username = {}, {}
+    for chunk in _chunks(values, chunk_size):
+        lowered = sorted({v.lower() for v in chunk})
+        users = (
+            User.objects.annotate(username_lower=Lower("username"))
+            .filter(Q(phone_number__in=chunk) | Q(username_lower__in=lowered))
+            .only("pk", "username", "phone_number", "email", "role")
+        )
+        for user in users:
+            by_phone.setdefault(user.phone_number, {})[user.pk] = user
+            by_username.setdefault(user.username.lower(), {})[user.pk] = user
+    report = {}
+    for raw, vs in variants.items():
+        found = {}
+        for v in vs:
+            found.update(by_phone.get(v, {}))
+            found.update(by_username.get(v.lower(), {}))
+        report[raw] = [found[pk] for pk in sorted(found)]
+    return report
+
+
+def _status(users):
+    return "none" if not users else "matched" if len(users) == 1 else "ambiguous"
+
+
 class Command(BaseCommand):
-    help = "List users whose username or phone_number matches the value (also tries with/without a leading +)."
+    help = (
+        "List users whose username or phone_number matches the value (also tries with/without a leading +). "
+        "With --file (or --file - for stdin) resolve one identifier per line in bulk and print a CSV or JSON report."
+    )
 
     def add_arguments(self, parser):
-        parser.add_argument("value", type=str)
+        parser.add_argument("value", type=str, nargs="?")
+        parser.add_argument("--file", type=str, help="Read identifiers from this file, one per line ('-' for stdin).")
+        parser.add_argument("--format", choices=("csv", "json"), default="csv", help="Report format for --file.")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Values per IN query in --file mode.")
 
     def handle(self, *args, **options):
+        if options["file"]:
+            self._batch(options)
+            return
         raw = (options["value"] or "").strip()
         if not raw:
             self.stderr.write("Empty value.")
@@ -41,3 +97,39 @@ class Command(BaseCommand):
             )
         if n == 0:
             self.stdout.write("No rows — try the exact string your app sends, or search in admin by user id.")
+
+    def _batch(self, options):
+        path = options["file"]
+        try:
+            if path == "-":
+                lines = sys.stdin.read().splitlines()
+            else:
+                with open(path, encoding="utf-8-sig") as fh:
+                    lines = fh.read().splitlines()
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}") from exc
+        identifiers = list(dict.fromkeys(line.strip() for line in lines if line.strip()))
+        report = resolve_identifiers(identifiers, max(1, options["chunk_size"]))
+        if options["format"] == "json":
+            rows = [
+                {
+                    "identifier": raw,
+                    "status": _status(users),
+                    "matches": [
+                        {"id": u.pk, "username": u.username, "phone_number": u.phone_number, "email": u.email, "role": u.role}
+                        for u in users
+                    ],
+                }
+                for raw, users in report.items()
+            ]
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        writer = csv.writer(self.stdout, lineterminator="\n")
+        writer.writerow(REPORT_FIELDS)
+        for raw, users in report.items():
+            if not users:
+                writer.writerow([raw, "none", "", "", "", "", ""])
+            for u in users:
+                writer.writerow([raw, _status(users), u.pk, u.username, u.phone_number, u.email or "", u.role])
+        matched = sum(1 for users in report.values() if users)
+        self.stderr.write(f"{len(report)} identifiers, {matched} matched.")
@@ -0,0 +1,31 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from apps.users.integrity import ISSUE_KINDS, apply_fixes, scan
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream users and cooperative memberships in keyset batches and report phone formats, duplicate "
+        "phones, username/phone or username/email drift and orphaned memberships. With --fix, repair "
+        "what has exactly one safe fix in bulk; duplicates and invalid phones are left for a person."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per keyset query and per bulk_update.")
+        parser.add_argument("--fix", action="store_true", help="Apply the fixes shown after the arrow.")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        issues = scan(batch_size)
+        for issue in issues:
+            fix = issue["fix"]
+            action = "needs review" if fix is None else "delete" if not fix else ", ".join(f"{k}={v!r}" for k, v in fix.items())
+            self.stdout.write(f"{issue['kind']} id={issue['id']} {issue['detail']} -> {action}")
+        counts = Counter(issue["kind"] for issue in issues)
+        self.stdout.write(" ".join(f"{kind}={counts[kind]}" for kind in ISSUE_KINDS))
+        if not options["fix"]:
+            return
+        changed = apply_fixes(issues, batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Fixed {changed} rows."))
@@ -1,45 +1,77 @@
 from django.db import migrations
 
+BATCH_SIZE = 2000
+
 
 def _digits(s):
     return "".join(c for c in (s or "") if c.isdigit())
 
 
+def _ten_digits(value):
+    d = _digits(value)
+    if len(d) == 10:
+        return d
+    if len(d) > 10:
+        return d[-10:]
+    return None
+
+
+def _keyset_batches(queryset, batch_size):
+    # A frozen copy of apps.core.batching.iter_keyset_batches: migrations must
+    # not change behaviour when runtime helpers do.
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        batch = list(page.order_by("pk")[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
+
+
 def normalize_phone_numbers(apps, schema_editor):
+    """Keyset batches with bulk_update, committed per batch.
+
+    Collision checks run against in-memory sets of every phone/username instead
+    of one ``exists()`` per row; the sets are kept current as values move, so
+    the outcome matches the original row-by-row pass. The rewrite is idempotent,
+    so an interrupted run is resumed by running it again.
+    """
     User = apps.get_model("users", "User")
-    for u in User.objects.order_by("pk").iterator():
-        fields = []
-        pn = u.phone_number or ""
-        d = _digits(pn)
-        if len(d) == 10:
-            new_pn = d
-        elif len(d) > 10:
-            new_pn = d[-10:]
-        else:
-            new_pn = None
-        if new_pn and new_pn != pn:
-            if not User.objects.filter(phone_number=new_pn).exclude(pk=u.pk).exists():
+    taken_phones = set(User.objects.values_list("phone_number", flat=True).iterator())
+    taken_usernames = set(User.objects.values_list("username", flat=True).iterator())
+
+    for batch in _keyset_batches(User.objects.only("pk", "phone_number", "username"), BATCH_SIZE):
+        changed = []
+        for u in batch:
+            dirty = False
+            pn = u.phone_number or ""
+            new_pn = _ten_digits(pn)
+            if new_pn and new_pn != pn and new_pn not in taken_phones:
+                taken_phones.discard(pn)
+                taken_phones.add(new_pn)
                 u.phone_number = new_pn
-                fields.append("phone_number")
-        un = u.username or ""
-        if "@" not in un:
-            ud = _digits(un)
-            if len(ud) == 10:
-                new_un = ud
-            elif len(ud) > 10:
-                new_un = ud[-10:]
-            else:
-                new_un = None
-            if new_un and new_un != un:
-                if not User.objects.filter(username=new_un).exclude(pk=u.pk).exists():
+                dirty = True
+            un = u.username or ""
+            if "@" not in un:
+                new_un = _ten_digits(un)
+                if new_un and new_un != un and new_un not in taken_usernames:
+                    taken_usernames.discard(un)
+                    taken_usernames.add(new_un)
                     u.username = new_un
-                    fields.append("username")
-        if fields:
-            u.save(update_fields=fields)
+                    dirty = True
+            if dirty:
+                changed.append(u)
+        if changed:
+            # bulk_update commits the batch in its own transaction.
+            User.objects.bulk_update(changed, ["phone_number", "username"])
 
 
 class Migration(migrations.Migration):
 
+    # Each batch commits on its own instead of one transaction holding locks on the whole table.
+    atomic = False
+
     dependencies = [
         ("users", "0003_remove_user_phone_user_phone_number"),
     ]
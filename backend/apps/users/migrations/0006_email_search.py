@@ -0,0 +1,33 @@
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+# An expression index, not a stored column: adding a generated column would
+# rewrite all of users_user under an ACCESS EXCLUSIVE lock. varchar_pattern_ops
+# lets PostgreSQL serve LIKE 'prefix%' from it.
+INDEX = models.Index(OpClass(Lower("email"), name="varchar_pattern_ops"), name="user_email_search_idx")
+
+
+def add_index(apps, schema_editor):
+    # SQLite has no operator classes, and its LIKE does not use such an index anyway.
+    # The index is not part of the model state, so SQLite tables built from models agree.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("users", "User"), INDEX, concurrently=True)
+
+
+def remove_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("users", "User"), INDEX, concurrently=True)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("users", "0005_alter_user_managers"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, remove_index),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+INDEX = models.Index(Lower("username"), name="user_username_lower_idx")
+
+
+def add_index(apps, schema_editor):
+    model = apps.get_model("users", "User")
+    if schema_editor.connection.vendor == "postgresql":
+        # Built without blocking writes to users_user.
+        schema_editor.add_index(model, INDEX, concurrently=True)
+    else:
+        schema_editor.add_index(model, INDEX)
+
+
+def remove_index(apps, schema_editor):
+    model = apps.get_model("users", "User")
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(model, INDEX, concurrently=True)
+    else:
+        schema_editor.remove_index(model, INDEX)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("users", "0006_email_search"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[migrations.AddIndex(model_name="user", index=INDEX)],
+            database_operations=[migrations.RunPython(add_index, remove_index)],
+        ),
+    ]
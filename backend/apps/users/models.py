@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser, UserManager as DjangoUserManager
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class UserManager(DjangoUserManager):
@@ -38,6 +39,13 @@ class User(AbstractUser):
 
     class Meta:
         db_table = "users_user"
+        # Lowercased-email prefix search (``apps.users.search``) uses the PostgreSQL-only
+        # expression index user_email_search_idx, created by migration 0006 and kept out
+        # of the model state because SQLite cannot build operator classes.
+        indexes = [
+            # Case-insensitive username lookups (``find_login``) seek on LOWER(username).
+            models.Index(Lower("username"), name="user_username_lower_idx"),
+        ]
 
     @property
     def is_rider(self) -> bool:
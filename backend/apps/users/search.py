@@ -0,0 +1,56 @@
+"""Indexed prefix search over users by phone, email and name.
+
+Phone numbers are stored as digits only, so a digits-only prefix (``+``,
+spaces and dashes dropped from the term) becomes a range on the unique
+``phone_number`` index (``>= '0788' AND < '0789'``), which every backend and
+collation can seek. Emails are matched on ``LOWER(email)``, which has its
+own expression index for prefix matches on PostgreSQL. Any
+other term is a case-insensitive prefix on first or last name; that is not
+indexed, so it is meant for queries already narrowed to a cooperative.
+"""
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.db.models.lookups import StartsWith
+
+from .phone_utils import digits_only
+
+_PHONE_CHARS = set("+0123456789 -()")
+
+
+def _digit_prefix(digits, prefix=""):
+    condition = Q(**{f"{prefix}phone_number__gte": digits})
+    # Upper bound: drop trailing nines and increment the last digit ("0789" -> "079").
+    head = digits.rstrip("9")
+    if head:
+        condition &= Q(**{f"{prefix}phone_number__lt": head[:-1] + str(int(head[-1]) + 1)})
+    return condition
+
+
+def _email_prefix(term, prefix=""):
+    # Same expression as the user_email_search_idx index, so the planner can match it.
+    return Q(StartsWith(Lower(f"{prefix}email"), term.lower()))
+
+
+def indexed_condition(term, prefix=""):
+    """``Q`` for a phone-like or email term, served by an index; ``None`` for anything else.
+
+    ``prefix`` is the lookup path to the user from another model, e.g. ``"rider__"``.
+    """
+    term = (term or "").strip()
+    digits = digits_only(term)
+    if digits and set(term) <= _PHONE_CHARS:
+        return _digit_prefix(digits, prefix)
+    if "@" in term:
+        return _email_prefix(term, prefix)
+    return None
+
+
+def search_condition(term):
+    """``Q`` matching users whose phone, email or name starts with ``term``; ``None`` if it is blank."""
+    term = (term or "").strip()
+    if not term:
+        return None
+    condition = indexed_condition(term)
+    if condition is not None:
+        return condition
+    return _email_prefix(term) | Q(first_name__istartswith=term) | Q(last_name__istartswith=term)
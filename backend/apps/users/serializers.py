@@ -1,9 +1,11 @@
 import os
 
 from django.db import transaction
+from django.db.models import Q
 from rest_framework import serializers
 
 from apps.cooperatives.models import Cooperative, CooperativeMembership
+from apps.core.reconciliation import bump_reports_version
 
 from .admin_invite_constants import ADMIN_REGISTRATION_INVITE_CODE
 from .models import User
@@ -19,6 +21,30 @@ _LOGIN_USERNAME_MISMATCH = (
 REGISTRATION_DUPLICATE_CONTACT = "A user with this email or phone number already exists."
 
 
+def _contact_conflicts(email, phone):
+    """Field errors for an email, phone or login username already in use, from one query.
+
+    The login username is the email when there is one, else the phone (as in
+    ``RegisterSerializer.create``).
+    """
+    login_username = email or phone
+    query = Q(phone_number=phone) | Q(username__iexact=login_username)
+    if email:
+        query |= Q(email__iexact=email)
+    errors = {}
+    for existing_email, existing_phone, existing_username in User.objects.filter(query).values_list(
+        "email", "phone_number", "username"
+    ):
+        if existing_phone == phone:
+            errors["phone_number"] = REGISTRATION_DUPLICATE_CONTACT
+        if email and (existing_email or "").lower() == email:
+            errors["email"] = REGISTRATION_DUPLICATE_CONTACT
+        elif existing_phone != phone and existing_username.lower() == login_username.lower():
+            # Someone else's login is this value, but their phone field says otherwise.
+            errors.setdefault("phone_number", _LOGIN_USERNAME_MISMATCH)
+    return errors
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     """Register a new user. Riders can use email or phone; admins require email. Riders must select a cooperative."""
 
@@ -74,10 +100,7 @@ class RegisterSerializer(serializers.ModelSerializer):
     def validate_email(self, value):
         if not value or not str(value).strip():
             return None
-        normalized = str(value).strip().lower()
-        if User.objects.filter(email__iexact=normalized).exists():
-            raise serializers.ValidationError(REGISTRATION_DUPLICATE_CONTACT)
-        return normalized
+        return str(value).strip().lower()
 
     def validate_phone_number(self, value):
         raw = (value or "").strip()
@@ -86,8 +109,6 @@ class RegisterSerializer(serializers.ModelSerializer):
         normalized = normalize_phone_number(raw)
         if not normalized:
             raise serializers.ValidationError(describe_phone_rule())
-        if User.objects.filter(phone_number=normalized).exists():
-            raise serializers.ValidationError(REGISTRATION_DUPLICATE_CONTACT)
         return normalized
 
     def validate(self, attrs):
@@ -125,19 +146,9 @@ class RegisterSerializer(serializers.ModelSerializer):
                     {"invite_code": "Invalid invite code."}
                 )
 
-        email_clean = (attrs.get("email") or "").strip()
-        phone_clean = (attrs.get("phone_number") or "").strip()
-        login_username = email_clean.lower() if email_clean else phone_clean
-        if login_username:
-            existing = User.objects.filter(username__iexact=login_username).first()
-            if existing:
-                existing_phone = (existing.phone_number or "").strip()
-                if existing_phone == phone_clean:
-                    raise serializers.ValidationError(
-                        {"phone_number": "A user with this phone number already exists."}
-                    )
-                if existing_phone != phone_clean and (existing_phone or phone_clean):
-                    raise serializers.ValidationError({"phone_number": _LOGIN_USERNAME_MISMATCH})
+        errors = _contact_conflicts(attrs.get("email"), (attrs.get("phone_number") or "").strip())
+        if errors:
+            raise serializers.ValidationError(errors)
 
         attrs.pop("invite_code", None)
         return attrs
@@ -156,8 +167,8 @@ class RegisterSerializer(serializers.ModelSerializer):
         if raw_email is not None and not str(raw_email).strip():
             raw_email = None
         email = str(raw_email).strip().lower() if raw_email else None
-        if email and User.objects.filter(email__iexact=email).exists():
-            raise serializers.ValidationError({"email": REGISTRATION_DUPLICATE_CONTACT})
+        # Checked in validate(); a concurrent signup that wins the race trips the
+        # unique constraints, which the register view maps to a field error.
         username = email if email else phone_number
         with transaction.atomic():
             user = User.objects.create_user(
@@ -171,7 +182,11 @@ class RegisterSerializer(serializers.ModelSerializer):
             )
             if role == User.Role.RIDER and cooperative_id:
                 CooperativeMembership.objects.create(user=user, cooperative=cooperative_id)
-            if role == User.Role.COOPERATIVE_ADMIN:
-                for coop in cooperatives:
-                    coop.admins.add(user)
+            if role == User.Role.COOPERATIVE_ADMIN and cooperatives:
+                through = Cooperative.admins.through
+                through.objects.bulk_create(
+                    [through(cooperative_id=pk, user_id=user.pk) for pk in sorted({coop.pk for coop in cooperatives})]
+                )
+                # bulk_create sends no m2m_changed; report scopes depend on these links.
+                transaction.on_commit(bump_reports_version)
         return user
@@ -1,13 +1,23 @@
+import csv
+import io
+import json
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
-from apps.cooperatives.models import Cooperative
+from apps.cooperatives.models import Cooperative, CooperativeMembership
+from apps.users.integrity import scan
 from apps.users.models import User
+from apps.users.serializers import RegisterSerializer
 
 class JWTLoginTests(TestCase):
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.coop = Cooperative.objects.create(name='Test Coop')
         self.user = User.objects.create_user(username='0788123450', email='user@test.com', phone_number='0788123450', password='secret123', role=User.Role.RIDER)
@@ -40,9 +50,26 @@ class JWTLoginTests(TestCase):
         resp = self.client.post('/api/token/', {'password': 'secret123'}, format='json')
         self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
 
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_login_rehashes_password_with_configured_cost(self):
+        resp = self.client.post('/api/token/', {'username': '0788123450', 'password': 'secret123'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(self.user.check_password('secret123'))
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_failed_login_does_not_rehash(self):
+        before = self.user.password
+        resp = self.client.post('/api/token/', {'username': '0788123450', 'password': 'wrong'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, before)
+
 class RegisterTests(TestCase):
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.coop = Cooperative.objects.create(name='Test Cooperative')
 
@@ -109,6 +136,66 @@ class RegisterTests(TestCase):
             self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
         self.assertEqual(User.objects.filter(phone_number__in=['0788610001', '0788610002']).count(), 2)
 
+    def test_register_checks_contacts_with_one_query(self):
+        payload = {'phone_number': '0788620001', 'email': 'rider@test.com', 'password': 'validpass123', 'confirm_password': 'validpass123', 'role': 'rider', 'cooperative_id': self.coop.id}
+        serializer = RegisterSerializer(data=payload)
+        with self.assertNumQueries(2):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_register_admin_links_cooperatives(self):
+        other = Cooperative.objects.create(name='Other Cooperative')
+        payload = {'phone_number': '0788620002', 'email': 'admin@test.com', 'password': 'validpass123', 'confirm_password': 'validpass123', 'role': 'administrator', 'cooperatives': [self.coop.id, other.id, self.coop.id], 'invite_code': 'SECRET'}
+        with patch.dict('os.environ', {'ADMIN_INVITE_CODE': 'SECRET'}):
+            resp = self.client.post('/api/users/register/', payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        user = User.objects.get(email='admin@test.com')
+        self.assertEqual(set(user.administered_cooperatives.values_list('id', flat=True)), {self.coop.id, other.id})
+
+    def test_register_duplicate_email_and_phone_reported_together(self):
+        User.objects.create_user(username='taken@test.com', email='taken@test.com', phone_number='0788620003', password='oldpass')
+        payload = {'phone_number': '0788620003', 'email': 'Taken@Test.com', 'password': 'validpass123', 'confirm_password': 'validpass123', 'role': 'rider', 'cooperative_id': self.coop.id}
+        resp = self.client.post('/api/users/register/', payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(resp.data), {'email', 'phone_number'})
+
+THROTTLE_TEST_RATES = {'login_ip': '100/min', 'login_identifier': '2/min', 'register_ip': '2/hour', 'register_identifier': '100/hour'}
+
+@patch('rest_framework.throttling.SimpleRateThrottle.THROTTLE_RATES', THROTTLE_TEST_RATES)
+class ThrottleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        User.objects.create_user(username='0788123450', phone_number='0788123450', password='secret123', role=User.Role.RIDER)
+
+    def test_login_identifier_throttled_before_user_lookup(self):
+        for password in ('wrong1', 'wrong2'):
+            resp = self.client.post('/api/token/', {'username': '0788123450', 'password': password}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+        with patch('apps.users.jwt_auth._resolve_user_for_login') as mock_resolve:
+            resp = self.client.post('/api/token/', {'username': '078 812 3450', 'password': 'secret123'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', resp.headers)
+        mock_resolve.assert_not_called()
+
+    def test_login_identifier_throttle_is_per_account(self):
+        for _ in range(2):
+            self.client.post('/api/token/', {'username': '0788123450', 'password': 'wrong'}, format='json')
+        resp = self.client.post('/api/token/', {'username': 'someone@else.com', 'password': 'wrong'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_register_ip_throttled(self):
+        for suffix in ('620001', '620002'):
+            payload = {'phone_number': f'0788{suffix}', 'password': 'validpass123', 'confirm_password': 'validpass123', 'role': 'rider', 'cooperative_id': self.coop.id}
+            resp = self.client.post('/api/users/register/', payload, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        payload = {'phone_number': '0788620003', 'password': 'validpass123', 'confirm_password': 'validpass123', 'role': 'rider', 'cooperative_id': self.coop.id}
+        resp = self.client.post('/api/users/register/', payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', resp.headers)
+        self.assertFalse(User.objects.filter(phone_number='0788620003').exists())
+
 class MeTests(TestCase):
 
     def setUp(self):
@@ -128,3 +215,144 @@ class MeTests(TestCase):
         self.assertEqual(resp.data['role'], 'RIDER')
         self.assertIn('is_staff', resp.data)
         self.assertFalse(resp.data['is_staff'])
+
+
+class RiderSearchTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.coop = Cooperative.objects.create(name='Test Coop')
+        other = Cooperative.objects.create(name='Other Coop')
+        self.alice = User.objects.create_user(username='0788123450', email='Alice.M@Test.com', phone_number='0788123450', password='x', role=User.Role.RIDER, first_name='Alice')
+        self.bob = User.objects.create_user(username='0788129999', email='bob@test.com', phone_number='0788129999', password='x', role=User.Role.RIDER, first_name='Bob')
+        self.carol = User.objects.create_user(username='0788130000', phone_number='0788130000', password='x', role=User.Role.RIDER, first_name='Carol')
+        CooperativeMembership.objects.create(user=self.alice, cooperative=self.coop, is_verified=True)
+        CooperativeMembership.objects.create(user=self.bob, cooperative=self.coop)
+        CooperativeMembership.objects.create(user=self.carol, cooperative=other)
+        self.admin = User.objects.create_user(username='admin@test.com', email='admin@test.com', phone_number='0788000000', password='x', role=User.Role.COOPERATIVE_ADMIN, is_staff=True)
+        self.coop.admins.add(self.admin)
+        refresh = RefreshToken.for_user(self.admin)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(refresh.access_token))
+
+    def _ids(self, q):
+        resp = self.client.get('/api/users/search/', {'q': q})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [r['id'] for r in resp.data]
+
+    def test_phone_prefix_ignores_plus_and_separators(self):
+        self.assertEqual(self._ids('+0788 12'), [self.alice.id, self.bob.id])
+        self.assertEqual(self._ids('07881299'), [self.bob.id])
+        self.assertEqual(self._ids('078813'), [])
+
+    def test_email_prefix_is_case_insensitive(self):
+        self.assertEqual(self._ids('alice.m@'), [self.alice.id])
+        self.assertEqual(self._ids('BOB@TEST'), [self.bob.id])
+
+    def test_name_prefix_and_result_shape(self):
+        resp = self.client.get('/api/users/search/', {'q': 'ali'})
+        self.assertEqual(resp.data, [{'id': self.alice.id, 'email': 'Alice.M@test.com', 'phone_number': '0788123450', 'name': 'Alice', 'cooperative': self.coop.id, 'is_member_verified': True}])
+
+    def test_access_and_validation(self):
+        self.assertEqual(self.client.get('/api/users/search/', {'q': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        refresh = RefreshToken.for_user(self.alice)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(refresh.access_token))
+        self.assertEqual(self.client.get('/api/users/search/', {'q': '0788'}).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_admin_changelist_uses_prefix_search(self):
+        superuser = User.objects.create_superuser(username='root', email='root@test.com', phone_number='0788000001', password='x')
+        self.client.force_login(superuser)
+        resp = self.client.get('/admin/users/user/', {'q': '+07881299'})
+        self.assertEqual([u.pk for u in resp.context['cl'].result_list], [self.bob.pk])
+
+
+class FindLoginBatchTests(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username='0788123450', phone_number='0788123450', password='x', role=User.Role.RIDER)
+        self.bob = User.objects.create_user(username='Bob@Test.com', email='bob@test.com', phone_number='0788999999', password='x', role=User.Role.RIDER)
+
+    def _run(self, lines, *args):
+        out, err = io.StringIO(), io.StringIO()
+        with patch('sys.stdin', io.StringIO('\n'.join(lines))):
+            call_command('find_login', '--file', '-', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_report_per_identifier(self):
+        with self.assertNumQueries(1):
+            out, err = self._run(['+0788123450', 'bob@test.com', '', 'nobody', '+0788123450'])
+        rows = list(csv.DictReader(io.StringIO(out)))
+        self.assertEqual([(r['identifier'], r['status'], r['id']) for r in rows], [('+0788123450', 'matched', str(self.alice.pk)), ('bob@test.com', 'matched', str(self.bob.pk)), ('nobody', 'none', '')])
+        self.assertIn('3 identifiers, 2 matched.', err)
+
+    def test_json_report_in_chunks(self):
+        with self.assertNumQueries(2):
+            out, _ = self._run(['0788123450', '0788999999'], '--format', 'json', '--chunk-size', '2')
+        report = json.loads(out)
+        self.assertEqual([r['status'] for r in report], ['matched', 'matched'])
+        self.assertEqual(report[1]['matches'][0]['username'], 'Bob@Test.com')
+
+    def test_username_lookup_is_indexed(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, User._meta.db_table)
+        self.assertTrue(constraints['user_username_lower_idx']['index'])
+
+
+class ScanUserIntegrityTests(TestCase):
+
+    def setUp(self):
+        self.coop = Cooperative.objects.create(name='Coop')
+        self.clean = User.objects.create_user(username='Bob@Test.com', email='bob@test.com', phone_number='0788999999', password='x')
+        self.formatted = User.objects.create_user(username='0788123450', phone_number='0788 123 450', password='x')
+        self.drifted = User.objects.create_user(username='0788000001', phone_number='0788000002', password='x')
+        self.renamed = User.objects.create_user(username='old@test.com', email='new@test.com', phone_number='0788000003', password='x')
+        self.dup_a = User.objects.create_user(username='0788555555', phone_number='0788-555-555', password='x')
+        self.dup_b = User.objects.create_user(username='dup', phone_number='0788555555', password='x')
+        self.gone = User.objects.create_user(username='0788000004', phone_number='0788000004', password='x')
+        self.orphan = CooperativeMembership.objects.create(user=self.gone, cooperative=self.coop)
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM users_user WHERE id = %s', [self.gone.pk])
+
+    def tearDown(self):
+        CooperativeMembership.objects.filter(pk=self.orphan.pk).delete()
+
+    def _run(self, *args):
+        out = io.StringIO()
+        call_command('scan_user_integrity', '--batch-size', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def test_report_only_changes_nothing(self):
+        issues = {(i['kind'], i['id']): i['fix'] for i in scan(batch_size=2)}
+        self.assertEqual(issues, {
+            ('phone_format', self.formatted.pk): {'phone_number': '0788123450'},
+            ('username_mismatch', self.drifted.pk): {'username': '0788000002'},
+            ('username_mismatch', self.renamed.pk): {'username': 'new@test.com'},
+            ('duplicate_phone', self.dup_a.pk): None,
+            ('duplicate_phone', self.dup_b.pk): None,
+            ('orphaned_membership', self.orphan.pk): {},
+        })
+        out = self._run()
+        self.assertIn('phone_format=1 duplicate_phone=2 invalid_phone=0 username_mismatch=2 orphaned_membership=1', out)
+        self.drifted.refresh_from_db()
+        self.assertEqual(self.drifted.username, '0788000001')
+        self.assertTrue(CooperativeMembership.objects.filter(pk=self.orphan.pk).exists())
+
+    def test_fix_repairs_in_bulk(self):
+        self.coop.refresh_from_db()
+        self.assertEqual(self.coop.member_count, 1)
+        out = self._run('--fix')
+        self.assertIn('Fixed 4 rows.', out)
+        self.assertEqual(User.objects.get(pk=self.formatted.pk).phone_number, '0788123450')
+        self.assertEqual(User.objects.get(pk=self.drifted.pk).username, '0788000002')
+        self.assertEqual(User.objects.get(pk=self.renamed.pk).username, 'new@test.com')
+        self.assertEqual(User.objects.get(pk=self.dup_a.pk).phone_number, '0788-555-555')
+        self.assertFalse(CooperativeMembership.objects.filter(pk=self.orphan.pk).exists())
+        self.coop.refresh_from_db()
+        self.assertEqual(self.coop.member_count, 0)
+        self.assertEqual({i['kind'] for i in scan(batch_size=2)}, {'duplicate_phone'})
+
+    def test_taken_username_is_not_fixed(self):
+        other = User.objects.create_user(username='0788000002', phone_number='0788000010', password='x')
+        issues = {i['id']: i for i in scan() if i['kind'] == 'username_mismatch'}
+        self.assertIsNone(issues[self.drifted.pk]['fix'])
+        self.assertIn('already taken', issues[self.drifted.pk]['detail'])
+        self.assertEqual(issues[other.pk]['fix'], {'username': '0788000010'})
@@ -38,17 +38,20 @@ class RegisterSerializerUnitTests(SimpleTestCase):
 
     @patch('apps.users.serializers.User.objects.filter')
     def test_validate_phone_number_duplicate_rejected(self, mock_filter):
-        mock_filter.return_value.exists.return_value = True
+        mock_filter.return_value.values_list.return_value = [(None, '0788123456', '0788123456')]
         s = RegisterSerializer()
-        with self.assertRaises(ValidationError):
-            s.validate_phone_number('0788123456')
+        with self.assertRaises(ValidationError) as ctx:
+            s.validate({'phone_number': '0788123456', 'password': 'validpass123', 'confirm_password': 'validpass123', 'role': 'rider', 'cooperative_id': object()})
+        self.assertEqual(set(ctx.exception.detail), {'phone_number'})
 
     @patch('apps.users.serializers.User.objects.filter')
     def test_validate_email_duplicate_rejected(self, mock_filter):
-        mock_filter.return_value.exists.return_value = True
+        mock_filter.return_value.values_list.return_value = [('User@test.com', '0788000000', 'user@test.com')]
         s = RegisterSerializer()
-        with self.assertRaises(ValidationError):
-            s.validate_email('user@test.com')
+        with self.assertRaises(ValidationError) as ctx:
+            s.validate({'email': 'user@test.com', 'phone_number': '0788123456', 'password': 'validpass123', 'confirm_password': 'validpass123', 'role': 'rider', 'cooperative_id': object()})
+        self.assertEqual(set(ctx.exception.detail), {'email'})
+        self.assertEqual(mock_filter.call_count, 1)
 
     def test_admin_registration_disabled_without_invite_code_env(self):
         old = os.environ.pop('ADMIN_INVITE_CODE', None)
@@ -108,14 +111,13 @@ class JwtAuthUnitTests(SimpleTestCase):
         with self.assertRaises(Exception):
             s.is_valid(raise_exception=True)
 
-    @patch('apps.users.jwt_auth.authenticate')
     @patch('apps.users.jwt_auth.User.objects.filter')
     @patch('rest_framework_simplejwt.serializers.TokenObtainPairSerializer.validate')
-    def test_login_success_resolves_identifier_and_calls_super_validate(self, mock_super_validate, mock_filter, mock_authenticate):
+    def test_login_success_resolves_identifier_and_calls_super_validate(self, mock_super_validate, mock_filter):
         user = Mock(username='resolved-username')
         mock_filter.return_value.first.return_value = user
-        mock_authenticate.return_value = user
         mock_super_validate.return_value = {'access': 'a', 'refresh': 'r'}
         s = CustomTokenObtainPairSerializer(context={'request': Mock()}, data={'username': 'user@test.com', 'password': 'secret'})
         self.assertTrue(s.is_valid(), s.errors)
-        mock_super_validate.assert_called()
+        mock_super_validate.assert_called_once()
+        self.assertEqual(mock_super_validate.call_args[0][0]['username'], 'resolved-username')
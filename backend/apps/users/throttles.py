@@ -0,0 +1,60 @@
+"""Cache-backed throttles for the unauthenticated login and signup endpoints.
+
+DRF checks throttles in ``APIView.initial()``, before the view or serializer
+runs, so a throttled request never reaches the user lookup or password hash.
+Rates come from ``REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]``; a ``None`` rate
+disables that throttle.
+"""
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from .phone_utils import normalize_phone_number
+
+
+def _identifier_key(raw) -> str | None:
+    """Fold the ways one account can be typed (case, phone separators) into one cache ident."""
+    value = str(raw or "").strip().lower()
+    if not value:
+        return None
+    value = normalize_phone_number(value) or value
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+class _IPThrottle(SimpleRateThrottle):
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class _IdentifierThrottle(SimpleRateThrottle):
+    identifier_field = None
+
+    def get_cache_key(self, request, view):
+        try:
+            raw = request.data.get(self.identifier_field)
+        except AttributeError:
+            return None
+        ident = _identifier_key(raw)
+        if ident is None:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class LoginIPThrottle(_IPThrottle):
+    scope = "login_ip"
+
+
+class LoginIdentifierThrottle(_IdentifierThrottle):
+    """Caps attempts against one account regardless of how many IPs the attacker rotates through."""
+
+    scope = "login_identifier"
+    identifier_field = "username"
+
+
+class RegisterIPThrottle(_IPThrottle):
+    scope = "register_ip"
+
+
+class RegisterIdentifierThrottle(_IdentifierThrottle):
+    scope = "register_identifier"
+    identifier_field = "phone_number"
@@ -1,8 +1,9 @@
 from django.urls import path
 
-from .views import me, register
+from .views import me, register, search
 
 urlpatterns = [
     path("api/users/register/", register, name="user_register"),
     path("api/users/me/", me, name="user_me"),
+    path("api/users/search/", search, name="user_search"),
 ]
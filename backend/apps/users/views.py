@@ -2,17 +2,32 @@ from django.db import IntegrityError
 import logging
 
 from rest_framework import permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 
 from apps.cooperatives.models import CooperativeMembership
+from apps.core.permissions import cooperative_admin_has_operational_data
 
 from .models import User
+from .search import search_condition
 from .serializers import REGISTRATION_DUPLICATE_CONTACT, RegisterSerializer
+from .throttles import RegisterIdentifierThrottle, RegisterIPThrottle
 
 
 logger = logging.getLogger(__name__)
 
+SEARCH_MIN_LENGTH = 2
+SEARCH_MAX_RESULTS = 50
+SEARCH_ROW_FIELDS = (
+    "id",
+    "email",
+    "phone_number",
+    "first_name",
+    "last_name",
+    "cooperative_membership__cooperative_id",
+    "cooperative_membership__is_verified",
+)
+
 
 def _registration_integrity_detail_and_code(exc: IntegrityError, role: str) -> tuple[str, str]:
     """Map DB integrity errors to an honest user message and a stable machine code."""
@@ -74,6 +89,7 @@ def _registration_integrity_user_message(exc: IntegrityError, role: str) -> str:
 
 @api_view(["POST"])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([RegisterIPThrottle, RegisterIdentifierThrottle])
 def register(request):
     """Create a new user account (JSON body). Browser GET is not supported — use the app signup page or POST here."""
     serializer = RegisterSerializer(data=request.data)
@@ -137,3 +153,42 @@ def me(request):
             "cooperative": cooperative_info,
         }
     )
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def search(request):
+    """Riders whose phone, email or name starts with ``?q=`` (admins: riders of their cooperatives)."""
+    user: User = request.user
+    if not (user.is_superuser or cooperative_admin_has_operational_data(user)):
+        return Response(
+            {"detail": "Only cooperative administrators can search riders."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    term = request.query_params.get("q", "").strip()
+    if len(term) < SEARCH_MIN_LENGTH:
+        return Response(
+            {"detail": f"q must be at least {SEARCH_MIN_LENGTH} characters."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        limit = min(max(int(request.query_params.get("limit", 20)), 1), SEARCH_MAX_RESULTS)
+    except ValueError:
+        limit = 20
+    riders = User.objects.filter(search_condition(term), role=User.Role.RIDER)
+    if not user.is_superuser:
+        riders = riders.filter(cooperative_membership__cooperative__admins=user)
+    rows = riders.order_by("phone_number").values(*SEARCH_ROW_FIELDS)[:limit]
+    return Response(
+        [
+            {
+                "id": row["id"],
+                "email": row["email"] or "",
+                "phone_number": row["phone_number"],
+                "name": f"{row['first_name']} {row['last_name']}".strip(),
+                "cooperative": row["cooperative_membership__cooperative_id"],
+                "is_member_verified": bool(row["cooperative_membership__is_verified"]),
+            }
+            for row in rows
+        ]
+    )
@@ -0,0 +1,79 @@
+"""Gunicorn settings: ``gunicorn -c config/gunicorn_conf.py config.wsgi:application``.
+
+Sizing comes from the CPUs this process may run on (affinity, so container
+CPU pinning is respected) unless overridden:
+
+- ``WEB_CONCURRENCY``: worker processes (default ``2 * cpus + 1``, capped by
+  ``GUNICORN_MAX_WORKERS``, default 12);
+- ``GUNICORN_THREADS``: threads per worker (default 1, i.e. sync workers; more
+  than 1 switches to ``gthread``);
+- ``GUNICORN_WORKER_CLASS``: e.g. ``uvicorn.workers.UvicornWorker`` with
+  ``config.asgi:application``;
+- ``PORT`` / ``GUNICORN_BIND``, ``GUNICORN_TIMEOUT``, ``GUNICORN_KEEPALIVE``,
+  ``GUNICORN_MAX_REQUESTS``.
+
+The app is preloaded (``GUNICORN_PRELOAD=0`` to disable) and warmed before
+workers accept traffic (``GUNICORN_WARMUP=0`` to skip): URL patterns,
+serializers and templates in the master, then one database connection per
+worker. With ``GUNICORN_THREADS`` > 1 requests run on pool threads, so the
+worker's warmed connection only proves the database is reachable.
+"""
+import os
+
+
+def _env_flag(name, default):
+    return os.environ.get(name, default).strip().lower() in ("1", "true", "yes")
+
+
+def cpu_count():
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:  # macOS / Windows
+        return os.cpu_count() or 1
+
+
+def default_workers(cpus, cap):
+    return max(1, min(2 * cpus + 1, cap))
+
+
+bind = os.environ.get("GUNICORN_BIND") or f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY") or default_workers(cpu_count(), int(os.environ.get("GUNICORN_MAX_WORKERS", "12"))))
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS") or ("gthread" if threads > 1 else "sync")
+preload_app = _env_flag("GUNICORN_PRELOAD", "1")
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+# Recycle workers now and then so slow leaks cannot build up; jitter avoids restarting them all at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+# Heartbeat files on tmpfs: a slow disk must not make the arbiter kill healthy workers.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+warmup = _env_flag("GUNICORN_WARMUP", "1")
+
+
+def _log_warm_up(log, where, timings):
+    summary = ", ".join(f"{name}={count} in {seconds * 1000:.0f}ms" for name, (count, seconds) in timings.items())
+    log.info("Warm-up (%s): %s", where, summary)
+
+
+def when_ready(server):
+    # With preload_app the application is imported before this hook and before
+    # any worker is forked, so the warmed state is shared copy-on-write.
+    if warmup and preload_app:
+        from apps.core.warmup import warm_up
+
+        _log_warm_up(server.log, "master", warm_up())
+
+
+def post_worker_init(worker):
+    # Runs in each worker after the app is loaded and before it accepts requests.
+    if not warmup:
+        return
+    from apps.core.warmup import connect_databases, warm_up
+
+    if not preload_app:
+        _log_warm_up(worker.log, f"worker {worker.pid}", warm_up())
+    connect_databases()
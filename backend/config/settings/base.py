@@ -1,18 +1,20 @@
 """Django settings for Imena."""
+import importlib.util
 import os
 from pathlib import Path
 from urllib.parse import urlparse
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
-try:
-    from dotenv import load_dotenv
+_dotenv_path = BASE_DIR / ".env"
+if _dotenv_path.is_file():
+    # Only import python-dotenv when there is a file to read (deployments set real env vars).
+    try:
+        from dotenv import load_dotenv
 
-    _dotenv_path = BASE_DIR / ".env"
-    if _dotenv_path.is_file():
         load_dotenv(_dotenv_path, override=True)
-except ImportError:
-    pass
+    except ImportError:
+        pass
 
 if os.environ.get("IMENA_FORCE_SQLITE", "").strip().lower() in ("1", "true", "yes"):
     os.environ["DATABASE_URL"] = ""
@@ -37,6 +39,7 @@ INSTALLED_APPS = [
     "apps.cooperatives",
     "apps.income",
     "apps.contributions",
+    "apps.rides",
 ]
 
 MIDDLEWARE = [
@@ -47,6 +50,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.core.replica.StickyPrimaryMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -72,35 +76,81 @@ TEMPLATES = [
     },
 ]
 
+
+def _postgres_database(url):
+    parsed = urlparse(url)
+    return {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": (parsed.path or "/").lstrip("/") or "imena_db",
+        "USER": parsed.username or "",
+        "PASSWORD": parsed.password or "",
+        "HOST": parsed.hostname or "localhost",
+        "PORT": str(parsed.port or 5432),
+        "OPTIONS": {"sslmode": os.environ.get("DB_SSLMODE", "prefer")},
+        # Keep connections across requests (warmed per worker by config/gunicorn_conf.py).
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+    }
+
+
 DATABASE_URL = (os.environ.get("DATABASE_URL") or "").strip()
 if DATABASE_URL:
-    parsed = urlparse(DATABASE_URL)
-    _db_user = parsed.username or ""
-    _db_pass = parsed.password or ""
-    _db_host = parsed.hostname or "localhost"
-    _db_port = str(parsed.port or 5432)
-    _db_name = (parsed.path or "/").lstrip("/") or "imena_db"
+    DATABASES = {"default": _postgres_database(DATABASE_URL)}
+else:
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.postgresql",
-            "NAME": _db_name,
-            "USER": _db_user,
-            "PASSWORD": _db_pass,
-            "HOST": _db_host,
-            "PORT": _db_port,
-            "OPTIONS": {"sslmode": os.environ.get("DB_SSLMODE", "prefer")},
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+        }
+    }
+
+# Optional read replica for report, stats and list reads (see apps.core.replica).
+DATABASE_REPLICA_URL = (os.environ.get("DATABASE_REPLICA_URL") or "").strip()
+if DATABASE_URL and DATABASE_REPLICA_URL:
+    DATABASES["replica"] = {**_postgres_database(DATABASE_REPLICA_URL), "TEST": {"MIRROR": "default"}}
+DATABASE_ROUTERS = ["apps.core.replica.PrimaryReplicaRouter"]
+# Seconds a user's reads stay on the primary after they write (covers replication lag).
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", "10"))
+
+# Shared cache (throttle counters and cached lookups). Without REDIS_URL each process keeps its own.
+REDIS_URL = (os.environ.get("REDIS_URL") or "").strip()
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
         }
     }
 else:
-    DATABASES = {
+    CACHES = {
         "default": {
-            "ENGINE": "django.db.backends.sqlite3",
-            "NAME": BASE_DIR / "db.sqlite3",
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         }
     }
 
 AUTH_USER_MODEL = "users.User"
 
+# Password hashing. PASSWORD_HASHER picks the hasher for new (and rehashed-on-login) passwords;
+# the others stay listed so existing hashes keep verifying. argon2/bcrypt need their optional packages.
+_PASSWORD_HASHER_PATHS = {
+    "pbkdf2": "apps.users.hashers.TunablePBKDF2PasswordHasher",
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "bcrypt": "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+}
+_PASSWORD_HASHER_MODULES = {"argon2": "argon2", "bcrypt": "bcrypt"}
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2").strip().lower()
+if PASSWORD_HASHER not in _PASSWORD_HASHER_PATHS or (
+    PASSWORD_HASHER in _PASSWORD_HASHER_MODULES
+    and importlib.util.find_spec(_PASSWORD_HASHER_MODULES[PASSWORD_HASHER]) is None
+):
+    PASSWORD_HASHER = "pbkdf2"
+PASSWORD_HASHERS = [_PASSWORD_HASHER_PATHS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHER_PATHS.items() if name != PASSWORD_HASHER
+] + ["django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"]
+# Unset keeps Django's default iteration count for pbkdf2_sha256.
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ["PASSWORD_PBKDF2_ITERATIONS"]) if os.environ.get("PASSWORD_PBKDF2_ITERATIONS") else None
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -123,6 +173,25 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
+    # orjson-backed JSON when installed; both classes fall back to DRF's stdlib implementation.
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "apps.core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Login/signup throttles (apps.users.throttles). Set a rate to "" to disable it.
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": os.environ.get("THROTTLE_LOGIN_IP", "30/min") or None,
+        "login_identifier": os.environ.get("THROTTLE_LOGIN_IDENTIFIER", "10/min") or None,
+        "register_ip": os.environ.get("THROTTLE_REGISTER_IP", "30/hour") or None,
+        "register_identifier": os.environ.get("THROTTLE_REGISTER_IDENTIFIER", "5/hour") or None,
+    },
+    # Number of trusted reverse proxies in front of the app; used to read the client IP from X-Forwarded-For.
+    "NUM_PROXIES": int(os.environ["NUM_PROXIES"]) if os.environ.get("NUM_PROXIES") else None,
 }
 
 _cors = os.environ.get("CORS_ALLOWED_ORIGINS", "")
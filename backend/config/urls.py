@@ -13,5 +13,6 @@ urlpatterns = [
     path("", include("apps.cooperatives.urls")),
     path("", include("apps.income.urls")),
     path("", include("apps.contributions.urls")),
+    path("", include("apps.rides.urls")),
     path("", include("apps.core.urls")),
 ]
@@ -177,6 +177,9 @@ const resources = {
         unverified: 'Unverified',
         verifiedCount: '{{verified}}/{{total}} verified',
         loadingMembers: 'Loading members...',
+        showRiders: 'Show riders',
+        loadMoreRiders: 'Load more',
+        loadMoreError: 'Could not load more riders.',
         noRiders: 'No riders registered yet.',
         verified: 'Verified',
         verifyAction: 'Verify',
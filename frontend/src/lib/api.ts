@@ -215,10 +215,13 @@ export type CooperativeDetail = {
   name: string
   created_at: string
   updated_at: string
-  members: CooperativeMember[]
+  member_count: number
+  verified_member_count: number
   admins: CooperativeMember[]
 }
 
+export type CursorPage<T> = { next: string | null; previous: string | null; results: T[] }
+
 export async function getTotalIncome(): Promise<number> {
   const data = await apiFetch<{ total_income: string }>('/api/income/summary/')
   return parseFloat(data.total_income) || 0
@@ -353,8 +356,8 @@ export async function unverifyContribution(contributionId: number): Promise<Cont
   })
 }
 
-export async function getCooperatives(): Promise<Cooperative[]> {
-  const data = await apiFetch<Cooperative[]>('/api/cooperatives/')
+export async function getCooperatives(): Promise<CooperativeDetail[]> {
+  const data = await apiFetch<CooperativeDetail[]>('/api/cooperatives/')
   return Array.isArray(data) ? data : []
 }
 
@@ -365,6 +368,21 @@ export async function getCooperativesForSignup(): Promise<Cooperative[]> {
   return Array.isArray(data) ? data : []
 }
 
+/**
+ * One cursor page of `/api/cooperatives/<id>/members/`. Pass the previous page's `next`
+ * link to continue; the totals come from `member_count` on the cooperative, not from here.
+ */
+export async function getCooperativeMembers(
+  id: number,
+  next: string | null = null,
+  pageSize = 50
+): Promise<CursorPage<CooperativeMember>> {
+  const path = next
+    ? next.replace(/^https?:\/\/[^/]+/, '')
+    : `/api/cooperatives/${id}/members/?page_size=${pageSize}`
+  return apiFetch<CursorPage<CooperativeMember>>(path)
+}
+
 export async function getCooperativeDetail(id: number): Promise<CooperativeDetail> {
   return apiFetch<CooperativeDetail>(`/api/cooperatives/${id}/`)
 }
@@ -376,11 +394,26 @@ export async function createCooperative(name: string): Promise<Cooperative> {
   })
 }
 
+/** Set one member's verified state (admin). */
 export async function verifyMember(
   cooperativeId: number,
-  memberId: number
+  memberId: number,
+  isVerified: boolean
 ): Promise<{ id: number; is_verified: boolean }> {
   return apiFetch(`/api/cooperatives/${cooperativeId}/members/${memberId}/verify/`, {
     method: 'POST',
+    body: JSON.stringify({ is_verified: isVerified }),
+  })
+}
+
+/** Set the verified state of many members at once (admin). */
+export async function verifyMembers(
+  cooperativeId: number,
+  memberIds: number[],
+  isVerified: boolean
+): Promise<{ updated: number; member_count: number; verified_member_count: number }> {
+  return apiFetch(`/api/cooperatives/${cooperativeId}/members/verify/`, {
+    method: 'POST',
+    body: JSON.stringify({ is_verified: isVerified, members: memberIds }),
   })
 }
@@ -6,7 +6,7 @@ import ProgressChart from '@/components/ProgressChart'
 import { useAuth } from '@/contexts/AuthContext'
 import {
   createCooperative,
-  getCooperativeDetail,
+  getCooperativeMembers,
   getCooperatives,
   getContributionsSummary,
   getRecentContributions,
@@ -15,7 +15,6 @@ import {
   unverifyContribution,
   userMayAccessAdminDashboard,
   verifyContribution,
-  type Cooperative,
   type CooperativeMember,
   type CooperativeDetail,
   type ContributionItem,
@@ -64,7 +63,7 @@ function CheckIcon() {
   )
 }
 
-type FlatMember = CooperativeMember & { cooperativeId: number; cooperativeName: string }
+type MemberPages = { members: CooperativeMember[]; next: string | null; loading: boolean; error: string | null }
 
 function StatCard({
   icon,
@@ -118,13 +117,13 @@ export default function AdminDashboard() {
     }
   }, [authLoading, isAuthenticated, user, navigate])
 
-  const [cooperatives, setCooperatives] = useState<Cooperative[]>([])
+  const [cooperatives, setCooperatives] = useState<CooperativeDetail[]>([])
   const [showAddCoop, setShowAddCoop] = useState(false)
   const [newCoopName, setNewCoopName] = useState('')
   const [addError, setAddError] = useState<string | null>(null)
   const [submitting, setSubmitting] = useState(false)
 
-  const [allMembers, setAllMembers] = useState<FlatMember[]>([])
+  const [memberPages, setMemberPages] = useState<Record<number, MemberPages>>({})
   const [membersLoading, setMembersLoading] = useState(true)
   const [totalIncome, setTotalIncome] = useState<number | null>(null)
   const [verifiedContributionsTotal, setVerifiedContributionsTotal] = useState<number | null>(null)
@@ -136,6 +135,7 @@ export default function AdminDashboard() {
   const [unverifyingContributionId, setUnverifyingContributionId] = useState<number | null>(null)
 
   const loadCooperatives = useCallback(async () => {
+    setMembersLoading(true)
     try {
       const coops = await getCooperatives()
       setCooperatives(coops)
@@ -143,35 +143,46 @@ export default function AdminDashboard() {
     } catch {
       setCooperatives([])
       return []
+    } finally {
+      setMemberPages({})
+      setMembersLoading(false)
     }
   }, [])
 
-  const loadAllMembers = useCallback(async (coops: Cooperative[]) => {
-    if (coops.length === 0) { setAllMembers([]); setMembersLoading(false); return }
-    setMembersLoading(true)
+  const loadMemberPage = async (cooperativeId: number) => {
+    const current = memberPages[cooperativeId]
+    if (current?.loading || (current && !current.next && !current.error)) return
+    setMemberPages((prev) => ({
+      ...prev,
+      [cooperativeId]: { members: current?.members ?? [], next: current?.next ?? null, loading: true, error: null },
+    }))
     try {
-      const details: CooperativeDetail[] = await Promise.all(
-        coops.map((c) => getCooperativeDetail(c.id))
-      )
-      const flat: FlatMember[] = details.flatMap((d) =>
-        d.members.map((m) => ({
-          ...m,
-          cooperativeId: d.id,
-          cooperativeName: d.name,
-        }))
-      )
-      setAllMembers(flat)
-    } catch {
-      setAllMembers([])
-    } finally {
-      setMembersLoading(false)
+      const page = await getCooperativeMembers(cooperativeId, current?.next ?? null)
+      setMemberPages((prev) => ({
+        ...prev,
+        [cooperativeId]: {
+          members: [...(prev[cooperativeId]?.members ?? []), ...page.results],
+          next: page.next,
+          loading: false,
+          error: null,
+        },
+      }))
+    } catch (err) {
+      setMemberPages((prev) => ({
+        ...prev,
+        [cooperativeId]: {
+          ...prev[cooperativeId],
+          loading: false,
+          error: err instanceof Error ? err.message : t('admin.loadMoreError'),
+        },
+      }))
     }
-  }, [])
+  }
 
   useEffect(() => {
     if (!canViewOperationalData) {
       setCooperatives([])
-      setAllMembers([])
+      setMemberPages({})
       setMembersLoading(false)
       setTotalIncome(null)
       setVerifiedContributionsTotal(null)
@@ -180,7 +191,7 @@ export default function AdminDashboard() {
       setRecentContributions([])
       return
     }
-    loadCooperatives().then(loadAllMembers)
+    loadCooperatives()
     getTotalIncome().then(setTotalIncome).catch(() => setTotalIncome(0))
     getContributionsSummary()
       .then((s) => {
@@ -193,7 +204,7 @@ export default function AdminDashboard() {
       })
     getRecentIncome().then(setRecentIncome).catch(() => setRecentIncome([]))
     getRecentContributions().then(setRecentContributions).catch(() => setRecentContributions([]))
-  }, [loadCooperatives, loadAllMembers, canViewOperationalData])
+  }, [loadCooperatives, canViewOperationalData])
 
   const handleAddCooperative = async (e: React.FormEvent) => {
     e.preventDefault()
@@ -204,8 +215,7 @@ export default function AdminDashboard() {
       await createCooperative(newCoopName.trim())
       setNewCoopName('')
       setShowAddCoop(false)
-      const coops = await loadCooperatives()
-      await loadAllMembers(coops)
+      await loadCooperatives()
     } catch (err) {
       setAddError(err instanceof Error ? err.message : t('admin.addCooperativeError'))
     } finally {
@@ -265,7 +275,7 @@ export default function AdminDashboard() {
     setAddError(null)
   }
 
-  const totalRiders = allMembers.length
+  const totalRiders = cooperatives.reduce((sum, c) => sum + c.member_count, 0)
 
   if (authLoading || !user) {
     return (
@@ -534,19 +544,48 @@ export default function AdminDashboard() {
             </h2>
             {membersLoading ? (
               <p className="text-sm text-gray-400 py-2">{t('admin.loadingMembers')}</p>
-            ) : allMembers.length === 0 ? (
+            ) : totalRiders === 0 ? (
               <p className="text-sm text-gray-400 italic py-2">{t('admin.noRiders')}</p>
             ) : (
-              <div className="space-y-2">
-                {allMembers.map((m) => (
-                  <div
-                    key={`${m.cooperativeId}-${m.id}`}
-                    className="w-full text-left px-4 py-3 bg-gray-50 rounded-xl text-sm font-medium text-gray-900 flex flex-col gap-0.5"
-                  >
-                    <span className="truncate">{m.email || t('admin.noRiders')}</span>
-                    <span className="text-xs text-gray-400">{m.cooperativeName}</span>
-                  </div>
-                ))}
+              <div className="space-y-4">
+                {cooperatives.filter((c) => c.member_count > 0).map((c) => {
+                  const pages = memberPages[c.id]
+                  return (
+                    <div key={c.id} className="space-y-2">
+                      <div className="flex items-center justify-between gap-2">
+                        <span className="text-sm font-medium text-gray-900 truncate">{c.name}</span>
+                        <span className="text-xs text-gray-400 shrink-0">
+                          {c.member_count} · {c.verified_member_count} {t('admin.verified')}
+                        </span>
+                      </div>
+                      {pages?.members.map((m) => (
+                        <div
+                          key={`${c.id}-${m.id}`}
+                          className="w-full text-left px-4 py-3 bg-gray-50 rounded-xl text-sm font-medium text-gray-900"
+                        >
+                          <span className="truncate block">{m.email || t('admin.noRiders')}</span>
+                        </div>
+                      ))}
+                      {pages?.error && (
+                        <p className="text-xs text-red-600" role="alert">{pages.error}</p>
+                      )}
+                      {(!pages || pages.next || pages.error) && (
+                        <button
+                          type="button"
+                          disabled={pages?.loading}
+                          onClick={() => loadMemberPage(c.id)}
+                          className="w-full py-2 rounded-lg text-xs font-medium text-[#0F9D8A] border border-[#0F9D8A] hover:bg-[#0F9D8A]/5 disabled:opacity-50"
+                        >
+                          {pages?.loading
+                            ? t('admin.loadingMembers')
+                            : pages
+                            ? t('admin.loadMoreRiders')
+                            : t('admin.showRiders')}
+                        </button>
+                      )}
+                    </div>
+                  )
+                })}
               </div>
             )}
           </aside>
@@ -5,6 +5,7 @@ import CenteredLayout from '@/components/CenteredLayout'
 import { useAuth } from '@/contexts/AuthContext'
 import {
   getCooperativeDetail,
+  getCooperativeMembers,
   userMayAccessAdminDashboard,
   verifyMember,
   type CooperativeDetail,
@@ -29,7 +30,7 @@ function CheckIcon() {
 
 export default function CooperativeMembers() {
   const { id } = useParams<{ id: string }>()
-  const { i18n } = useTranslation()
+  const { t, i18n } = useTranslation()
   const navigate = useNavigate()
   const location = useLocation()
   const { user, loading: authLoading } = useAuth()
@@ -58,18 +59,41 @@ export default function CooperativeMembers() {
   }, [authLoading, user, navigate, location.pathname])
 
   const [coop, setCoop] = useState<CooperativeDetail | null>(null)
+  const [members, setMembers] = useState<CooperativeMember[]>([])
+  const [nextPage, setNextPage] = useState<string | null>(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [loadMoreError, setLoadMoreError] = useState<string | null>(null)
   const [error, setError] = useState<string | null>(null)
   const [toggling, setToggling] = useState<Record<number, boolean>>({})
 
   useEffect(() => {
     if (!id || authLoading || isCoopAdminPendingStaff) return
-    getCooperativeDetail(Number(id))
-      .then(setCoop)
+    Promise.all([getCooperativeDetail(Number(id)), getCooperativeMembers(Number(id))])
+      .then(([detail, page]) => {
+        setCoop(detail)
+        setMembers(page.results)
+        setNextPage(page.next)
+      })
       .catch((err) => setError(err instanceof Error ? err.message : 'Failed to load'))
       .finally(() => setLoading(false))
   }, [id, authLoading, isCoopAdminPendingStaff])
 
+  async function loadMore() {
+    if (!id || !nextPage || loadingMore) return
+    setLoadingMore(true)
+    setLoadMoreError(null)
+    try {
+      const page = await getCooperativeMembers(Number(id), nextPage)
+      setMembers((prev) => [...prev, ...page.results])
+      setNextPage(page.next)
+    } catch (err) {
+      setLoadMoreError(err instanceof Error ? err.message : t('admin.loadMoreError'))
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const toggleLanguage = () => {
     i18n.changeLanguage(i18n.language === 'en' ? 'rw' : 'en')
   }
@@ -78,16 +102,18 @@ export default function CooperativeMembers() {
     if (!id || toggling[member.id]) return
     setToggling((prev) => ({ ...prev, [member.id]: true }))
     try {
-      const result = await verifyMember(Number(id), member.id)
-      setCoop((prev) => {
-        if (!prev) return prev
-        return {
-          ...prev,
-          members: prev.members.map((m) =>
-            m.id === member.id ? { ...m, is_verified: result.is_verified } : m
-          ),
-        }
-      })
+      const result = await verifyMember(Number(id), member.id, !member.is_verified)
+      setMembers((prev) =>
+        prev.map((m) => (m.id === member.id ? { ...m, is_verified: result.is_verified } : m))
+      )
+      if (result.is_verified !== member.is_verified) {
+        setCoop((prev) =>
+          prev && {
+            ...prev,
+            verified_member_count: prev.verified_member_count + (result.is_verified ? 1 : -1),
+          }
+        )
+      }
     } catch {
     } finally {
       setToggling((prev) => ({ ...prev, [member.id]: false }))
@@ -138,14 +164,14 @@ export default function CooperativeMembers() {
             <>
               <div className="flex items-center justify-between mb-4">
                 <p className="text-sm text-gray-500">
-                  {coop.members.length} {coop.members.length === 1 ? 'member' : 'members'}
+                  {coop.member_count} {coop.member_count === 1 ? 'member' : 'members'}
                 </p>
                 <p className="text-xs text-gray-400">
-                  {coop.members.filter((m) => m.is_verified).length} verified
+                  {coop.verified_member_count} verified
                 </p>
               </div>
 
-              {coop.members.length === 0 ? (
+              {members.length === 0 ? (
                 <div className="text-center py-12">
                   <div className="w-16 h-16 rounded-full bg-gray-100 flex items-center justify-center mx-auto mb-4">
                     <svg className="w-8 h-8 text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -159,7 +185,7 @@ export default function CooperativeMembers() {
                 </div>
               ) : (
                 <ul className="space-y-3">
-                  {coop.members.map((m, i) => (
+                  {members.map((m, i) => (
                     <li key={m.id} className="flex items-center gap-3 p-3 bg-gray-50 rounded-xl">
                       <div className="w-10 h-10 rounded-full bg-[#0F9D8A]/10 text-[#0F9D8A] flex items-center justify-center font-semibold text-sm shrink-0">
                         {m.email[0].toUpperCase()}
@@ -189,6 +215,20 @@ export default function CooperativeMembers() {
                   ))}
                 </ul>
               )}
+
+              {nextPage && (
+                <button
+                  type="button"
+                  disabled={loadingMore}
+                  onClick={loadMore}
+                  className="mt-4 w-full py-2 rounded-lg text-sm font-medium text-[#0F9D8A] border border-[#0F9D8A] hover:bg-[#0F9D8A]/5 disabled:opacity-50"
+                >
+                  {loadingMore ? t('admin.loadingMembers') : t('admin.loadMoreRiders')}
+                </button>
+              )}
+              {loadMoreError && (
+                <p className="text-sm text-red-600 text-center mt-2" role="alert">{loadMoreError}</p>
+              )}
             </>
           )}
       </main>